@@ -0,0 +1,41 @@
+"""
+Benchmark collecting into immutable collections
+
+Immutable collections, i.e. `tuple` and `frozenset`, cannot be extended in
+place. This benchmark compares them against their mutable counterparts for a
+single hot key with growing group sizes. If the immutable collections scale
+linearly, their runtime stays within a small factor of `list` and `set`.
+
+Run it from the repository root:
+
+    python benchmarks/bench_immutable_collections.py
+"""
+
+import timeit
+import typing as t
+from collections import Counter
+
+from collectiondict import collectiondict
+
+GROUP_SIZES = (1_000, 10_000, 100_000)
+COLLECTIONS: tuple[t.Type[t.Any], ...] = (list, tuple, set, frozenset, Counter)
+
+
+def _time_collectiondict(clct: t.Type[t.Any], group_size: int) -> float:
+    stream = [("hot-key", n) for n in range(group_size)]
+    return min(timeit.repeat(lambda: collectiondict(clct, stream), number=1, repeat=3))
+
+
+def main() -> None:
+    header = "group size".rjust(12) + "".join(
+        clct.__name__.rjust(12) for clct in COLLECTIONS
+    )
+    print(header)
+    for group_size in GROUP_SIZES:
+        timings = (_time_collectiondict(clct, group_size) for clct in COLLECTIONS)
+        row = f"{group_size:>12}" + "".join(f"{t_:>11.4f}s" for t_ in timings)
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,291 @@
+"""
+Benchmark suite for collectiondict, reverse_mapping and reverse_multimapping
+
+Every public function is run for every supported collection type on a grid of
+workloads. The workloads vary the stream length, the number of distinct keys
+and the distribution of the keys. The latter is either uniform or skewed
+following Zipf's law, so that a few keys receive most of the values.
+
+For every case, the throughput in processed pairs per second and the peak
+memory allocated during the call are reported. Plain implementations using
+`defaultdict` and `itertools.groupby` are measured as baselines.
+
+Results can be stored and compared against a stored baseline. The comparison
+fails if any case got slower or needs more memory than allowed by the
+tolerance.
+
+Run it from the repository root:
+
+    python -m benchmarks.suite --quick
+    python -m benchmarks.suite --save benchmarks/baseline.json
+    python -m benchmarks.suite --compare benchmarks/baseline.json
+"""
+
+import argparse
+import gc
+import itertools
+import json
+import platform
+import random
+import sys
+import timeit
+import tracemalloc
+import typing as t
+from collections import Counter, defaultdict
+from functools import partial
+from operator import itemgetter
+from pathlib import Path
+
+from collectiondict import collectiondict, reverse_mapping, reverse_multimapping
+from tests import custom_classes as cc
+
+COLLECTIONS: tuple[t.Type[t.Any], ...] = (
+    Counter,
+    frozenset,
+    list,
+    set,
+    tuple,
+    cc.MyCounter,
+    cc.MyFrozenset,
+    cc.MyList,
+    cc.MySet,
+    cc.MyTuple,
+)
+STREAM_LENGTHS = (10_000, 100_000)
+QUICK_STREAM_LENGTHS = (1_000,)
+KEY_CARDINALITIES = (10, 10_000)
+SKEWS = ("uniform", "zipf")
+VALUES_PER_MULTIMAPPING_KEY = 10
+DEFAULT_TOLERANCE = 0.25
+SEED = 1337
+
+Pairs = list[tuple[int, int]]
+Result = dict[str, float]
+
+
+class Workload(t.NamedTuple):
+    length: int
+    cardinality: int
+    skew: str
+
+    @property
+    def name(self) -> str:
+        return f"n={self.length},keys={self.cardinality},skew={self.skew}"
+
+    def draw_keys(self, n: int) -> list[int]:
+        rng = random.Random(SEED)
+        population = range(self.cardinality)
+        if self.skew == "uniform":
+            return rng.choices(population, k=n)
+        weights = [1 / (rank + 1) for rank in population]
+        return rng.choices(
+            population, cum_weights=list(itertools.accumulate(weights)), k=n
+        )
+
+    def pairs(self) -> Pairs:
+        return list(zip(self.draw_keys(self.length), range(self.length)))
+
+    def mapping(self) -> dict[int, int]:
+        return dict(zip(range(self.length), self.draw_keys(self.length)))
+
+    def multimapping(self) -> dict[int, list[int]]:
+        nof_keys = self.length // VALUES_PER_MULTIMAPPING_KEY
+        values = iter(self.draw_keys(self.length))
+        return {
+            key: list(itertools.islice(values, VALUES_PER_MULTIMAPPING_KEY))
+            for key in range(nof_keys)
+        }
+
+
+class Case(t.NamedTuple):
+    name: str
+    nof_pairs: int
+    run: t.Callable[[], object]
+
+
+def _defaultdict_baseline(clct: t.Type[t.Any], pairs: Pairs) -> dict[int, t.Any]:
+    if issubclass(clct, Counter):
+        counters: defaultdict[int, Counter[int]] = defaultdict(Counter)
+        for key, val in pairs:
+            counters[key][val] += 1
+        return {key: clct(ctr) for key, ctr in counters.items()}
+    if issubclass(clct, (set, frozenset)):
+        sets: defaultdict[int, set[int]] = defaultdict(set)
+        for key, val in pairs:
+            sets[key].add(val)
+        return {key: clct(set_) for key, set_ in sets.items()}
+    lists: defaultdict[int, list[int]] = defaultdict(list)
+    for key, val in pairs:
+        lists[key].append(val)
+    return {key: clct(list_) for key, list_ in lists.items()}
+
+
+def _groupby_baseline(clct: t.Type[t.Any], pairs: Pairs) -> dict[int, t.Any]:
+    by_key = sorted(pairs, key=itemgetter(0))
+    return {
+        key: clct(map(itemgetter(1), group))
+        for key, group in itertools.groupby(by_key, itemgetter(0))
+    }
+
+
+def _cases_for_workload(workload: Workload) -> t.Iterator[Case]:
+    pairs = workload.pairs()
+    mapping = workload.mapping()
+    multimapping = workload.multimapping()
+    nof_multimapping_pairs = sum(map(len, multimapping.values()))
+    for clct in COLLECTIONS:
+        suffix = f"{clct.__name__}/{workload.name}"
+        yield Case(
+            f"collectiondict/{suffix}",
+            len(pairs),
+            partial(collectiondict, clct, pairs),
+        )
+        yield Case(
+            f"reverse_mapping/{suffix}",
+            len(mapping),
+            partial(reverse_mapping, clct, mapping),
+        )
+        yield Case(
+            f"reverse_multimapping/{suffix}",
+            nof_multimapping_pairs,
+            partial(reverse_multimapping, clct, multimapping),
+        )
+    for clct in (Counter, frozenset, list, set, tuple):
+        suffix = f"{clct.__name__}/{workload.name}"
+        yield Case(
+            f"baseline-defaultdict/{suffix}",
+            len(pairs),
+            partial(_defaultdict_baseline, clct, pairs),
+        )
+        yield Case(
+            f"baseline-groupby/{suffix}",
+            len(pairs),
+            partial(_groupby_baseline, clct, pairs),
+        )
+
+
+def _reference_case(workload: Workload) -> Case:
+    # Throughput depends on the machine and its current load. Relating it to a
+    # reference measured right before makes results comparable across runs.
+    pairs = workload.pairs()
+    return Case("reference", len(pairs), partial(_defaultdict_baseline, list, pairs))
+
+
+def _measure_throughput(case: Case, repeat: int) -> float:
+    # Short runs are dominated by noise. Therefore, each timing covers as many
+    # calls as needed to take at least 0.2 seconds.
+    timer = timeit.Timer(case.run)
+    number, _ = timer.autorange()
+    best = min(timer.repeat(number=number, repeat=repeat))
+    return case.nof_pairs * number / best
+
+
+def _measure_peak_memory(case: Case) -> int:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        case.run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def run_suite(lengths: t.Sequence[int], repeat: int, pattern: str) -> dict[str, Result]:
+    results: dict[str, Result] = {}
+    workloads = itertools.starmap(
+        Workload, itertools.product(lengths, KEY_CARDINALITIES, SKEWS)
+    )
+    for workload in workloads:
+        reference = _measure_throughput(_reference_case(workload), repeat)
+        for case in _cases_for_workload(workload):
+            if pattern not in case.name:
+                continue
+            throughput = _measure_throughput(case, repeat)
+            results[case.name] = {
+                "throughput": throughput,
+                "relative_throughput": throughput / reference,
+                "peak_memory": _measure_peak_memory(case),
+            }
+            _print_result(case.name, results[case.name])
+    return results
+
+
+def compare(
+    results: dict[str, Result], baseline: dict[str, Result], tolerance: float
+) -> list[str]:
+    """
+    Return a description of every case that regressed beyond `tolerance`
+
+    Throughput is compared relative to the reference implementation measured in
+    the same run. Cases missing from either side are ignored, so that baselines
+    remain usable while the suite grows.
+    """
+    regressions = []
+    for name in sorted(results.keys() & baseline.keys()):
+        current, reference = results[name], baseline[name]
+        throughput_ratio = (
+            current["relative_throughput"] / reference["relative_throughput"]
+        )
+        memory_ratio = current["peak_memory"] / max(reference["peak_memory"], 1)
+        if throughput_ratio < 1 - tolerance:
+            regressions.append(
+                f"{name}: throughput dropped to {throughput_ratio:.0%} of baseline"
+            )
+        if memory_ratio > 1 + tolerance:
+            regressions.append(
+                f"{name}: peak memory rose to {memory_ratio:.0%} of baseline"
+            )
+    return regressions
+
+
+def _print_result(name: str, result: Result) -> None:
+    throughput = result["throughput"] / 1e6
+    peak_memory = result["peak_memory"] / 2**20
+    print(f"{name:<70} {throughput:>8.2f} Mpairs/s {peak_memory:>9.2f} MiB")
+
+
+def _parse_args(argv: t.Sequence[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--quick", action="store_true", help="only run on short streams"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="number of timed runs per case"
+    )
+    parser.add_argument(
+        "--filter", default="", help="only run cases containing this string"
+    )
+    parser.add_argument("--save", type=Path, help="store results as JSON here")
+    parser.add_argument("--compare", type=Path, help="baseline to compare against")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help="allowed relative regression before the comparison fails",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: t.Sequence[str]) -> int:
+    args = _parse_args(argv)
+    lengths = QUICK_STREAM_LENGTHS if args.quick else STREAM_LENGTHS
+    results = run_suite(lengths, args.repeat, args.filter)
+    if args.save is not None:
+        document = {
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "results": results,
+        }
+        args.save.write_text(json.dumps(document, indent=2, sort_keys=True) + "\n")
+    if args.compare is None:
+        return 0
+    baseline = json.loads(args.compare.read_text())["results"]
+    regressions = compare(results, baseline, args.tolerance)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
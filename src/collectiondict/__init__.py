@@ -1,5 +1,76 @@
+from ._accumulators import Accumulator, accumulator_for, register_accumulator
+from ._arrays import TypedArray
+from ._async import acollectiondict, areverse_mapping, areverse_multimapping
+from ._batched import batched_collectiondict
+from ._bitmaps import IntBitmap
+from ._bounded import BoundedCollection, Newest, Reservoir, TopK
 from ._collectiondict import collectiondict
+from ._compact import (
+    CompactMultidict,
+    GroupView,
+    compact_collectiondict,
+    compact_reverse_multimapping,
+)
+from ._concurrent import ConcurrentCollectiondict
+from ._deduplicate import deduplicate
+from ._external import external_collectiondict
+from ._files import csv_collectiondict, jsonl_collectiondict
+from ._mapped import MappedMultidict, save_mapped_collectiondict
+from ._merge import merge_collectiondicts
+from ._multi import multi_collectiondict
+from ._nested import nested_collectiondict
+from ._numpy import group_arrays
+from ._parallel import parallel_collectiondict, split_into_shards
+from ._persistence import load_collectiondict, save_collectiondict
+from ._reverse_index import MultiReverseIndex, ReversedView, ReverseIndex
 from ._reverse_mapping import reverse_mapping
 from ._reverse_multimapping import reverse_multimapping
+from ._sketches import CountMinSketch, HyperLogLog, Sketch
+from ._stats import GroupingStats
+from ._streaming import iter_collectiondict
 
-__all__ = ["collectiondict", "reverse_mapping", "reverse_multimapping"]
+__all__ = [
+    "Accumulator",
+    "BoundedCollection",
+    "CompactMultidict",
+    "ConcurrentCollectiondict",
+    "CountMinSketch",
+    "GroupView",
+    "GroupingStats",
+    "HyperLogLog",
+    "IntBitmap",
+    "MappedMultidict",
+    "MultiReverseIndex",
+    "Newest",
+    "Reservoir",
+    "ReverseIndex",
+    "ReversedView",
+    "Sketch",
+    "TopK",
+    "TypedArray",
+    "accumulator_for",
+    "acollectiondict",
+    "areverse_mapping",
+    "areverse_multimapping",
+    "batched_collectiondict",
+    "collectiondict",
+    "compact_collectiondict",
+    "compact_reverse_multimapping",
+    "csv_collectiondict",
+    "deduplicate",
+    "external_collectiondict",
+    "group_arrays",
+    "iter_collectiondict",
+    "jsonl_collectiondict",
+    "load_collectiondict",
+    "merge_collectiondicts",
+    "multi_collectiondict",
+    "nested_collectiondict",
+    "parallel_collectiondict",
+    "register_accumulator",
+    "reverse_mapping",
+    "reverse_multimapping",
+    "save_collectiondict",
+    "save_mapped_collectiondict",
+    "split_into_shards",
+]
@@ -0,0 +1,469 @@
+import abc
+import itertools
+import typing as t
+from collections import Counter
+
+from ._sketches import Sketch
+
+_KeyT = t.TypeVar("_KeyT", bound=t.Hashable)
+_BufferT = t.TypeVar("_BufferT")
+_CollectionT = t.TypeVar("_CollectionT")
+
+
+class Accumulator(abc.ABC, t.Generic[_BufferT, _CollectionT]):
+    """
+    Strategy to collect the values of a key into a collection
+
+    Every group starts as an empty buffer created by `init`. Values are added
+    one by one by `add` or, several at once, by `add_all`. When merging
+    multi-dictionaries, a whole collection of the merged type is added by
+    `extend`. Finally, every buffer is turned into the collection by
+    `finalize`. Only `init` and `add` must be implemented. By default,
+    `add_all` adds the values one by one, `extend` adds the values of the
+    collection by `add_all` and `finalize` returns the buffer as is.
+
+    Accumulators are registered for a collection type by
+    `register_accumulator`. Afterwards, the type and its subclasses can be
+    passed as `clct` to `collectiondict`, `reverse_mapping`,
+    `reverse_multimapping` and `merge_collectiondicts`. The accumulators of
+    the built-in collections override `collect`, `collect_reversed` and
+    `merge` with dedicated loops. Other accumulators may do so as well.
+    """
+
+    @abc.abstractmethod
+    def init(self, clct: t.Type[_CollectionT]) -> _BufferT:
+        """
+        Create the empty buffer of a new group
+        """
+
+    @abc.abstractmethod
+    def add(self, buffer: _BufferT, value: t.Any) -> None:
+        """
+        Add a single value to a buffer
+        """
+
+    def add_all(self, buffer: _BufferT, values: t.Iterable[t.Any]) -> None:
+        """
+        Add all values of an iterable to a buffer
+        """
+        for value in values:
+            self.add(buffer, value)
+
+    def extend(self, buffer: _BufferT, values: t.Any) -> None:
+        """
+        Add a collection to be merged to a buffer
+        """
+        self.add_all(buffer, values)
+
+    def finalize(self, clct: t.Type[_CollectionT], buffer: _BufferT) -> _CollectionT:
+        """
+        Turn a buffer into the collection of its group
+        """
+        return t.cast(_CollectionT, buffer)
+
+    def build(
+        self, clct: t.Type[_CollectionT], values: t.Iterable[t.Any]
+    ) -> _CollectionT:
+        """
+        Create the collection of a single group from its values
+        """
+        buffer = self.init(clct)
+        self.add_all(buffer, values)
+        return self.finalize(clct, buffer)
+
+    def collect(
+        self, clct: t.Type[_CollectionT], iterable: t.Iterable[tuple[_KeyT, t.Any]]
+    ) -> dict[_KeyT, _CollectionT]:
+        """
+        Collect a stream of key-value tuples into a multi-dictionary
+        """
+        buffers: dict[_KeyT, _BufferT] = {}
+        add = self.add
+        for key, val in iterable:
+            try:
+                buffer = buffers[key]
+            except KeyError:
+                buffer = buffers[key] = self.init(clct)
+            add(buffer, val)
+        return self.finalize_all(clct, buffers)
+
+    def collect_reversed(
+        self, clct: t.Type[_CollectionT], mapping: t.Mapping[t.Any, t.Iterable[_KeyT]]
+    ) -> dict[_KeyT, _CollectionT]:
+        """
+        Collect the keys of a mapping by each of their values
+        """
+        pairs = (zip(values, itertools.repeat(key)) for key, values in mapping.items())
+        return self.collect(clct, itertools.chain.from_iterable(pairs))
+
+    def merge(
+        self, clct: t.Type[_CollectionT], dicts: t.Iterable[t.Mapping[_KeyT, t.Any]]
+    ) -> dict[_KeyT, _CollectionT]:
+        """
+        Merge the groups of equal keys of several multi-dictionaries
+        """
+        buffers: dict[_KeyT, _BufferT] = {}
+        for dict_ in dicts:
+            for key, values in dict_.items():
+                try:
+                    buffer = buffers[key]
+                except KeyError:
+                    buffer = buffers[key] = self.init(clct)
+                self.extend(buffer, values)
+        return self.finalize_all(clct, buffers)
+
+    def finalize_all(
+        self, clct: t.Type[_CollectionT], buffers: dict[_KeyT, _BufferT]
+    ) -> dict[_KeyT, _CollectionT]:
+        """
+        Turn the buffers of all groups into their collections
+        """
+        if type(self).finalize is Accumulator.finalize:
+            return t.cast(dict[_KeyT, _CollectionT], buffers)
+        return {key: self.finalize(clct, buffer) for key, buffer in buffers.items()}
+
+
+_REGISTRY: dict[type, Accumulator[t.Any, t.Any]] = {}
+# Looking up the accumulator of a type walks its MRO. The result is cached by
+# the exact type, so that repeated calls only cost a dictionary lookup.
+_CACHE: dict[type, Accumulator[t.Any, t.Any]] = {}
+
+
+def register_accumulator(
+    clct: t.Type[t.Any], accumulator: Accumulator[t.Any, t.Any]
+) -> None:
+    """
+    Register the strategy to collect values into collections of type `clct`
+
+    The accumulator is used for `clct` and all of its subclasses, unless a
+    more specific type has an accumulator of its own. Registering another
+    accumulator for an already registered type replaces it.
+
+    Examples:
+    ---------
+    >>> from collections import deque
+    >>> from collectiondict import collectiondict
+    >>> class Queue(deque):
+    ...     pass
+    >>> class QueueAccumulator(Accumulator):
+    ...     def init(self, clct):
+    ...         return clct()
+    ...     def add(self, buffer, value):
+    ...         buffer.append(value)
+    >>> register_accumulator(Queue, QueueAccumulator())
+    >>> collectiondict(Queue, [("a", 1), ("b", 2), ("a", 3)])
+    {'a': Queue([1, 3]), 'b': Queue([2])}
+    """
+    if not isinstance(clct, type):
+        raise ValueError("Accumulators can only be registered for types!")
+    _REGISTRY[clct] = accumulator
+    _CACHE.clear()
+
+
+def accumulator_for(clct: t.Type[t.Any]) -> Accumulator[t.Any, t.Any]:
+    """
+    Look up the strategy to collect values into collections of type `clct`
+
+    The accumulator registered for the most specific type of the MRO of `clct`
+    is returned. If there is none, an `AssertionError` is raised, like by
+    `collectiondict`. This allows to delegate to the accumulator of a base
+    type, e.g. in the accumulator of a subclass.
+
+    Examples:
+    ---------
+    >>> from collections import Counter
+    >>> counters = accumulator_for(Counter)
+    >>> counter = counters.init(Counter)
+    >>> counters.add_all(counter, "abca")
+    >>> counter
+    Counter({'a': 2, 'b': 1, 'c': 1})
+    """
+    try:
+        return _CACHE[clct]
+    except KeyError:
+        pass
+    # Generic aliases, e.g. `list[int]`, forward `__mro__` to their origin.
+    # They are rejected nonetheless, like by the other functions.
+    if isinstance(clct, type):
+        for base in clct.__mro__:
+            if base in _REGISTRY:
+                accumulator = _CACHE[clct] = _REGISTRY[base]
+                return accumulator
+    raise AssertionError("Invalid collection type passed!")
+
+
+class _CounterAccumulator(Accumulator[Counter[t.Any], Counter[t.Any]]):
+    def init(self, clct: t.Type[Counter[t.Any]]) -> Counter[t.Any]:
+        return clct()
+
+    def add(self, buffer: Counter[t.Any], value: t.Any) -> None:
+        buffer[value] += 1
+
+    def add_all(self, buffer: Counter[t.Any], values: t.Iterable[t.Any]) -> None:
+        buffer.update(values)
+
+    def collect(
+        self, clct: t.Type[Counter[t.Any]], iterable: t.Iterable[tuple[_KeyT, t.Any]]
+    ) -> dict[_KeyT, Counter[t.Any]]:
+        ret: dict[_KeyT, Counter[t.Any]] = {}
+        for key, val in iterable:
+            try:
+                ret[key][val] += 1
+            except KeyError:
+                ret[key] = clct([val])
+        return ret
+
+    def collect_reversed(
+        self,
+        clct: t.Type[Counter[t.Any]],
+        mapping: t.Mapping[t.Any, t.Iterable[_KeyT]],
+    ) -> dict[_KeyT, Counter[t.Any]]:
+        # The loops of `collect_reversed` are inverted versions of the ones of
+        # `collect`. Compared to feeding `collect` with a generator of swapped
+        # pairs, they save a tuple and a generator frame switch per value.
+        ret: dict[_KeyT, Counter[t.Any]] = {}
+        for key, values in mapping.items():
+            for val in values:
+                try:
+                    ret[val][key] += 1
+                except KeyError:
+                    ret[val] = clct([key])
+        return ret
+
+    def merge(
+        self,
+        clct: t.Type[Counter[t.Any]],
+        dicts: t.Iterable[t.Mapping[_KeyT, t.Any]],
+    ) -> dict[_KeyT, Counter[t.Any]]:
+        ret: dict[_KeyT, Counter[t.Any]] = {}
+        for dict_ in dicts:
+            for key, counter in dict_.items():
+                try:
+                    ret[key].update(counter)
+                except KeyError:
+                    ret[key] = clct(counter)
+        return ret
+
+
+class _ListAccumulator(Accumulator[list[t.Any], list[t.Any]]):
+    def init(self, clct: t.Type[list[t.Any]]) -> list[t.Any]:
+        return clct()
+
+    def add(self, buffer: list[t.Any], value: t.Any) -> None:
+        buffer.append(value)
+
+    def add_all(self, buffer: list[t.Any], values: t.Iterable[t.Any]) -> None:
+        buffer.extend(values)
+
+    def collect(
+        self, clct: t.Type[list[t.Any]], iterable: t.Iterable[tuple[_KeyT, t.Any]]
+    ) -> dict[_KeyT, list[t.Any]]:
+        ret: dict[_KeyT, list[t.Any]] = {}
+        for key, val in iterable:
+            try:
+                ret[key].append(val)
+            except KeyError:
+                ret[key] = clct([val])
+        return ret
+
+    def collect_reversed(
+        self, clct: t.Type[list[t.Any]], mapping: t.Mapping[t.Any, t.Iterable[_KeyT]]
+    ) -> dict[_KeyT, list[t.Any]]:
+        ret: dict[_KeyT, list[t.Any]] = {}
+        for key, values in mapping.items():
+            for val in values:
+                try:
+                    ret[val].append(key)
+                except KeyError:
+                    ret[val] = clct([key])
+        return ret
+
+    def merge(
+        self, clct: t.Type[list[t.Any]], dicts: t.Iterable[t.Mapping[_KeyT, t.Any]]
+    ) -> dict[_KeyT, list[t.Any]]:
+        ret: dict[_KeyT, list[t.Any]] = {}
+        for dict_ in dicts:
+            for key, values in dict_.items():
+                try:
+                    ret[key].extend(values)
+                except KeyError:
+                    ret[key] = clct(values)
+        return ret
+
+
+class _SetAccumulator(Accumulator[set[t.Any], set[t.Any]]):
+    def init(self, clct: t.Type[set[t.Any]]) -> set[t.Any]:
+        return clct()
+
+    def add(self, buffer: set[t.Any], value: t.Any) -> None:
+        buffer.add(value)
+
+    def add_all(self, buffer: set[t.Any], values: t.Iterable[t.Any]) -> None:
+        buffer.update(values)
+
+    def collect(
+        self, clct: t.Type[set[t.Any]], iterable: t.Iterable[tuple[_KeyT, t.Any]]
+    ) -> dict[_KeyT, set[t.Any]]:
+        ret: dict[_KeyT, set[t.Any]] = {}
+        for key, val in iterable:
+            try:
+                ret[key].add(val)
+            except KeyError:
+                ret[key] = clct([val])
+        return ret
+
+    def collect_reversed(
+        self, clct: t.Type[set[t.Any]], mapping: t.Mapping[t.Any, t.Iterable[_KeyT]]
+    ) -> dict[_KeyT, set[t.Any]]:
+        ret: dict[_KeyT, set[t.Any]] = {}
+        for key, values in mapping.items():
+            for val in values:
+                try:
+                    ret[val].add(key)
+                except KeyError:
+                    ret[val] = clct([key])
+        return ret
+
+    def merge(
+        self, clct: t.Type[set[t.Any]], dicts: t.Iterable[t.Mapping[_KeyT, t.Any]]
+    ) -> dict[_KeyT, set[t.Any]]:
+        ret: dict[_KeyT, set[t.Any]] = {}
+        for dict_ in dicts:
+            for key, values in dict_.items():
+                try:
+                    ret[key].update(values)
+                except KeyError:
+                    ret[key] = clct(values)
+        return ret
+
+
+class _FrozensetAccumulator(Accumulator[set[t.Any], frozenset[t.Any]]):
+    # Frozensets cannot grow. Extending them one value at a time would copy the
+    # whole group for every new value. Collecting into sets and freezing every
+    # group once keeps this linear in the number of values.
+
+    def init(self, clct: t.Type[frozenset[t.Any]]) -> set[t.Any]:
+        return set()
+
+    def add(self, buffer: set[t.Any], value: t.Any) -> None:
+        buffer.add(value)
+
+    def add_all(self, buffer: set[t.Any], values: t.Iterable[t.Any]) -> None:
+        buffer.update(values)
+
+    def finalize(
+        self, clct: t.Type[frozenset[t.Any]], buffer: set[t.Any]
+    ) -> frozenset[t.Any]:
+        return clct(buffer)
+
+    def collect(
+        self,
+        clct: t.Type[frozenset[t.Any]],
+        iterable: t.Iterable[tuple[_KeyT, t.Any]],
+    ) -> dict[_KeyT, frozenset[t.Any]]:
+        return self.finalize_all(clct, _SETS.collect(set, iterable))
+
+    def collect_reversed(
+        self,
+        clct: t.Type[frozenset[t.Any]],
+        mapping: t.Mapping[t.Any, t.Iterable[_KeyT]],
+    ) -> dict[_KeyT, frozenset[t.Any]]:
+        return self.finalize_all(clct, _SETS.collect_reversed(set, mapping))
+
+    def merge(
+        self,
+        clct: t.Type[frozenset[t.Any]],
+        dicts: t.Iterable[t.Mapping[_KeyT, t.Any]],
+    ) -> dict[_KeyT, frozenset[t.Any]]:
+        return self.finalize_all(clct, _SETS.merge(set, dicts))
+
+
+class _TupleAccumulator(Accumulator[list[t.Any], tuple[t.Any, ...]]):
+    # Like for frozensets, values are collected into mutable lists first and
+    # each group is converted only once, instead of rebuilding it per value.
+
+    def init(self, clct: t.Type[tuple[t.Any, ...]]) -> list[t.Any]:
+        return []
+
+    def add(self, buffer: list[t.Any], value: t.Any) -> None:
+        buffer.append(value)
+
+    def add_all(self, buffer: list[t.Any], values: t.Iterable[t.Any]) -> None:
+        buffer.extend(values)
+
+    def finalize(
+        self, clct: t.Type[tuple[t.Any, ...]], buffer: list[t.Any]
+    ) -> tuple[t.Any, ...]:
+        return clct(buffer)
+
+    def collect(
+        self,
+        clct: t.Type[tuple[t.Any, ...]],
+        iterable: t.Iterable[tuple[_KeyT, t.Any]],
+    ) -> dict[_KeyT, tuple[t.Any, ...]]:
+        return self.finalize_all(clct, _LISTS.collect(list, iterable))
+
+    def collect_reversed(
+        self,
+        clct: t.Type[tuple[t.Any, ...]],
+        mapping: t.Mapping[t.Any, t.Iterable[_KeyT]],
+    ) -> dict[_KeyT, tuple[t.Any, ...]]:
+        return self.finalize_all(clct, _LISTS.collect_reversed(list, mapping))
+
+    def merge(
+        self,
+        clct: t.Type[tuple[t.Any, ...]],
+        dicts: t.Iterable[t.Mapping[_KeyT, t.Any]],
+    ) -> dict[_KeyT, tuple[t.Any, ...]]:
+        return self.finalize_all(clct, _LISTS.merge(list, dicts))
+
+
+class _SketchAccumulator(Accumulator[Sketch, Sketch]):
+    def init(self, clct: t.Type[Sketch]) -> Sketch:
+        return clct()
+
+    def add(self, buffer: Sketch, value: t.Any) -> None:
+        buffer.add(value)
+
+    def add_all(self, buffer: Sketch, values: t.Iterable[t.Any]) -> None:
+        buffer.update(values)
+
+    def extend(self, buffer: Sketch, values: Sketch) -> None:
+        buffer.merge(values)
+
+    def collect(
+        self, clct: t.Type[Sketch], iterable: t.Iterable[tuple[_KeyT, t.Any]]
+    ) -> dict[_KeyT, Sketch]:
+        ret: dict[_KeyT, Sketch] = {}
+        for key, val in iterable:
+            try:
+                ret[key].add(val)
+            except KeyError:
+                ret[key] = clct([val])
+        return ret
+
+
+_LISTS = _ListAccumulator()
+_SETS = _SetAccumulator()
+
+register_accumulator(Counter, _CounterAccumulator())
+register_accumulator(list, _LISTS)
+register_accumulator(set, _SETS)
+register_accumulator(frozenset, _FrozensetAccumulator())
+register_accumulator(tuple, _TupleAccumulator())
+register_accumulator(Sketch, _SketchAccumulator())
+
+# The buffers of the built-in accumulators are Counters, lists or sets. Other
+# modules use this to run dedicated loops for them, e.g. over asynchronous
+# streams, and fall back to `init` and `add` for other accumulators.
+_BUFFER_TYPES: dict[type, type] = {
+    _CounterAccumulator: Counter,
+    _ListAccumulator: list,
+    _SetAccumulator: set,
+    _FrozensetAccumulator: set,
+    _TupleAccumulator: list,
+}
+
+
+def _buffer_type(accumulator: Accumulator[t.Any, t.Any]) -> t.Optional[type]:
+    return _BUFFER_TYPES.get(type(accumulator))
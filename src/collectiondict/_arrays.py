@@ -0,0 +1,86 @@
+import typing as t
+from array import array
+
+_KeyT = t.TypeVar("_KeyT", bound=t.Hashable)
+_NumberT = t.TypeVar("_NumberT", int, float)
+
+_IntTypeCode = t.Literal["b", "B", "h", "H", "i", "I", "l", "L", "q", "Q"]
+_FloatTypeCode = t.Literal["f", "d"]
+_TYPECODES = frozenset("bBhHiIlLqQfd")
+
+
+class TypedArray(t.Generic[_NumberT]):
+    """
+    Collect numbers unboxed into an `array.array` of type `typecode`
+
+    Instances can be passed as `clct` to `collectiondict`, `reverse_mapping`,
+    `reverse_multimapping` and `merge_collectiondicts`. Compared to a list,
+    which holds a pointer to a boxed object per value, an array needs only the
+    size of its item type, e.g. 8 bytes for `"q"` and `"d"`. Values that do
+    not fit the type raise an `OverflowError` or a `TypeError`, like for
+    `array.array` itself.
+
+    Examples:
+    ---------
+    >>> from collectiondict import collectiondict
+    >>> collectiondict(TypedArray("q"), [("a", 1), ("b", 2), ("a", 3)])
+    {'a': array('q', [1, 3]), 'b': array('q', [2])}
+    """
+
+    __slots__ = ("typecode",)
+
+    @t.overload
+    def __init__(  # pragma: nocover
+        self: "TypedArray[int]", typecode: _IntTypeCode
+    ) -> None: ...
+
+    @t.overload
+    def __init__(  # pragma: nocover
+        self: "TypedArray[float]", typecode: _FloatTypeCode
+    ) -> None: ...
+
+    def __init__(self, typecode: str) -> None:
+        if typecode not in _TYPECODES:
+            raise ValueError(f"Unsupported typecode {typecode!r} passed!")
+        self.typecode = typecode
+
+    def __repr__(self) -> str:
+        return f"TypedArray({self.typecode!r})"
+
+    def collect(
+        self, iterable: t.Iterable[tuple[_KeyT, _NumberT]]
+    ) -> "dict[_KeyT, array[_NumberT]]":
+        """
+        Collect the values of every key of the stream of key-value tuples
+        """
+        ret: dict[_KeyT, array[_NumberT]] = {}
+        typecode = self.typecode
+        for key, val in iterable:
+            try:
+                ret[key].append(val)
+            except KeyError:
+                ret[key] = array(typecode, (val,))
+        return ret
+
+    def merge(
+        self, dicts: t.Iterable[t.Mapping[_KeyT, t.Iterable[_NumberT]]]
+    ) -> "dict[_KeyT, array[_NumberT]]":
+        """
+        Concatenate the collections of equal keys of all dictionaries
+        """
+        # Arrays of the same typecode are appended by copying their memory at
+        # once. Other iterables, including arrays of other typecodes, which
+        # `array.extend` rejects, are converted value by value.
+        ret: dict[_KeyT, array[_NumberT]] = {}
+        typecode = self.typecode
+        for dict_ in dicts:
+            for key, values in dict_.items():
+                try:
+                    group = ret[key]
+                except KeyError:
+                    group = ret[key] = array(typecode)
+                if isinstance(values, array) and values.typecode != typecode:
+                    group.fromlist(values.tolist())
+                else:
+                    group.extend(values)
+        return ret
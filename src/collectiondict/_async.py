@@ -0,0 +1,563 @@
+import itertools
+import typing as t
+from collections import Counter
+
+from ._accumulators import Accumulator, _buffer_type, accumulator_for
+from ._bitmaps import IntBitmap
+from ._sketches import Sketch
+
+_KeyT = t.TypeVar("_KeyT", bound=t.Hashable)
+_ValueT = t.TypeVar("_ValueT")
+_HashableValueT = t.TypeVar("_HashableValueT", bound=t.Hashable)
+_ItemT = t.TypeVar("_ItemT")
+_BufferT = t.TypeVar("_BufferT")
+_SketchT = t.TypeVar("_SketchT", bound=Sketch)
+
+# Depending on `batched`, the elements of the input are single items or
+# iterables of items.
+_Source = t.Union[t.AsyncIterable[_ItemT], t.AsyncIterable[t.Iterable[_ItemT]]]
+_ToPairs = t.Callable[[t.Any], t.Iterable[tuple[_KeyT, _ValueT]]]
+_Loop = t.Callable[
+    [t.Any, t.Type[t.Any], t.AsyncIterable[t.Any]],
+    t.Awaitable[dict[t.Any, t.Any]],
+]
+_BatchLoop = t.Callable[
+    [t.Any, t.Type[t.Any], t.AsyncIterable[t.Any], _ToPairs[t.Any, t.Any]],
+    t.Awaitable[dict[t.Any, t.Any]],
+]
+
+
+@t.overload
+async def acollectiondict(  # pragma: nocover
+    clct: t.Type[Counter[_HashableValueT]],
+    aiterable: _Source[tuple[_KeyT, _HashableValueT]],
+    *,
+    batched: bool = False,
+) -> dict[_KeyT, Counter[_HashableValueT]]: ...
+
+
+@t.overload
+async def acollectiondict(  # pragma: nocover
+    clct: t.Type[list[_ValueT]],
+    aiterable: _Source[tuple[_KeyT, _ValueT]],
+    *,
+    batched: bool = False,
+) -> dict[_KeyT, list[_ValueT]]: ...
+
+
+@t.overload
+async def acollectiondict(  # pragma: nocover
+    clct: t.Type[set[_HashableValueT]],
+    aiterable: _Source[tuple[_KeyT, _HashableValueT]],
+    *,
+    batched: bool = False,
+) -> dict[_KeyT, set[_HashableValueT]]: ...
+
+
+@t.overload
+async def acollectiondict(  # pragma: nocover
+    clct: t.Type[frozenset[_HashableValueT]],
+    aiterable: _Source[tuple[_KeyT, _HashableValueT]],
+    *,
+    batched: bool = False,
+) -> dict[_KeyT, frozenset[_HashableValueT]]: ...
+
+
+@t.overload
+async def acollectiondict(  # pragma: nocover
+    clct: t.Type[tuple[_ValueT, ...]],
+    aiterable: _Source[tuple[_KeyT, _ValueT]],
+    *,
+    batched: bool = False,
+) -> dict[_KeyT, tuple[_ValueT, ...]]: ...
+
+
+@t.overload
+async def acollectiondict(  # pragma: nocover
+    clct: t.Type[IntBitmap],
+    aiterable: _Source[tuple[_KeyT, int]],
+    *,
+    batched: bool = False,
+) -> dict[_KeyT, IntBitmap]: ...
+
+
+@t.overload
+async def acollectiondict(  # pragma: nocover
+    clct: t.Type[_SketchT],
+    aiterable: _Source[tuple[_KeyT, t.Hashable]],
+    *,
+    batched: bool = False,
+) -> dict[_KeyT, _SketchT]: ...
+
+
+async def acollectiondict(
+    clct: t.Union[
+        t.Type[Sketch],
+        t.Type[IntBitmap],
+        t.Type[Counter[_ValueT]],
+        t.Type[list[_ValueT]],
+        t.Type[set[_ValueT]],
+        t.Type[frozenset[_ValueT]],
+        t.Type[tuple[_ValueT, ...]],
+    ],
+    aiterable: _Source[tuple[_KeyT, _ValueT]],
+    *,
+    batched: bool = False,
+) -> t.Union[
+    dict[_KeyT, Counter[_ValueT]],
+    dict[_KeyT, list[_ValueT]],
+    dict[_KeyT, set[_ValueT]],
+    dict[_KeyT, frozenset[_ValueT]],
+    dict[_KeyT, tuple[_ValueT, ...]],
+    dict[_KeyT, t.Any],
+]:
+    """
+    Create dictionaries that collect values from asynchronous streams
+
+    This coroutine is the asynchronous counterpart of `collectiondict`. It
+    consumes any asynchronous stream of key-value tuples, e.g. an asynchronous
+    generator, and collects the values as they arrive. Thus, the stream does
+    not need to be buffered into a list first. Like for `collectiondict`,
+    `clct` can be any type with a registered accumulator.
+
+    If `batched` is set, every element of the stream must be an iterable of
+    key-value tuples instead, e.g. a list of tuples. Every batch is collected
+    without awaiting. This saves the overhead of awaiting every single tuple.
+
+    Examples:
+    ---------
+    >>> import asyncio
+    >>> async def stream():
+    ...     for pair in [("a", 1), ("b", 2), ("a", 3)]:
+    ...         yield pair
+    >>> asyncio.run(acollectiondict(set, stream()))
+    {'a': {1, 3}, 'b': {2}}
+
+    Consuming batches of tuples:
+    >>> async def batches():
+    ...     yield [("a", 1), ("b", 2)]
+    ...     yield [("a", 3)]
+    >>> asyncio.run(acollectiondict(list, batches(), batched=True))
+    {'a': [1, 3], 'b': [2]}
+    """
+
+    if batched:
+        return await _acollect_batches(clct, aiterable, _identity)
+    # Without `batched`, the elements of the stream are the tuples themselves.
+    apairs = t.cast(t.AsyncIterable[tuple[_KeyT, _ValueT]], aiterable)
+    return await _acollect(clct, apairs)
+
+
+@t.overload
+async def areverse_mapping(  # pragma: nocover
+    clct: t.Type[Counter[_KeyT]],
+    aitems: _Source[tuple[_KeyT, _HashableValueT]],
+    *,
+    batched: bool = False,
+) -> dict[_HashableValueT, Counter[_KeyT]]: ...
+
+
+@t.overload
+async def areverse_mapping(  # pragma: nocover
+    clct: t.Type[frozenset[_KeyT]],
+    aitems: _Source[tuple[_KeyT, _HashableValueT]],
+    *,
+    batched: bool = False,
+) -> dict[_HashableValueT, frozenset[_KeyT]]: ...
+
+
+@t.overload
+async def areverse_mapping(  # pragma: nocover
+    clct: t.Type[list[_KeyT]],
+    aitems: _Source[tuple[_KeyT, _HashableValueT]],
+    *,
+    batched: bool = False,
+) -> dict[_HashableValueT, list[_KeyT]]: ...
+
+
+@t.overload
+async def areverse_mapping(  # pragma: nocover
+    clct: t.Type[tuple[_KeyT, ...]],
+    aitems: _Source[tuple[_KeyT, _HashableValueT]],
+    *,
+    batched: bool = False,
+) -> dict[_HashableValueT, tuple[_KeyT, ...]]: ...
+
+
+@t.overload
+async def areverse_mapping(  # pragma: nocover
+    clct: t.Type[set[_KeyT]],
+    aitems: _Source[tuple[_KeyT, _HashableValueT]],
+    *,
+    batched: bool = False,
+) -> dict[_HashableValueT, set[_KeyT]]: ...
+
+
+@t.overload
+async def areverse_mapping(  # pragma: nocover
+    clct: t.Type[IntBitmap],
+    aitems: _Source[tuple[int, _HashableValueT]],
+    *,
+    batched: bool = False,
+) -> dict[_HashableValueT, IntBitmap]: ...
+
+
+@t.overload
+async def areverse_mapping(  # pragma: nocover
+    clct: t.Type[_SketchT],
+    aitems: _Source[tuple[_KeyT, _HashableValueT]],
+    *,
+    batched: bool = False,
+) -> dict[_HashableValueT, _SketchT]: ...
+
+
+async def areverse_mapping(
+    clct: t.Union[
+        t.Type[Sketch],
+        t.Type[IntBitmap],
+        t.Type[Counter[_KeyT]],
+        t.Type[frozenset[_KeyT]],
+        t.Type[list[_KeyT]],
+        t.Type[set[_KeyT]],
+        t.Type[tuple[_KeyT, ...]],
+    ],
+    aitems: _Source[tuple[_KeyT, _HashableValueT]],
+    *,
+    batched: bool = False,
+) -> t.Union[
+    dict[_HashableValueT, Counter[_KeyT]],
+    dict[_HashableValueT, frozenset[_KeyT]],
+    dict[_HashableValueT, list[_KeyT]],
+    dict[_HashableValueT, set[_KeyT]],
+    dict[_HashableValueT, tuple[_KeyT, ...]],
+    dict[_HashableValueT, t.Any],
+]:
+    """
+    Reverse an asynchronous stream of mapping items to map from values to keys
+
+    This coroutine is the asynchronous counterpart of `reverse_mapping`.
+    Instead of a mapping, it consumes an asynchronous stream of its items,
+    i.e. key-value tuples. If `batched` is set, every element of the stream
+    must be an iterable of such items.
+
+    Examples:
+    ---------
+    >>> import asyncio
+    >>> async def items():
+    ...     for item in [(1, "foobar"), (2, "blablubb"), (3, "foobar")]:
+    ...         yield item
+    >>> asyncio.run(areverse_mapping(set, items()))
+    {'foobar': {1, 3}, 'blablubb': {2}}
+    """
+
+    if batched:
+        return await _acollect_batches(clct, aitems, _swapped_batch)
+    single_items = t.cast(t.AsyncIterable[tuple[_KeyT, _HashableValueT]], aitems)
+    return await _acollect(clct, _aswapped(single_items))
+
+
+@t.overload
+async def areverse_multimapping(  # pragma: nocover
+    clct: t.Type[Counter[_KeyT]],
+    aitems: _Source[tuple[_KeyT, t.Iterable[_HashableValueT]]],
+    *,
+    batched: bool = False,
+) -> dict[_HashableValueT, Counter[_KeyT]]: ...
+
+
+@t.overload
+async def areverse_multimapping(  # pragma: nocover
+    clct: t.Type[frozenset[_KeyT]],
+    aitems: _Source[tuple[_KeyT, t.Iterable[_HashableValueT]]],
+    *,
+    batched: bool = False,
+) -> dict[_HashableValueT, frozenset[_KeyT]]: ...
+
+
+@t.overload
+async def areverse_multimapping(  # pragma: nocover
+    clct: t.Type[list[_KeyT]],
+    aitems: _Source[tuple[_KeyT, t.Iterable[_HashableValueT]]],
+    *,
+    batched: bool = False,
+) -> dict[_HashableValueT, list[_KeyT]]: ...
+
+
+@t.overload
+async def areverse_multimapping(  # pragma: nocover
+    clct: t.Type[tuple[_KeyT, ...]],
+    aitems: _Source[tuple[_KeyT, t.Iterable[_HashableValueT]]],
+    *,
+    batched: bool = False,
+) -> dict[_HashableValueT, tuple[_KeyT, ...]]: ...
+
+
+@t.overload
+async def areverse_multimapping(  # pragma: nocover
+    clct: t.Type[set[_KeyT]],
+    aitems: _Source[tuple[_KeyT, t.Iterable[_HashableValueT]]],
+    *,
+    batched: bool = False,
+) -> dict[_HashableValueT, set[_KeyT]]: ...
+
+
+@t.overload
+async def areverse_multimapping(  # pragma: nocover
+    clct: t.Type[IntBitmap],
+    aitems: _Source[tuple[int, t.Iterable[_HashableValueT]]],
+    *,
+    batched: bool = False,
+) -> dict[_HashableValueT, IntBitmap]: ...
+
+
+@t.overload
+async def areverse_multimapping(  # pragma: nocover
+    clct: t.Type[_SketchT],
+    aitems: _Source[tuple[_KeyT, t.Iterable[_HashableValueT]]],
+    *,
+    batched: bool = False,
+) -> dict[_HashableValueT, _SketchT]: ...
+
+
+async def areverse_multimapping(
+    clct: t.Union[
+        t.Type[Sketch],
+        t.Type[IntBitmap],
+        t.Type[Counter[_KeyT]],
+        t.Type[frozenset[_KeyT]],
+        t.Type[list[_KeyT]],
+        t.Type[set[_KeyT]],
+        t.Type[tuple[_KeyT, ...]],
+    ],
+    aitems: _Source[tuple[_KeyT, t.Iterable[_HashableValueT]]],
+    *,
+    batched: bool = False,
+) -> t.Union[
+    dict[_HashableValueT, Counter[_KeyT]],
+    dict[_HashableValueT, frozenset[_KeyT]],
+    dict[_HashableValueT, list[_KeyT]],
+    dict[_HashableValueT, set[_KeyT]],
+    dict[_HashableValueT, tuple[_KeyT, ...]],
+    dict[_HashableValueT, t.Any],
+]:
+    """
+    Reverse an asynchronous stream of multimapping items
+
+    This coroutine is the asynchronous counterpart of `reverse_multimapping`.
+    Instead of a mapping, it consumes an asynchronous stream of its items,
+    i.e. tuples of a key and an iterable of values. If `batched` is set, every
+    element of the stream must be an iterable of such items.
+
+    Examples:
+    ---------
+    >>> import asyncio
+    >>> async def items():
+    ...     for item in [(1, "abc"), (2, "bcd"), (3, "a")]:
+    ...         yield item
+    >>> asyncio.run(areverse_multimapping(set, items()))
+    {'a': {1, 3}, 'b': {1, 2}, 'c': {1, 2}, 'd': {2}}
+    """
+
+    # Every item stands for many values. Thus, it is collected like a batch.
+    to_pairs: _ToPairs[_HashableValueT, _KeyT]
+    to_pairs = _spread_batch if batched else _spread
+    return await _acollect_batches(clct, aitems, to_pairs)
+
+
+async def _acollect(
+    clct: t.Type[t.Any], apairs: t.AsyncIterable[tuple[_KeyT, t.Any]]
+) -> dict[_KeyT, t.Any]:
+    accumulator = accumulator_for(clct)
+    loop: _Loop = _LOOPS.get(_buffer_type(accumulator), _acollect_buffers)
+    buffers = await loop(accumulator, clct, apairs)
+    return accumulator.finalize_all(clct, buffers)
+
+
+async def _acollect_batches(
+    clct: t.Type[t.Any],
+    aiterable: t.AsyncIterable[t.Any],
+    to_pairs: _ToPairs[_KeyT, _ValueT],
+) -> dict[_KeyT, t.Any]:
+    # Every element of the stream is turned into an iterable of key-value
+    # tuples, which is collected without awaiting. This way, the same loops
+    # serve batches and items of multimappings.
+    accumulator = accumulator_for(clct)
+    loop: _BatchLoop = _BATCH_LOOPS.get(
+        _buffer_type(accumulator), _acollect_buffer_batches
+    )
+    buffers = await loop(accumulator, clct, aiterable, to_pairs)
+    return accumulator.finalize_all(clct, buffers)
+
+
+async def _acollect_counters(
+    accumulator: Accumulator[Counter[t.Any], t.Any],
+    clct: t.Type[t.Any],
+    apairs: t.AsyncIterable[tuple[_KeyT, t.Any]],
+) -> dict[_KeyT, Counter[t.Any]]:
+    ret: dict[_KeyT, Counter[t.Any]] = {}
+    async for key, val in apairs:
+        try:
+            ret[key][val] += 1
+        except KeyError:
+            ret[key] = accumulator.init(clct)
+            ret[key][val] += 1
+    return ret
+
+
+async def _acollect_lists(
+    accumulator: Accumulator[list[t.Any], t.Any],
+    clct: t.Type[t.Any],
+    apairs: t.AsyncIterable[tuple[_KeyT, t.Any]],
+) -> dict[_KeyT, list[t.Any]]:
+    ret: dict[_KeyT, list[t.Any]] = {}
+    async for key, val in apairs:
+        try:
+            ret[key].append(val)
+        except KeyError:
+            ret[key] = accumulator.init(clct)
+            ret[key].append(val)
+    return ret
+
+
+async def _acollect_sets(
+    accumulator: Accumulator[set[t.Any], t.Any],
+    clct: t.Type[t.Any],
+    apairs: t.AsyncIterable[tuple[_KeyT, t.Any]],
+) -> dict[_KeyT, set[t.Any]]:
+    ret: dict[_KeyT, set[t.Any]] = {}
+    async for key, val in apairs:
+        try:
+            ret[key].add(val)
+        except KeyError:
+            ret[key] = accumulator.init(clct)
+            ret[key].add(val)
+    return ret
+
+
+async def _acollect_buffers(
+    accumulator: Accumulator[_BufferT, t.Any],
+    clct: t.Type[t.Any],
+    apairs: t.AsyncIterable[tuple[_KeyT, t.Any]],
+) -> dict[_KeyT, _BufferT]:
+    ret: dict[_KeyT, _BufferT] = {}
+    add = accumulator.add
+    async for key, val in apairs:
+        try:
+            buffer = ret[key]
+        except KeyError:
+            buffer = ret[key] = accumulator.init(clct)
+        add(buffer, val)
+    return ret
+
+
+async def _acollect_counter_batches(
+    accumulator: Accumulator[Counter[t.Any], t.Any],
+    clct: t.Type[t.Any],
+    aiterable: t.AsyncIterable[t.Any],
+    to_pairs: _ToPairs[_KeyT, t.Any],
+) -> dict[_KeyT, Counter[t.Any]]:
+    ret: dict[_KeyT, Counter[t.Any]] = {}
+    async for elem in aiterable:
+        for key, val in to_pairs(elem):
+            try:
+                ret[key][val] += 1
+            except KeyError:
+                ret[key] = accumulator.init(clct)
+                ret[key][val] += 1
+    return ret
+
+
+async def _acollect_list_batches(
+    accumulator: Accumulator[list[t.Any], t.Any],
+    clct: t.Type[t.Any],
+    aiterable: t.AsyncIterable[t.Any],
+    to_pairs: _ToPairs[_KeyT, t.Any],
+) -> dict[_KeyT, list[t.Any]]:
+    ret: dict[_KeyT, list[t.Any]] = {}
+    async for elem in aiterable:
+        for key, val in to_pairs(elem):
+            try:
+                ret[key].append(val)
+            except KeyError:
+                ret[key] = accumulator.init(clct)
+                ret[key].append(val)
+    return ret
+
+
+async def _acollect_set_batches(
+    accumulator: Accumulator[set[t.Any], t.Any],
+    clct: t.Type[t.Any],
+    aiterable: t.AsyncIterable[t.Any],
+    to_pairs: _ToPairs[_KeyT, t.Any],
+) -> dict[_KeyT, set[t.Any]]:
+    ret: dict[_KeyT, set[t.Any]] = {}
+    async for elem in aiterable:
+        for key, val in to_pairs(elem):
+            try:
+                ret[key].add(val)
+            except KeyError:
+                ret[key] = accumulator.init(clct)
+                ret[key].add(val)
+    return ret
+
+
+async def _acollect_buffer_batches(
+    accumulator: Accumulator[_BufferT, t.Any],
+    clct: t.Type[t.Any],
+    aiterable: t.AsyncIterable[t.Any],
+    to_pairs: _ToPairs[_KeyT, t.Any],
+) -> dict[_KeyT, _BufferT]:
+    ret: dict[_KeyT, _BufferT] = {}
+    add = accumulator.add
+    async for elem in aiterable:
+        for key, val in to_pairs(elem):
+            try:
+                buffer = ret[key]
+            except KeyError:
+                buffer = ret[key] = accumulator.init(clct)
+            add(buffer, val)
+    return ret
+
+
+# The built-in accumulators collect into Counters, lists or sets, which are
+# filled by dedicated loops. Other accumulators are called per value.
+_LOOPS: dict[t.Optional[type], _Loop] = {
+    Counter: _acollect_counters,
+    list: _acollect_lists,
+    set: _acollect_sets,
+}
+_BATCH_LOOPS: dict[t.Optional[type], _BatchLoop] = {
+    Counter: _acollect_counter_batches,
+    list: _acollect_list_batches,
+    set: _acollect_set_batches,
+}
+
+
+async def _aswapped(
+    aitems: t.AsyncIterable[tuple[_KeyT, _ValueT]],
+) -> t.AsyncIterator[tuple[_ValueT, _KeyT]]:
+    async for key, val in aitems:
+        yield val, key
+
+
+def _identity(batch: _ValueT) -> _ValueT:
+    return batch
+
+
+def _swapped_batch(
+    items: t.Iterable[tuple[_KeyT, _ValueT]],
+) -> t.Iterator[tuple[_ValueT, _KeyT]]:
+    return ((val, key) for key, val in items)
+
+
+def _spread(
+    item: tuple[_KeyT, t.Iterable[_ValueT]],
+) -> t.Iterator[tuple[_ValueT, _KeyT]]:
+    key, values = item
+    return zip(values, itertools.repeat(key))
+
+
+def _spread_batch(
+    items: t.Iterable[tuple[_KeyT, t.Iterable[_ValueT]]],
+) -> t.Iterator[tuple[_ValueT, _KeyT]]:
+    return itertools.chain.from_iterable(map(_spread, items))
@@ -0,0 +1,231 @@
+import typing as t
+from collections import Counter
+
+from ._accumulators import Accumulator, _buffer_type, accumulator_for
+from ._bitmaps import IntBitmap
+from ._sketches import Sketch
+
+_KeyT = t.TypeVar("_KeyT", bound=t.Hashable)
+_ValueT = t.TypeVar("_ValueT")
+_HashableValueT = t.TypeVar("_HashableValueT", bound=t.Hashable)
+_BufferT = t.TypeVar("_BufferT")
+_SketchT = t.TypeVar("_SketchT", bound=Sketch)
+
+_Batches = t.Iterable[tuple[t.Sequence[t.Any], t.Sequence[t.Any]]]
+_Loop = t.Callable[
+    [t.Any, t.Type[t.Any], _Batches],
+    dict[t.Any, t.Any],
+]
+
+
+@t.overload
+def batched_collectiondict(  # pragma: nocover
+    clct: t.Type[Counter[_HashableValueT]],
+    batches: t.Iterable[tuple[t.Sequence[_KeyT], t.Sequence[_HashableValueT]]],
+) -> dict[_KeyT, Counter[_HashableValueT]]: ...
+
+
+@t.overload
+def batched_collectiondict(  # pragma: nocover
+    clct: t.Type[list[_ValueT]],
+    batches: t.Iterable[tuple[t.Sequence[_KeyT], t.Sequence[_ValueT]]],
+) -> dict[_KeyT, list[_ValueT]]: ...
+
+
+@t.overload
+def batched_collectiondict(  # pragma: nocover
+    clct: t.Type[set[_HashableValueT]],
+    batches: t.Iterable[tuple[t.Sequence[_KeyT], t.Sequence[_HashableValueT]]],
+) -> dict[_KeyT, set[_HashableValueT]]: ...
+
+
+@t.overload
+def batched_collectiondict(  # pragma: nocover
+    clct: t.Type[frozenset[_HashableValueT]],
+    batches: t.Iterable[tuple[t.Sequence[_KeyT], t.Sequence[_HashableValueT]]],
+) -> dict[_KeyT, frozenset[_HashableValueT]]: ...
+
+
+@t.overload
+def batched_collectiondict(  # pragma: nocover
+    clct: t.Type[tuple[_ValueT, ...]],
+    batches: t.Iterable[tuple[t.Sequence[_KeyT], t.Sequence[_ValueT]]],
+) -> dict[_KeyT, tuple[_ValueT, ...]]: ...
+
+
+@t.overload
+def batched_collectiondict(  # pragma: nocover
+    clct: t.Type[IntBitmap],
+    batches: t.Iterable[tuple[t.Sequence[_KeyT], t.Sequence[int]]],
+) -> dict[_KeyT, IntBitmap]: ...
+
+
+@t.overload
+def batched_collectiondict(  # pragma: nocover
+    clct: t.Type[_SketchT],
+    batches: t.Iterable[tuple[t.Sequence[_KeyT], t.Sequence[t.Hashable]]],
+) -> dict[_KeyT, _SketchT]: ...
+
+
+def batched_collectiondict(
+    clct: t.Union[
+        t.Type[Sketch],
+        t.Type[IntBitmap],
+        t.Type[Counter[_ValueT]],
+        t.Type[list[_ValueT]],
+        t.Type[set[_ValueT]],
+        t.Type[frozenset[_ValueT]],
+        t.Type[tuple[_ValueT, ...]],
+    ],
+    batches: t.Iterable[tuple[t.Sequence[_KeyT], t.Sequence[_ValueT]]],
+) -> t.Union[
+    dict[_KeyT, Counter[_ValueT]],
+    dict[_KeyT, list[_ValueT]],
+    dict[_KeyT, set[_ValueT]],
+    dict[_KeyT, frozenset[_ValueT]],
+    dict[_KeyT, tuple[_ValueT, ...]],
+    dict[_KeyT, t.Any],
+]:
+    """
+    Create dictionaries that collect values into collections from batches
+
+    Given any stream of batches, each being a pair of a sequence of keys and a
+    sequence of values of equal length, this function creates the same
+    multi-dictionary as `collectiondict` for the stream of key-value tuples.
+    Thus, `batched_collectiondict(clct, batches)` is equal to
+    `collectiondict(clct, (kv for ks, vs in batches for kv in zip(ks, vs)))`
+    but does not need to build a tuple per pair.
+
+    Like for `collectiondict`, `clct` can be any type with a registered
+    accumulator. Batches containing a single key only, e.g. because the input
+    is clustered by key, are added in bulk by `Accumulator.add_all`, i.e.
+    using `list.extend`, `set.update` or `Counter.update` for the built-in
+    collections.
+
+    Examples:
+    ---------
+    >>> batches = [(["a", "b", "a"], [1, 2, 3]), (["a", "a"], [4, 5])]
+    >>> batched_collectiondict(list, batches)
+    {'a': [1, 3, 4, 5], 'b': [2]}
+    """
+
+    # The overloads specify the types of the supported combinations of
+    # arguments. Thus, the signature of the implementation is less specific.
+    accumulator = accumulator_for(clct)
+    loop: _Loop = _LOOPS.get(_buffer_type(accumulator), _batched_buffers)
+    return accumulator.finalize_all(clct, loop(accumulator, clct, batches))
+
+
+def _batched_counters(
+    accumulator: Accumulator[Counter[t.Any], t.Any],
+    clct: t.Type[t.Any],
+    batches: t.Iterable[tuple[t.Sequence[_KeyT], t.Sequence[t.Any]]],
+) -> dict[_KeyT, Counter[t.Any]]:
+    ret: dict[_KeyT, Counter[t.Any]] = {}
+    for keys, values in _checked(batches):
+        if _is_single_key(keys):
+            _add_in_bulk(ret, accumulator, clct, keys[0], values)
+            continue
+        for key, val in zip(keys, values):
+            try:
+                ret[key][val] += 1
+            except KeyError:
+                ret[key] = accumulator.init(clct)
+                ret[key][val] += 1
+    return ret
+
+
+def _batched_lists(
+    accumulator: Accumulator[list[t.Any], t.Any],
+    clct: t.Type[t.Any],
+    batches: t.Iterable[tuple[t.Sequence[_KeyT], t.Sequence[t.Any]]],
+) -> dict[_KeyT, list[t.Any]]:
+    ret: dict[_KeyT, list[t.Any]] = {}
+    for keys, values in _checked(batches):
+        if _is_single_key(keys):
+            _add_in_bulk(ret, accumulator, clct, keys[0], values)
+            continue
+        for key, val in zip(keys, values):
+            try:
+                ret[key].append(val)
+            except KeyError:
+                ret[key] = accumulator.init(clct)
+                ret[key].append(val)
+    return ret
+
+
+def _batched_sets(
+    accumulator: Accumulator[set[t.Any], t.Any],
+    clct: t.Type[t.Any],
+    batches: t.Iterable[tuple[t.Sequence[_KeyT], t.Sequence[t.Any]]],
+) -> dict[_KeyT, set[t.Any]]:
+    ret: dict[_KeyT, set[t.Any]] = {}
+    for keys, values in _checked(batches):
+        if _is_single_key(keys):
+            _add_in_bulk(ret, accumulator, clct, keys[0], values)
+            continue
+        for key, val in zip(keys, values):
+            try:
+                ret[key].add(val)
+            except KeyError:
+                ret[key] = accumulator.init(clct)
+                ret[key].add(val)
+    return ret
+
+
+def _batched_buffers(
+    accumulator: Accumulator[_BufferT, t.Any],
+    clct: t.Type[t.Any],
+    batches: t.Iterable[tuple[t.Sequence[_KeyT], t.Sequence[t.Any]]],
+) -> dict[_KeyT, _BufferT]:
+    ret: dict[_KeyT, _BufferT] = {}
+    add = accumulator.add
+    for keys, values in _checked(batches):
+        if _is_single_key(keys):
+            _add_in_bulk(ret, accumulator, clct, keys[0], values)
+            continue
+        for key, val in zip(keys, values):
+            try:
+                buffer = ret[key]
+            except KeyError:
+                buffer = ret[key] = accumulator.init(clct)
+            add(buffer, val)
+    return ret
+
+
+# The built-in accumulators collect into Counters, lists or sets, which are
+# filled by dedicated loops. Other accumulators are called per value.
+_LOOPS: dict[t.Optional[type], _Loop] = {
+    Counter: _batched_counters,
+    list: _batched_lists,
+    set: _batched_sets,
+}
+
+
+def _checked(
+    batches: t.Iterable[tuple[t.Sequence[_KeyT], t.Sequence[_ValueT]]],
+) -> t.Iterator[tuple[t.Sequence[_KeyT], t.Sequence[_ValueT]]]:
+    for keys, values in batches:
+        if len(keys) != len(values):
+            raise ValueError("Batches of keys and values must be of equal length!")
+        yield keys, values
+
+
+def _is_single_key(keys: t.Sequence[_KeyT]) -> bool:
+    # Comparing the first and the last key is cheap and rules out most batches
+    # with several keys before all keys are compared.
+    return bool(keys) and keys[0] == keys[-1] and keys.count(keys[0]) == len(keys)
+
+
+def _add_in_bulk(
+    ret: dict[_KeyT, _BufferT],
+    accumulator: Accumulator[_BufferT, t.Any],
+    clct: t.Type[t.Any],
+    key: _KeyT,
+    values: t.Iterable[t.Any],
+) -> None:
+    try:
+        buffer = ret[key]
+    except KeyError:
+        buffer = ret[key] = accumulator.init(clct)
+    accumulator.add_all(buffer, values)
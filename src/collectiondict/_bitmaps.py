@@ -0,0 +1,307 @@
+import sys
+import typing as t
+from array import array
+from bisect import bisect_left
+
+from ._accumulators import Accumulator, accumulator_for, register_accumulator
+
+_KeyT = t.TypeVar("_KeyT", bound=t.Hashable)
+
+# Every chunk of 2**16 consecutive integers is stored in its own container.
+# Sparse chunks are sorted arrays of the lower 16 bits of their values, dense
+# chunks are bitmaps of 8 KiB. At 4096 values, both take the same space.
+_CHUNK_BITS = 16
+_LOW_MASK = (1 << _CHUNK_BITS) - 1
+_BITMAP_BYTES = (1 << _CHUNK_BITS) // 8
+_MAX_ARRAY = 4096
+_OFFSETS = tuple(
+    tuple(offset for offset in range(8) if byte >> offset & 1) for byte in range(256)
+)
+
+_Container = t.Union["array[int]", bytearray]
+
+
+class IntBitmap(t.AbstractSet[int]):
+    """
+    Compressed set of integers
+
+    Following the design of Roaring bitmaps, the integers are split into
+    chunks of 65536 consecutive numbers. Sparse chunks store the lower 16 bits
+    of their members in a sorted `array`, using 2 bytes per member. Dense
+    chunks use a bitmap of 8 KiB, i.e. one bit per possible member. In
+    contrast, sets take about 60 bytes per member. Unions and intersections of
+    bitmaps work chunk by chunk and combine dense chunks with integer
+    arithmetic instead of per member.
+
+    `IntBitmap` implements `collections.abc.Set`. It can be compared to and
+    combined with other sets and can be passed as `clct` to `collectiondict`,
+    `reverse_mapping`, `reverse_multimapping` and `merge_collectiondicts`.
+    Iterating yields the members in ascending order. `to_set` converts the
+    bitmap into a `set`.
+
+    Examples:
+    ---------
+    >>> bitmap = IntBitmap([3, 1, 70000, 3])
+    >>> bitmap
+    IntBitmap([1, 3, 70000])
+    >>> 70000 in bitmap, 2 in bitmap, len(bitmap)
+    (True, False, 3)
+    >>> bitmap & IntBitmap(range(10))
+    IntBitmap([1, 3])
+    >>> (bitmap | IntBitmap([2])).to_set() == {1, 2, 3, 70000}
+    True
+    """
+
+    __slots__ = ("_chunks", "_len")
+    # Like sets, bitmaps are mutable and thus unhashable.
+    __hash__ = None  # type: ignore[assignment]
+
+    def __init__(self, values: t.Iterable[int] = ()) -> None:
+        self._chunks: dict[int, _Container] = {}
+        self._len = 0
+        self.update(values)
+
+    def add(self, value: int) -> None:
+        """
+        Add a single integer
+        """
+        high, low = value >> _CHUNK_BITS, value & _LOW_MASK
+        container = self._chunks.get(high)
+        if container is None:
+            self._chunks[high] = array("H", (low,))
+            self._len += 1
+        elif isinstance(container, bytearray):
+            self._len += _add_to_bitmap(container, low)
+        else:
+            self._len += self._add_to_array(high, container, low)
+
+    def update(self, values: t.Iterable[int]) -> None:
+        """
+        Add all integers of an iterable
+
+        The integers are sorted into their chunks first. Afterwards, every
+        chunk is united with the new values at once.
+        """
+        if isinstance(values, IntBitmap):
+            others = values._chunks
+        else:
+            others = {
+                high: _from_sorted(sorted(set(lows)))
+                for high, lows in _split(values).items()
+            }
+        for high, other in others.items():
+            container = self._chunks.get(high)
+            if container is None:
+                self._chunks[high] = _copy(other)
+                self._len += _cardinality(other)
+            else:
+                self._chunks[high] = _union(container, other)
+                self._len += _cardinality(self._chunks[high]) - _cardinality(container)
+
+    def to_set(self) -> set[int]:
+        """
+        Convert the bitmap into a `set`
+        """
+        return set(self)
+
+    def __contains__(self, value: object) -> bool:
+        if not isinstance(value, int):
+            return False
+        container = self._chunks.get(value >> _CHUNK_BITS)
+        if container is None:
+            return False
+        low = value & _LOW_MASK
+        if isinstance(container, bytearray):
+            return bool(container[low >> 3] >> (low & 7) & 1)
+        pos = bisect_left(container, low)
+        return pos < len(container) and container[pos] == low
+
+    def __iter__(self) -> t.Iterator[int]:
+        for high in sorted(self._chunks):
+            base = high << _CHUNK_BITS
+            for low in _lows(self._chunks[high]):
+                yield base + low
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, IntBitmap):
+            # Chunks are dense if and only if they have more than 4096 members.
+            # Thus, equal bitmaps consist of equal containers.
+            return self._chunks == other._chunks
+        return super().__eq__(other)
+
+    def __or__(self, other: t.AbstractSet[t.Any]) -> t.AbstractSet[t.Any]:
+        if not isinstance(other, IntBitmap):
+            return super().__or__(other)
+        ret = IntBitmap(self)
+        ret.update(other)
+        return ret
+
+    def __ior__(self, other: t.AbstractSet[t.Any]) -> "IntBitmap":
+        self.update(other)
+        return self
+
+    def __and__(self, other: t.AbstractSet[t.Any]) -> t.AbstractSet[int]:
+        if not isinstance(other, IntBitmap):
+            return super().__and__(other)
+        ret = IntBitmap()
+        for high in self._chunks.keys() & other._chunks.keys():
+            container = _intersection(self._chunks[high], other._chunks[high])
+            if container:
+                ret._chunks[high] = container
+                ret._len += _cardinality(container)
+        return ret
+
+    def __repr__(self) -> str:
+        return f"IntBitmap({list(self)})"
+
+    def __sizeof__(self) -> int:
+        return (
+            object.__sizeof__(self)
+            + sys.getsizeof(self._chunks)
+            + sum(map(sys.getsizeof, self._chunks.values()))
+        )
+
+    def _add_to_array(self, high: int, container: "array[int]", low: int) -> bool:
+        pos = bisect_left(container, low)
+        if pos < len(container) and container[pos] == low:
+            return False
+        if len(container) < _MAX_ARRAY:
+            container.insert(pos, low)
+            return True
+        bitmap = self._chunks[high] = _to_bitmap(container)
+        return _add_to_bitmap(bitmap, low)
+
+
+class _IntBitmapAccumulator(Accumulator[list[int], IntBitmap]):
+    # Adding values one at a time has to keep sparse chunks sorted, which is
+    # linear in their size. Thus, values are buffered in lists and every
+    # bitmap is built in bulk. Merging unites the bitmaps chunk by chunk.
+
+    def init(self, clct: t.Type[IntBitmap]) -> list[int]:
+        return []
+
+    def add(self, buffer: list[int], value: int) -> None:
+        buffer.append(value)
+
+    def add_all(self, buffer: list[int], values: t.Iterable[int]) -> None:
+        buffer.extend(values)
+
+    def finalize(self, clct: t.Type[IntBitmap], buffer: list[int]) -> IntBitmap:
+        return clct(buffer)
+
+    def collect(
+        self, clct: t.Type[IntBitmap], iterable: t.Iterable[tuple[_KeyT, int]]
+    ) -> dict[_KeyT, IntBitmap]:
+        buffers = accumulator_for(list).collect(list, iterable)
+        return self.finalize_all(clct, buffers)
+
+    def collect_reversed(
+        self, clct: t.Type[IntBitmap], mapping: t.Mapping[int, t.Iterable[_KeyT]]
+    ) -> dict[_KeyT, IntBitmap]:
+        buffers = accumulator_for(list).collect_reversed(list, mapping)
+        return self.finalize_all(clct, buffers)
+
+    def merge(
+        self,
+        clct: t.Type[IntBitmap],
+        dicts: t.Iterable[t.Mapping[_KeyT, t.Iterable[int]]],
+    ) -> dict[_KeyT, IntBitmap]:
+        ret: dict[_KeyT, IntBitmap] = {}
+        for dict_ in dicts:
+            for key, values in dict_.items():
+                try:
+                    ret[key].update(values)
+                except KeyError:
+                    ret[key] = clct(values)
+        return ret
+
+
+register_accumulator(IntBitmap, _IntBitmapAccumulator())
+
+
+def _split(values: t.Iterable[int]) -> dict[int, list[int]]:
+    lows: dict[int, list[int]] = {}
+    for value in values:
+        try:
+            lows[value >> _CHUNK_BITS].append(value & _LOW_MASK)
+        except KeyError:
+            lows[value >> _CHUNK_BITS] = [value & _LOW_MASK]
+    return lows
+
+
+def _add_to_bitmap(bitmap: bytearray, low: int) -> bool:
+    mask = 1 << (low & 7)
+    if bitmap[low >> 3] & mask:
+        return False
+    bitmap[low >> 3] |= mask
+    return True
+
+
+def _from_sorted(lows: t.Sequence[int]) -> _Container:
+    if len(lows) <= _MAX_ARRAY:
+        return array("H", lows)
+    return _to_bitmap(lows)
+
+
+def _to_bitmap(lows: t.Iterable[int]) -> bytearray:
+    bitmap = bytearray(_BITMAP_BYTES)
+    for low in lows:
+        bitmap[low >> 3] |= 1 << (low & 7)
+    return bitmap
+
+
+def _from_int(bits: int) -> _Container:
+    bitmap = bytearray(bits.to_bytes(_BITMAP_BYTES, "little"))
+    if _cardinality(bitmap) > _MAX_ARRAY:
+        return bitmap
+    return array("H", _lows(bitmap))
+
+
+def _lows(container: _Container) -> t.Iterator[int]:
+    if isinstance(container, array):
+        yield from container
+        return
+    for index, byte in enumerate(container):
+        if byte:
+            for offset in _OFFSETS[byte]:
+                yield 8 * index + offset
+
+
+def _cardinality(container: _Container) -> int:
+    if isinstance(container, array):
+        return len(container)
+    # `int.bit_count` is not available in Python 3.9.
+    return bin(int.from_bytes(container, "little")).count("1")
+
+
+def _copy(container: _Container) -> _Container:
+    if isinstance(container, array):
+        return array("H", container)
+    return bytearray(container)
+
+
+def _union(left: _Container, right: _Container) -> _Container:
+    if isinstance(left, array) and isinstance(right, array):
+        return _from_sorted(sorted(set(left).union(right)))
+    if isinstance(left, array):
+        left, right = right, left
+    if isinstance(right, array):
+        bitmap = bytearray(left)
+        for low in right:
+            bitmap[low >> 3] |= 1 << (low & 7)
+        return bitmap
+    bits = int.from_bytes(left, "little") | int.from_bytes(right, "little")
+    return bytearray(bits.to_bytes(_BITMAP_BYTES, "little"))
+
+
+def _intersection(left: _Container, right: _Container) -> _Container:
+    if isinstance(left, array) and isinstance(right, array):
+        return array("H", sorted(set(left).intersection(right)))
+    if isinstance(left, array):
+        left, right = right, left
+    if isinstance(right, array):
+        return array("H", [low for low in right if left[low >> 3] >> (low & 7) & 1])
+    return _from_int(int.from_bytes(left, "little") & int.from_bytes(right, "little"))
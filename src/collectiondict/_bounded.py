@@ -0,0 +1,159 @@
+import abc
+import heapq
+import random
+import typing as t
+from collections import deque
+
+_KeyT = t.TypeVar("_KeyT", bound=t.Hashable)
+_ValueT = t.TypeVar("_ValueT")
+_CollectionT = t.TypeVar("_CollectionT")
+
+# Heap entries are ordered by the sort key first and by the negated position
+# in the stream second. Thus, values never need to be comparable and, among
+# equal sort keys, the values seen first are kept.
+_HeapEntry = tuple[t.Any, int, _ValueT]
+
+
+class BoundedCollection(abc.ABC, t.Generic[_ValueT, _CollectionT]):
+    """
+    Base class of collections that keep a bounded number of values per key
+
+    Instances can be passed as `clct` to `collectiondict`, `reverse_mapping`
+    and `reverse_multimapping`. Regardless of the length of the stream, at
+    most `size` values are kept per key.
+    """
+
+    def __init__(self, size: int) -> None:
+        if size < 1:
+            raise ValueError("Size of bounded collections must be positive!")
+        self.size = size
+
+    @abc.abstractmethod
+    def collect(
+        self, iterable: t.Iterable[tuple[_KeyT, _ValueT]]
+    ) -> dict[_KeyT, _CollectionT]:
+        """
+        Collect the values of every key of the stream of key-value tuples
+        """
+
+
+class Newest(BoundedCollection[_ValueT, deque[_ValueT]]):
+    """
+    Keep the `size` values of every key that were seen last
+
+    The values are collected into a `deque` with `maxlen` set to `size`.
+
+    Examples:
+    ---------
+    >>> from collectiondict import collectiondict
+    >>> collectiondict(Newest(2), [("a", 1), ("a", 2), ("b", 3), ("a", 4)])
+    {'a': deque([2, 4], maxlen=2), 'b': deque([3], maxlen=2)}
+    """
+
+    def collect(
+        self, iterable: t.Iterable[tuple[_KeyT, _ValueT]]
+    ) -> dict[_KeyT, deque[_ValueT]]:
+        ret: dict[_KeyT, deque[_ValueT]] = {}
+        for key, val in iterable:
+            try:
+                ret[key].append(val)
+            except KeyError:
+                ret[key] = deque([val], maxlen=self.size)
+        return ret
+
+
+class TopK(BoundedCollection[_ValueT, list[_ValueT]]):
+    """
+    Keep the `size` largest values of every key
+
+    Every key gets a min-heap of at most `size` values. A new value replaces
+    the smallest one if it is larger. The result equals `heapq.nlargest(size,
+    values, key=key)`, i.e. a list in descending order in which equal values
+    keep the order of the stream. If `key` is given, values are compared by
+    `key(value)`.
+
+    Examples:
+    ---------
+    >>> from collectiondict import collectiondict
+    >>> stream = [("a", 3), ("a", 1), ("b", 2), ("a", 4), ("a", 2)]
+    >>> collectiondict(TopK(2), stream)
+    {'a': [4, 3], 'b': [2]}
+    >>> collectiondict(TopK(2, key=lambda val: -val), stream)
+    {'a': [1, 2], 'b': [2]}
+    """
+
+    def __init__(
+        self, size: int, key: t.Optional[t.Callable[[_ValueT], t.Any]] = None
+    ) -> None:
+        super().__init__(size)
+        self.key = key
+
+    def collect(
+        self, iterable: t.Iterable[tuple[_KeyT, _ValueT]]
+    ) -> dict[_KeyT, list[_ValueT]]:
+        heaps: dict[_KeyT, list[_HeapEntry[_ValueT]]] = {}
+        sort_key = _identity if self.key is None else self.key
+        for pos, (key, val) in enumerate(iterable):
+            entry = (sort_key(val), -pos, val)
+            try:
+                heap = heaps[key]
+            except KeyError:
+                heaps[key] = [entry]
+                continue
+            if len(heap) < self.size:
+                heapq.heappush(heap, entry)
+            elif heap[0] < entry:
+                heapq.heapreplace(heap, entry)
+        return {
+            key: [val for _, _, val in sorted(heap, reverse=True)]
+            for key, heap in heaps.items()
+        }
+
+
+class Reservoir(BoundedCollection[_ValueT, list[_ValueT]]):
+    """
+    Keep a uniform random sample of `size` values of every key
+
+    Every key gets its own reservoir (algorithm R). After `n` values of a key
+    were seen, each of them is in its sample with probability `size / n`.
+    Keys with at most `size` values keep all of them in order. The random
+    number generator is seeded with `seed` whenever values are collected.
+    Thus, passing a seed makes the samples reproducible.
+
+    Examples:
+    ---------
+    >>> from collectiondict import collectiondict
+    >>> sample = collectiondict(Reservoir(3, seed=42), ((0, n) for n in range(100)))
+    >>> len(sample[0])
+    3
+    """
+
+    def __init__(self, size: int, seed: t.Optional[int] = None) -> None:
+        super().__init__(size)
+        self.seed = seed
+
+    def collect(
+        self, iterable: t.Iterable[tuple[_KeyT, _ValueT]]
+    ) -> dict[_KeyT, list[_ValueT]]:
+        rand = random.Random(self.seed).random
+        samples: dict[_KeyT, list[_ValueT]] = {}
+        nof_seen: dict[_KeyT, int] = {}
+        for key, val in iterable:
+            try:
+                sample = samples[key]
+            except KeyError:
+                samples[key] = [val]
+                nof_seen[key] = 1
+                continue
+            nof_seen[key] += 1
+            if len(sample) < self.size:
+                sample.append(val)
+                continue
+            idx = int(rand() * nof_seen[key])
+            if idx < self.size:
+                sample[idx] = val
+        return samples
+
+
+def _identity(val: _ValueT) -> _ValueT:
+    return val
@@ -1,9 +1,22 @@
+import itertools
 import typing as t
-from collections import Counter
+from array import array
+from collections import Counter, deque
+
+from ._accumulators import accumulator_for
+from ._arrays import TypedArray
+from ._bitmaps import IntBitmap
+from ._bounded import BoundedCollection, Newest, Reservoir, TopK
+from ._sketches import Sketch
+from ._stats import GroupingStats
 
 _KeyT = t.TypeVar("_KeyT", bound=t.Hashable)
 _ValueT = t.TypeVar("_ValueT")
 _HashableValueT = t.TypeVar("_HashableValueT", bound=t.Hashable)
+_CollectionT = t.TypeVar("_CollectionT")
+_SketchT = t.TypeVar("_SketchT", bound=Sketch)
+_RecordT = t.TypeVar("_RecordT")
+_NumberT = t.TypeVar("_NumberT", int, float)
 
 # TODO Currently, the type annotations are not perfect. Due to the limited
 # nature of Python's type annotations, it is not possible to specify the correct
@@ -15,12 +28,17 @@ _HashableValueT = t.TypeVar("_HashableValueT", bound=t.Hashable)
 def collectiondict(  # pragma: nocover
     clct: t.Type[Counter[_HashableValueT]],
     iterable: t.Iterable[tuple[_KeyT, _HashableValueT]],
+    *,
+    stats: t.Optional[GroupingStats] = None,
 ) -> dict[_KeyT, Counter[_HashableValueT]]: ...
 
 
 @t.overload
 def collectiondict(  # pragma: nocover
-    clct: t.Type[list[_ValueT]], iterable: t.Iterable[tuple[_KeyT, _ValueT]]
+    clct: t.Type[list[_ValueT]],
+    iterable: t.Iterable[tuple[_KeyT, _ValueT]],
+    *,
+    stats: t.Optional[GroupingStats] = None,
 ) -> dict[_KeyT, list[_ValueT]]: ...
 
 
@@ -28,6 +46,8 @@ def collectiondict(  # pragma: nocover
 def collectiondict(  # pragma: nocover
     clct: t.Type[set[_HashableValueT]],
     iterable: t.Iterable[tuple[_KeyT, _HashableValueT]],
+    *,
+    stats: t.Optional[GroupingStats] = None,
 ) -> dict[_KeyT, set[_HashableValueT]]: ...
 
 
@@ -35,31 +55,147 @@ def collectiondict(  # pragma: nocover
 def collectiondict(  # pragma: nocover
     clct: t.Type[frozenset[_HashableValueT]],
     iterable: t.Iterable[tuple[_KeyT, _HashableValueT]],
+    *,
+    stats: t.Optional[GroupingStats] = None,
+) -> dict[_KeyT, frozenset[_HashableValueT]]: ...
+
+
+@t.overload
+def collectiondict(  # pragma: nocover
+    clct: t.Type[tuple[_ValueT, ...]],
+    iterable: t.Iterable[tuple[_KeyT, _ValueT]],
+    *,
+    stats: t.Optional[GroupingStats] = None,
+) -> dict[_KeyT, tuple[_ValueT, ...]]: ...
+
+
+@t.overload
+def collectiondict(  # pragma: nocover
+    clct: t.Type[IntBitmap],
+    iterable: t.Iterable[tuple[_KeyT, int]],
+    *,
+    stats: t.Optional[GroupingStats] = None,
+) -> dict[_KeyT, IntBitmap]: ...
+
+
+@t.overload
+def collectiondict(  # pragma: nocover
+    clct: t.Type[_SketchT],
+    iterable: t.Iterable[tuple[_KeyT, t.Hashable]],
+    *,
+    stats: t.Optional[GroupingStats] = None,
+) -> dict[_KeyT, _SketchT]: ...
+
+
+@t.overload
+def collectiondict(  # pragma: nocover
+    clct: Newest[_ValueT],
+    iterable: t.Iterable[tuple[_KeyT, _ValueT]],
+    *,
+    stats: t.Optional[GroupingStats] = None,
+) -> dict[_KeyT, deque[_ValueT]]: ...
+
+
+@t.overload
+def collectiondict(  # pragma: nocover
+    clct: t.Union[Reservoir[_ValueT], TopK[_ValueT]],
+    iterable: t.Iterable[tuple[_KeyT, _ValueT]],
+    *,
+    stats: t.Optional[GroupingStats] = None,
+) -> dict[_KeyT, list[_ValueT]]: ...
+
+
+@t.overload
+def collectiondict(  # pragma: nocover
+    clct: BoundedCollection[_ValueT, _CollectionT],
+    iterable: t.Iterable[tuple[_KeyT, _ValueT]],
+    *,
+    stats: t.Optional[GroupingStats] = None,
+) -> dict[_KeyT, _CollectionT]: ...
+
+
+@t.overload
+def collectiondict(  # pragma: nocover
+    clct: TypedArray[_NumberT],
+    iterable: t.Iterable[tuple[_KeyT, _NumberT]],
+    *,
+    stats: t.Optional[GroupingStats] = None,
+) -> "dict[_KeyT, array[_NumberT]]": ...
+
+
+@t.overload
+def collectiondict(  # pragma: nocover
+    clct: t.Type[Counter[_HashableValueT]],
+    iterable: t.Iterable[_RecordT],
+    *,
+    key: t.Callable[[_RecordT], _KeyT],
+    value: t.Callable[[_RecordT], _HashableValueT],
+    stats: t.Optional[GroupingStats] = None,
+) -> dict[_KeyT, Counter[_HashableValueT]]: ...
+
+
+@t.overload
+def collectiondict(  # pragma: nocover
+    clct: t.Type[list[_ValueT]],
+    iterable: t.Iterable[_RecordT],
+    *,
+    key: t.Callable[[_RecordT], _KeyT],
+    value: t.Callable[[_RecordT], _ValueT],
+    stats: t.Optional[GroupingStats] = None,
+) -> dict[_KeyT, list[_ValueT]]: ...
+
+
+@t.overload
+def collectiondict(  # pragma: nocover
+    clct: t.Type[set[_HashableValueT]],
+    iterable: t.Iterable[_RecordT],
+    *,
+    key: t.Callable[[_RecordT], _KeyT],
+    value: t.Callable[[_RecordT], _HashableValueT],
+    stats: t.Optional[GroupingStats] = None,
+) -> dict[_KeyT, set[_HashableValueT]]: ...
+
+
+@t.overload
+def collectiondict(  # pragma: nocover
+    clct: t.Type[frozenset[_HashableValueT]],
+    iterable: t.Iterable[_RecordT],
+    *,
+    key: t.Callable[[_RecordT], _KeyT],
+    value: t.Callable[[_RecordT], _HashableValueT],
+    stats: t.Optional[GroupingStats] = None,
 ) -> dict[_KeyT, frozenset[_HashableValueT]]: ...
 
 
 @t.overload
 def collectiondict(  # pragma: nocover
-    clct: t.Type[tuple[_ValueT, ...]], iterable: t.Iterable[tuple[_KeyT, _ValueT]]
+    clct: t.Type[tuple[_ValueT, ...]],
+    iterable: t.Iterable[_RecordT],
+    *,
+    key: t.Callable[[_RecordT], _KeyT],
+    value: t.Callable[[_RecordT], _ValueT],
+    stats: t.Optional[GroupingStats] = None,
 ) -> dict[_KeyT, tuple[_ValueT, ...]]: ...
 
 
 def collectiondict(
     clct: t.Union[
-        t.Type[Counter[_ValueT]],
-        t.Type[list[_ValueT]],
-        t.Type[set[_ValueT]],
-        t.Type[frozenset[_ValueT]],
-        t.Type[tuple[_ValueT, ...]],
+        t.Type[Sketch],
+        t.Type[IntBitmap],
+        BoundedCollection[t.Any, t.Any],
+        TypedArray[t.Any],
+        t.Type[Counter[t.Any]],
+        t.Type[list[t.Any]],
+        t.Type[set[t.Any]],
+        t.Type[frozenset[t.Any]],
+        t.Type[tuple[t.Any, ...]],
     ],
-    iterable: t.Iterable[tuple[_KeyT, _ValueT]],
-) -> t.Union[
-    dict[_KeyT, Counter[_ValueT]],
-    dict[_KeyT, list[_ValueT]],
-    dict[_KeyT, set[_ValueT]],
-    dict[_KeyT, frozenset[_ValueT]],
-    dict[_KeyT, tuple[_ValueT, ...]],
-]:
+    iterable: t.Iterable[t.Any],
+    *,
+    key: t.Optional[t.Callable[[t.Any], t.Hashable]] = None,
+    value: t.Optional[t.Callable[[t.Any], t.Any]] = None,
+    stats: t.Optional[GroupingStats] = None,
+) -> dict[t.Any, t.Any]:
     """
     Create dictionaries that collect values into collections
 
@@ -68,6 +204,23 @@ def collectiondict(
     `collectiondict(clct, stream)` is similar to `dict(stream)` but does not
     discard values.
 
+    Instead of a type, `clct` can be a `BoundedCollection`, e.g. `Newest`,
+    `TopK` or `Reservoir`. Then, at most a fixed number of values is kept per
+    key, no matter how long the stream is. Furthermore, `clct` can be a
+    subclass of `Sketch`, e.g. `CountMinSketch` or `HyperLogLog`, to summarise
+    the values approximately using a fixed amount of memory. Numbers can be
+    stored unboxed by passing a `TypedArray`, e.g. `TypedArray("q")`, and
+    sets of integers compressed by passing `IntBitmap`.
+
+    If `key` and `value` are passed, the stream may consist of any records,
+    e.g. objects or dictionaries. Then, keys and values are extracted by
+    calling `key(record)` and `value(record)`, e.g. using
+    `operator.attrgetter` or `operator.itemgetter`. This is faster than
+    building a key-value tuple per record beforehand.
+
+    If `stats` is passed, it is filled with statistics of the call, e.g. the
+    number of elements and distinct keys. See `GroupingStats` for details.
+
     Examples:
     ---------
     Simple usage using `set`:
@@ -84,94 +237,55 @@ def collectiondict(
     >>> N=1000  # could be humongous, e.g. 10**20
     >>> collectiondict(set, ((str(n%2), n%3) for n in range(N)))
     {'0': {0, 1, 2}, '1': {0, 1, 2}}
-    """
-
-    if issubclass(clct, Counter):
-        return _collectiondict_for_counter(clct, iterable)
-    elif issubclass(clct, list):
-        return _collectiondict_for_lists(clct, iterable)
-    elif issubclass(clct, set):
-        return _collectiondict_for_sets(clct, iterable)
-    elif issubclass(clct, frozenset):
-        return _collectiondict_for_frozensets(clct, iterable)
-    elif issubclass(clct, tuple):
-        return _collectiondict_for_tuple(clct, iterable)
-    else:
-        # Due to compatiblity with Python 3.9 and 3.10, we cannot use
-        # t.assert_never here. That would be preferable, though.
-        raise AssertionError("Invalid collection type passed!")  # type: ignore[unreachable, unused-ignore]
-
-
-def _collectiondict_for_counter(
-    clct: t.Type[Counter[_HashableValueT]],
-    iterable: t.Iterable[tuple[_KeyT, _HashableValueT]],
-) -> dict[_KeyT, Counter[_HashableValueT]]:
-    ret: dict[_KeyT, Counter[_HashableValueT]] = {}
-    for key, val in iterable:
-        try:
-            ret[key][val] += 1
-        except KeyError:
-            ret[key] = clct([val])
-    return ret
-
-
-def _collectiondict_for_lists(
-    clct: t.Type[list[_ValueT]],
-    iterable: t.Iterable[tuple[_KeyT, _ValueT]],
-) -> dict[_KeyT, list[_ValueT]]:
-    ret: dict[_KeyT, list[_ValueT]] = {}
-    for key, val in iterable:
-        try:
-            ret[key].append(val)
-        except KeyError:
-            ret[key] = clct([val])
-    return ret
 
+    Extracting keys and values from records:
+    >>> from operator import itemgetter
+    >>> rows = [{"user": "a", "event": 1}, {"user": "b", "event": 2}]
+    >>> user, event = itemgetter("user"), itemgetter("event")
+    >>> collectiondict(list, rows, key=user, value=event)
+    {'a': [1], 'b': [2]}
+    """
 
-def _collectiondict_for_sets(
-    clct: t.Type[set[_HashableValueT]],
-    iterable: t.Iterable[tuple[_KeyT, _HashableValueT]],
-) -> dict[_KeyT, set[_HashableValueT]]:
-    ret: dict[_KeyT, set[_HashableValueT]] = {}
-    for key, val in iterable:
-        try:
-            ret[key].add(val)
-        except KeyError:
-            ret[key] = clct([val])
+    # The overloads specify the types of the supported combinations of
+    # arguments. Thus, the signature of the implementation is less specific.
+    iterable = _pairs(iterable, key, value)
+    if stats is None:
+        return _collect(clct, iterable)
+    ret = _collect(clct, stats._observe(iterable))
+    stats._summarise(ret)
     return ret
 
 
-def _collectiondict_for_frozensets(
-    clct: t.Type[frozenset[_HashableValueT]],
-    iterable: t.Iterable[tuple[_KeyT, _HashableValueT]],
-) -> dict[_KeyT, frozenset[_HashableValueT]]:
-    # TODO: One could cosider to create collectiondict of `set` first and to
-    # transform all sets to frozensets later on. That would require some
-    # justification, e.g. benchmarks.
-    ret: dict[_KeyT, frozenset[_HashableValueT]] = {}
-    for key, val in iterable:
-        try:
-            fs = ret[key]
-            if val not in fs:
-                new_fs = fs.union([val])
-                ret[key] = new_fs if clct == frozenset else clct(new_fs)
-        except KeyError:
-            ret[key] = clct([val])
-    return ret
+def _collect(
+    clct: t.Union[
+        t.Type[Sketch],
+        t.Type[IntBitmap],
+        BoundedCollection[t.Any, t.Any],
+        TypedArray[t.Any],
+        t.Type[Counter[t.Any]],
+        t.Type[list[t.Any]],
+        t.Type[set[t.Any]],
+        t.Type[frozenset[t.Any]],
+        t.Type[tuple[t.Any, ...]],
+    ],
+    iterable: t.Iterable[tuple[t.Any, t.Any]],
+) -> dict[t.Any, t.Any]:
+    if isinstance(clct, (BoundedCollection, TypedArray)):
+        return clct.collect(iterable)
+    return accumulator_for(clct).collect(clct, iterable)
 
 
-def _collectiondict_for_tuple(
-    clct: t.Type[tuple[_ValueT, ...]],
-    iterable: t.Iterable[tuple[_KeyT, _ValueT]],
-) -> dict[_KeyT, tuple[_ValueT, ...]]:
-    # TODO: One could cosider to create collectiondict of `list` first and to
-    # transform all lists to tuples later on. That would require some
-    # justification, e.g. benchmarks.
-    ret: dict[_KeyT, tuple[_ValueT, ...]] = {}
-    for key, val in iterable:
-        try:
-            tup = ret[key]
-            ret[key] = clct([*tup, val])
-        except KeyError:
-            ret[key] = clct([val])
-    return ret
+def _pairs(
+    iterable: t.Iterable[t.Any],
+    key: t.Optional[t.Callable[[t.Any], t.Hashable]],
+    value: t.Optional[t.Callable[[t.Any], t.Any]],
+) -> t.Iterable[tuple[t.Any, t.Any]]:
+    if key is None and value is None:
+        return iterable
+    if key is None or value is None:
+        raise ValueError("Extractors of keys and values must be passed together!")
+    # `zip` reuses its result tuple if it was released by the consumer, which
+    # the unpacking loops of the collecting functions do. Together with `map`,
+    # this avoids a tuple and a generator frame per record.
+    records_for_keys, records_for_values = itertools.tee(iterable)
+    return zip(map(key, records_for_keys), map(value, records_for_values))
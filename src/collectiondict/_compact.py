@@ -0,0 +1,194 @@
+import operator
+import typing as t
+from array import array
+
+from ._collectiondict import collectiondict
+from ._reverse_multimapping import reverse_multimapping
+
+_KeyT = t.TypeVar("_KeyT", bound=t.Hashable)
+_ValueT = t.TypeVar("_ValueT")
+_HashableValueT = t.TypeVar("_HashableValueT", bound=t.Hashable)
+
+# Values of these types are stored unboxed. Other values are stored in a list.
+_TYPECODES = {int: "q", float: "d"}
+_RELEASED: list[t.Any] = []
+
+
+class GroupView(t.Sequence[_ValueT]):
+    """
+    Read-only view on the values of a single key of a `CompactMultidict`
+    """
+
+    __slots__ = ("_buffer", "_start", "_stop")
+
+    def __init__(self, buffer: t.Sequence[_ValueT], start: int, stop: int) -> None:
+        self._buffer = buffer
+        self._start = start
+        self._stop = stop
+
+    @t.overload
+    def __getitem__(self, index: int) -> _ValueT: ...
+
+    @t.overload
+    def __getitem__(self, index: slice) -> list[_ValueT]: ...
+
+    def __getitem__(
+        self, index: t.Union[int, slice]
+    ) -> t.Union[_ValueT, list[_ValueT]]:
+        if isinstance(index, slice):
+            return list(self)[index]
+        if not -len(self) <= index < len(self):
+            raise IndexError("GroupView index out of range")
+        return self._buffer[self._start + index % len(self)]
+
+    def __len__(self) -> int:
+        return self._stop - self._start
+
+    def __iter__(self) -> t.Iterator[_ValueT]:
+        return map(self._buffer.__getitem__, range(self._start, self._stop))
+
+    def __eq__(self, other: object) -> bool:
+        # Views stand in for the lists of `collectiondict`. Like lists, they
+        # are not equal to other sequences, e.g. tuples or strings.
+        if not isinstance(other, (list, GroupView)):
+            return NotImplemented
+        return len(self) == len(other) and all(map(operator.eq, self, other))
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"GroupView({list(self)!r})"
+
+
+class CompactMultidict(t.Mapping[_KeyT, GroupView[_ValueT]]):
+    """
+    Read-only multi-dictionary storing all values in one contiguous buffer
+
+    The values of all keys are stored back to back in a single buffer. An
+    index maps every key to the start of its values (CSR layout). Thus, there
+    is no collection object per key, which saves its header and its unused
+    capacity. If all values are `int` or all are `float`, the buffer is an
+    `array.array`, storing the values unboxed.
+
+    Looking up a key returns a `GroupView`, a read-only sequence without own
+    storage. Instances can be created from a mapping or an iterable of pairs of
+    keys and iterables of values. However, `compact_collectiondict` and
+    `compact_reverse_multimapping` are more convenient.
+    """
+
+    __slots__ = ("_buffer", "_index", "_offsets")
+
+    def __init__(
+        self,
+        groups: t.Union[
+            t.Mapping[_KeyT, t.Iterable[_ValueT]],
+            t.Iterable[tuple[_KeyT, t.Iterable[_ValueT]]],
+        ],
+    ) -> None:
+        self._index: dict[_KeyT, int] = {}
+        self._offsets = array("q", [0])
+        values: list[_ValueT] = []
+        for pos, (key, group) in enumerate(_items(groups)):
+            self._index[key] = pos
+            values.extend(group)
+            self._offsets.append(len(values))
+        self._buffer = _to_compact_buffer(values)
+
+    def __getitem__(self, key: _KeyT) -> GroupView[_ValueT]:
+        pos = self._index[key]
+        return GroupView(self._buffer, self._offsets[pos], self._offsets[pos + 1])
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._index
+
+    def __iter__(self) -> t.Iterator[_KeyT]:
+        return iter(self._index)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __repr__(self) -> str:
+        groups = ", ".join(f"{key!r}: {list(self[key])!r}" for key in self)
+        return f"CompactMultidict({{{groups}}})"
+
+    @property
+    def buffer(self) -> t.Sequence[_ValueT]:
+        """
+        The values of all keys in the order of the keys
+        """
+        return self._buffer
+
+
+def compact_collectiondict(
+    iterable: t.Iterable[tuple[_KeyT, _ValueT]],
+) -> CompactMultidict[_KeyT, _ValueT]:
+    """
+    Create a compact multi-dictionary that collects values into views
+
+    This function is the memory efficient counterpart of `collectiondict(list,
+    iterable)`. It returns a `CompactMultidict`, which stores the values of all
+    keys in one contiguous buffer. The values of every key keep their order.
+
+    Examples:
+    ---------
+    >>> result = compact_collectiondict([("a", 1), ("b", 2), ("a", 3)])
+    >>> result
+    CompactMultidict({'a': [1, 3], 'b': [2]})
+    >>> result["a"]
+    GroupView([1, 3])
+    >>> result.buffer
+    array('q', [1, 3, 2])
+    """
+    return CompactMultidict(_drained(collectiondict(list, iterable)))
+
+
+def compact_reverse_multimapping(
+    mapping: t.Mapping[_KeyT, t.Iterable[_HashableValueT]],
+) -> CompactMultidict[_HashableValueT, _KeyT]:
+    """
+    Reverse multimapping into a compact multi-dictionary
+
+    This function is the memory efficient counterpart of
+    `reverse_multimapping(list, mapping)`. It returns a `CompactMultidict`,
+    which stores the keys of all values in one contiguous buffer.
+
+    Examples:
+    ---------
+    >>> compact_reverse_multimapping({1: "abc", 2: "bcd", 3: "a"})
+    CompactMultidict({'a': [1, 3], 'b': [1, 2], 'c': [1, 2], 'd': [2]})
+    """
+    return CompactMultidict(_drained(reverse_multimapping(list, mapping)))
+
+
+def _drained(
+    groups: dict[_KeyT, list[_ValueT]],
+) -> t.Iterator[tuple[_KeyT, list[_ValueT]]]:
+    # Every group is dropped as soon as it was copied into the buffer. This
+    # limits the peak memory while creating a `CompactMultidict`.
+    for key, group in groups.items():
+        yield key, group
+        groups[key] = _RELEASED
+
+
+def _items(
+    groups: t.Union[
+        t.Mapping[_KeyT, t.Iterable[_ValueT]],
+        t.Iterable[tuple[_KeyT, t.Iterable[_ValueT]]],
+    ],
+) -> t.Iterable[tuple[_KeyT, t.Iterable[_ValueT]]]:
+    if isinstance(groups, t.Mapping):
+        return groups.items()
+    return groups
+
+
+def _to_compact_buffer(values: list[_ValueT]) -> t.Sequence[_ValueT]:
+    types = set(map(type, values))
+    if len(types) != 1:
+        return values
+    typecode = _TYPECODES.get(types.pop())
+    if typecode is None:
+        return values
+    try:
+        return t.cast(t.Sequence[_ValueT], array(typecode, values))
+    except OverflowError:
+        return values
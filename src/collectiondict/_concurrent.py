@@ -0,0 +1,88 @@
+import threading
+import typing as t
+
+from ._accumulators import Accumulator, accumulator_for
+from ._collectiondict import collectiondict
+
+_CollectionT = t.TypeVar("_CollectionT")
+
+
+class ConcurrentCollectiondict(t.Generic[_CollectionT]):
+    """
+    Builder of a multi-dictionary that is fed by many threads at once
+
+    Every thread collects its values into its own buffer, which no other
+    thread touches. Thus, producers do not contend for a lock, which lets them
+    scale across cores on free-threaded builds of Python. Only the first call
+    of a thread takes a lock, to register its buffer.
+
+    `freeze` merges the buffers, like `merge_collectiondicts`. It must be
+    called after all producers finished, e.g. after joining them. The result
+    equals `collectiondict(clct, stream)`, where `stream` is the concatenation
+    of the values added by each thread, in the order in which the threads
+    started adding values. Like for `collectiondict`, `clct` can be any type
+    with a registered accumulator.
+
+    Examples:
+    ---------
+    >>> from concurrent.futures import ThreadPoolExecutor
+    >>> builder = ConcurrentCollectiondict(set)
+    >>> with ThreadPoolExecutor(max_workers=4) as executor:
+    ...     _ = list(executor.map(builder.extend, [[("a", 1)], [("a", 2), ("b", 3)]]))
+    >>> builder.add("b", 4)
+    >>> builder.freeze()
+    {'a': {1, 2}, 'b': {3, 4}}
+    """
+
+    def __init__(self, clct: t.Type[_CollectionT]) -> None:
+        self._clct = clct
+        self._accumulator: Accumulator[t.Any, _CollectionT] = accumulator_for(clct)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._buffers: list[dict[t.Any, t.Any]] = []
+
+    def add(self, key: t.Hashable, value: t.Any) -> None:
+        """
+        Add a single value to the group of `key`
+        """
+        buffer = self._buffer()
+        try:
+            group = buffer[key]
+        except KeyError:
+            group = buffer[key] = self._accumulator.init(self._clct)
+        self._accumulator.add(group, value)
+
+    def extend(self, iterable: t.Iterable[tuple[t.Hashable, t.Any]]) -> None:
+        """
+        Add all values of a stream of key-value tuples
+        """
+        # The stream is grouped into lists by the fast loops of
+        # `collectiondict` first. Afterwards, every group is added at once.
+        buffer = self._buffer()
+        accumulator, clct = self._accumulator, self._clct
+        for key, values in collectiondict(list, iterable).items():
+            try:
+                group = buffer[key]
+            except KeyError:
+                group = buffer[key] = accumulator.init(clct)
+            accumulator.add_all(group, values)
+
+    def freeze(self) -> dict[t.Any, _CollectionT]:
+        """
+        Merge the values added by all threads into one multi-dictionary
+        """
+        with self._lock:
+            buffers = list(self._buffers)
+        accumulator, clct = self._accumulator, self._clct
+        collections = [accumulator.finalize_all(clct, buffer) for buffer in buffers]
+        return accumulator.merge(clct, collections)
+
+    def _buffer(self) -> dict[t.Any, t.Any]:
+        try:
+            return t.cast(dict[t.Any, t.Any], self._local.buffer)
+        except AttributeError:
+            buffer: dict[t.Any, t.Any] = {}
+            with self._lock:
+                self._buffers.append(buffer)
+            self._local.buffer = buffer
+            return buffer
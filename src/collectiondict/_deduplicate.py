@@ -0,0 +1,152 @@
+import math
+import typing as t
+from collections import Counter
+
+from ._accumulators import accumulator_for
+from ._bitmaps import IntBitmap
+
+_KeyT = t.TypeVar("_KeyT", bound=t.Hashable)
+_ValueT = t.TypeVar("_ValueT")
+_HashableValueT = t.TypeVar("_HashableValueT", bound=t.Hashable)
+_ObjectT = t.TypeVar("_ObjectT")
+_FrozenT = t.TypeVar("_FrozenT", frozenset[t.Any], tuple[t.Any, ...])
+
+
+@t.overload
+def deduplicate(  # pragma: nocover
+    clct: t.Type[Counter[_HashableValueT]],
+    multidict: t.Mapping[_KeyT, Counter[_HashableValueT]],
+) -> dict[_KeyT, Counter[_HashableValueT]]: ...
+
+
+@t.overload
+def deduplicate(  # pragma: nocover
+    clct: t.Type[list[_ValueT]], multidict: t.Mapping[_KeyT, t.Iterable[_ValueT]]
+) -> dict[_KeyT, list[_ValueT]]: ...
+
+
+@t.overload
+def deduplicate(  # pragma: nocover
+    clct: t.Type[set[_HashableValueT]],
+    multidict: t.Mapping[_KeyT, t.Iterable[_HashableValueT]],
+) -> dict[_KeyT, set[_HashableValueT]]: ...
+
+
+@t.overload
+def deduplicate(  # pragma: nocover
+    clct: t.Type[frozenset[_HashableValueT]],
+    multidict: t.Mapping[_KeyT, t.Iterable[_HashableValueT]],
+) -> dict[_KeyT, frozenset[_HashableValueT]]: ...
+
+
+@t.overload
+def deduplicate(  # pragma: nocover
+    clct: t.Type[tuple[_ValueT, ...]],
+    multidict: t.Mapping[_KeyT, t.Iterable[_ValueT]],
+) -> dict[_KeyT, tuple[_ValueT, ...]]: ...
+
+
+@t.overload
+def deduplicate(  # pragma: nocover
+    clct: t.Type[IntBitmap], multidict: t.Mapping[_KeyT, t.Iterable[int]]
+) -> dict[_KeyT, IntBitmap]: ...
+
+
+def deduplicate(
+    clct: t.Union[
+        t.Type[IntBitmap],
+        t.Type[Counter[t.Any]],
+        t.Type[list[t.Any]],
+        t.Type[set[t.Any]],
+        t.Type[frozenset[t.Any]],
+        t.Type[tuple[t.Any, ...]],
+    ],
+    multidict: t.Mapping[t.Any, t.Any],
+) -> dict[t.Any, t.Any]:
+    """
+    Copy a multi-dictionary sharing equal objects wherever possible
+
+    Keys and values that are equal strings, bytes, integers or floats of the
+    same type are replaced by one shared instance. Thus, e.g. equal strings
+    from different sources are kept in memory only once. Other objects, e.g.
+    tuples, as well as signed zeros and NaNs are kept as they are. Furthermore,
+    if `clct` is `frozenset` or `tuple`, all groups with the same contents
+    share one collection, which is safe because they are immutable. Mutable
+    collections are never shared. Collections of other types with a
+    registered accumulator are built again from their interned values. Thus,
+    they must iterate over their values, which rules out sketches.
+
+    This is most useful for highly redundant results, e.g. inverted indexes
+    created by `reverse_multimapping`, in which many values have the same
+    keys. Afterwards, equal groups can be compared by identity. The passed
+    multi-dictionary is not modified.
+
+    Examples:
+    ---------
+    >>> from collectiondict import reverse_multimapping
+    >>> index = reverse_multimapping(frozenset, {1: "abc", 2: "abc", 3: "c"})
+    >>> index
+    {'a': frozenset({1, 2}), 'b': frozenset({1, 2}), 'c': frozenset({1, 2, 3})}
+    >>> shared = deduplicate(frozenset, index)
+    >>> shared == index, shared["a"] is shared["b"]
+    (True, True)
+    """
+
+    # The overloads specify the types of the supported combinations of
+    # arguments. Thus, the signature of the implementation is less specific.
+    accumulator = accumulator_for(clct)
+    intern = _Interner()
+    if issubclass(clct, Counter):
+        return {
+            intern(key): clct({intern(val): count for val, count in counter.items()})
+            for key, counter in multidict.items()
+        }
+    elif issubclass(clct, (frozenset, tuple)):
+        return _deduplicate_frozen(clct, multidict, intern)
+    else:
+        return {
+            intern(key): accumulator.build(clct, map(intern, values))
+            for key, values in multidict.items()
+        }
+
+
+class _Interner:
+    __slots__ = ("_objects",)
+
+    def __init__(self) -> None:
+        # Objects are looked up together with their type. Otherwise, e.g. `1`,
+        # `1.0` and `True` would be replaced by each other since they are equal.
+        self._objects: dict[tuple[type, t.Any], t.Any] = {}
+
+    def __call__(self, obj: _ObjectT) -> _ObjectT:
+        # Only atoms are replaced, for which equality of objects of the same
+        # type means that they are indistinguishable. This excludes containers,
+        # e.g. `(1,)` and `(1.0,)`, the signed zeros `0.0` and `-0.0` as well as
+        # NaNs, which are not even equal to themselves.
+        obj_t = type(obj)
+        if obj_t in _ATOMS or (
+            obj_t is float and obj and not math.isnan(t.cast(float, obj))
+        ):
+            return t.cast(_ObjectT, self._objects.setdefault((obj_t, obj), obj))
+        return obj
+
+
+_ATOMS = frozenset({str, bytes, int})
+
+
+def _deduplicate_frozen(
+    clct: t.Type[_FrozenT],
+    multidict: t.Mapping[_KeyT, t.Iterable[t.Any]],
+    intern: _Interner,
+) -> dict[_KeyT, _FrozenT]:
+    # Groups are shared if they consist of identical objects. Since values are
+    # interned first, this holds for equal groups of atoms. Looking groups up by
+    # the identities of their values avoids hashing and comparing the values
+    # once more and never mixes up distinguishable values.
+    identities_t = frozenset if issubclass(clct, frozenset) else tuple
+    shared: dict[t.Collection[int], _FrozenT] = {}
+    ret: dict[_KeyT, _FrozenT] = {}
+    for key, values in multidict.items():
+        frozen = clct(map(intern, values))
+        ret[intern(key)] = shared.setdefault(identities_t(map(id, frozen)), frozen)
+    return ret
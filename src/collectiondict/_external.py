@@ -0,0 +1,183 @@
+import itertools
+import pickle
+import tempfile
+import typing as t
+from collections import Counter
+from pathlib import Path
+
+from ._collectiondict import collectiondict
+
+_KeyT = t.TypeVar("_KeyT", bound=t.Hashable)
+_ValueT = t.TypeVar("_ValueT")
+_HashableValueT = t.TypeVar("_HashableValueT", bound=t.Hashable)
+
+_Pairs = list[tuple[_KeyT, _ValueT]]
+
+
+@t.overload
+def external_collectiondict(  # pragma: nocover
+    clct: t.Type[Counter[_HashableValueT]],
+    iterable: t.Iterable[tuple[_KeyT, _HashableValueT]],
+    *,
+    max_buffered_pairs: int = ...,
+    nof_partitions: int = ...,
+    directory: t.Union[str, Path, None] = ...,
+) -> t.Iterator[tuple[_KeyT, Counter[_HashableValueT]]]: ...
+
+
+@t.overload
+def external_collectiondict(  # pragma: nocover
+    clct: t.Type[list[_ValueT]],
+    iterable: t.Iterable[tuple[_KeyT, _ValueT]],
+    *,
+    max_buffered_pairs: int = ...,
+    nof_partitions: int = ...,
+    directory: t.Union[str, Path, None] = ...,
+) -> t.Iterator[tuple[_KeyT, list[_ValueT]]]: ...
+
+
+@t.overload
+def external_collectiondict(  # pragma: nocover
+    clct: t.Type[set[_HashableValueT]],
+    iterable: t.Iterable[tuple[_KeyT, _HashableValueT]],
+    *,
+    max_buffered_pairs: int = ...,
+    nof_partitions: int = ...,
+    directory: t.Union[str, Path, None] = ...,
+) -> t.Iterator[tuple[_KeyT, set[_HashableValueT]]]: ...
+
+
+@t.overload
+def external_collectiondict(  # pragma: nocover
+    clct: t.Type[frozenset[_HashableValueT]],
+    iterable: t.Iterable[tuple[_KeyT, _HashableValueT]],
+    *,
+    max_buffered_pairs: int = ...,
+    nof_partitions: int = ...,
+    directory: t.Union[str, Path, None] = ...,
+) -> t.Iterator[tuple[_KeyT, frozenset[_HashableValueT]]]: ...
+
+
+@t.overload
+def external_collectiondict(  # pragma: nocover
+    clct: t.Type[tuple[_ValueT, ...]],
+    iterable: t.Iterable[tuple[_KeyT, _ValueT]],
+    *,
+    max_buffered_pairs: int = ...,
+    nof_partitions: int = ...,
+    directory: t.Union[str, Path, None] = ...,
+) -> t.Iterator[tuple[_KeyT, tuple[_ValueT, ...]]]: ...
+
+
+def external_collectiondict(
+    clct: t.Union[
+        t.Type[Counter[_ValueT]],
+        t.Type[list[_ValueT]],
+        t.Type[set[_ValueT]],
+        t.Type[frozenset[_ValueT]],
+        t.Type[tuple[_ValueT, ...]],
+    ],
+    iterable: t.Iterable[tuple[_KeyT, _ValueT]],
+    *,
+    max_buffered_pairs: int = 1_000_000,
+    nof_partitions: int = 16,
+    directory: t.Union[str, Path, None] = None,
+) -> t.Union[
+    t.Iterator[tuple[_KeyT, Counter[_ValueT]]],
+    t.Iterator[tuple[_KeyT, list[_ValueT]]],
+    t.Iterator[tuple[_KeyT, set[_ValueT]]],
+    t.Iterator[tuple[_KeyT, frozenset[_ValueT]]],
+    t.Iterator[tuple[_KeyT, tuple[_ValueT, ...]]],
+]:
+    """
+    Collect values into collections using temporary files if needed
+
+    This function yields the same key-collection tuples as
+    `collectiondict(clct, iterable).items()`, but does not require the result
+    to fit into memory. As long as the stream has at most `max_buffered_pairs`
+    elements, it is grouped in memory. Otherwise, the stream is read in chunks
+    of `max_buffered_pairs` elements. Every chunk is split by the hash of the
+    keys into `nof_partitions` partitions, which are appended to temporary
+    files. Afterwards, the partitions are grouped one after another.
+
+    Thus, at most `max_buffered_pairs` pairs and the result of one partition
+    are kept in memory. The values of every key keep their order. However,
+    the keys are yielded partition by partition. Keys and values must be
+    picklable. The temporary files are created in `directory`, if given, and
+    are removed as soon as the iterator is exhausted or closed.
+
+    Examples:
+    ---------
+    >>> stream = ((n % 3, n) for n in range(10))
+    >>> groups = external_collectiondict(list, stream, max_buffered_pairs=4)
+    >>> sorted(groups)
+    [(0, [0, 3, 6, 9]), (1, [1, 4, 7]), (2, [2, 5, 8])]
+    """
+
+    if max_buffered_pairs < 1 or nof_partitions < 1:
+        raise ValueError("Buffer size and number of partitions must be positive!")
+    # Fail early for invalid collections, even if the stream is empty.
+    collectiondict(clct, ())
+    return _external_collectiondict(
+        clct, iter(iterable), max_buffered_pairs, nof_partitions, directory
+    )
+
+
+def _external_collectiondict(
+    clct: t.Type[t.Any],
+    iterator: t.Iterator[tuple[_KeyT, _ValueT]],
+    max_buffered_pairs: int,
+    nof_partitions: int,
+    directory: t.Union[str, Path, None],
+) -> t.Iterator[tuple[_KeyT, t.Any]]:
+    first_chunk = list(itertools.islice(iterator, max_buffered_pairs))
+    # A stream of exactly `max_buffered_pairs` elements still fits into memory.
+    # Thus, another element has to be read to decide whether to spill.
+    next_pair = list(itertools.islice(iterator, 1))
+    if not next_pair:
+        yield from collectiondict(clct, first_chunk).items()
+        return
+
+    rest = itertools.chain(next_pair, iterator)
+    chunks = itertools.chain([first_chunk], _chunked(rest, max_buffered_pairs))
+    # Only the chain must refer to the first chunk. Otherwise, it could not be
+    # freed after it was spilled.
+    del first_chunk
+    with tempfile.TemporaryDirectory(dir=directory) as tmpdir:
+        paths = [Path(tmpdir, f"partition-{idx}") for idx in range(nof_partitions)]
+        _spill(chunks, paths)
+        for path in paths:
+            pairs = itertools.chain.from_iterable(_load_chunks(path))
+            yield from collectiondict(clct, pairs).items()
+            path.unlink()
+
+
+def _chunked(
+    iterator: t.Iterator[tuple[_KeyT, _ValueT]], size: int
+) -> t.Iterator[_Pairs[_KeyT, _ValueT]]:
+    while chunk := list(itertools.islice(iterator, size)):
+        yield chunk
+
+
+def _spill(chunks: t.Iterable[_Pairs[_KeyT, _ValueT]], paths: list[Path]) -> None:
+    files = [path.open("wb") for path in paths]
+    try:
+        for chunk in chunks:
+            partitions: list[_Pairs[_KeyT, _ValueT]] = [[] for _ in files]
+            for pair in chunk:
+                partitions[hash(pair[0]) % len(files)].append(pair)
+            for file, partition in zip(files, partitions):
+                if partition:
+                    pickle.dump(partition, file, protocol=pickle.HIGHEST_PROTOCOL)
+    finally:
+        for file in files:
+            file.close()
+
+
+def _load_chunks(path: Path) -> t.Iterator[_Pairs[t.Any, t.Any]]:
+    with path.open("rb") as file:
+        while True:
+            try:
+                yield pickle.load(file)
+            except EOFError:
+                return
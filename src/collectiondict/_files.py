@@ -0,0 +1,375 @@
+import contextlib
+import csv
+import gzip
+import io
+import itertools
+import json
+import mmap
+import os
+import typing as t
+from collections import Counter
+from operator import itemgetter
+from pathlib import Path
+
+from ._bitmaps import IntBitmap
+from ._collectiondict import collectiondict
+from ._stats import GroupingStats
+
+_ValueT = t.TypeVar("_ValueT")
+_HashableValueT = t.TypeVar("_HashableValueT", bound=t.Hashable)
+
+_BUFFER_SIZE = 1 << 20
+_GZIP_MAGIC = b"\x1f\x8b"
+
+_Column = t.Union[int, str]
+
+
+@t.overload
+def csv_collectiondict(  # pragma: nocover
+    clct: t.Type[Counter[_HashableValueT]],
+    path: t.Union[str, Path],
+    key: _Column,
+    value: _Column,
+    *,
+    header: bool = ...,
+    delimiter: str = ...,
+    value_type: t.Optional[t.Callable[[str], _HashableValueT]] = ...,
+    encoding: str = ...,
+    use_mmap: bool = ...,
+    stats: t.Optional[GroupingStats] = ...,
+) -> dict[str, Counter[_HashableValueT]]: ...
+
+
+@t.overload
+def csv_collectiondict(  # pragma: nocover
+    clct: t.Type[list[_ValueT]],
+    path: t.Union[str, Path],
+    key: _Column,
+    value: _Column,
+    *,
+    header: bool = ...,
+    delimiter: str = ...,
+    value_type: t.Optional[t.Callable[[str], _ValueT]] = ...,
+    encoding: str = ...,
+    use_mmap: bool = ...,
+    stats: t.Optional[GroupingStats] = ...,
+) -> dict[str, list[_ValueT]]: ...
+
+
+@t.overload
+def csv_collectiondict(  # pragma: nocover
+    clct: t.Type[set[_HashableValueT]],
+    path: t.Union[str, Path],
+    key: _Column,
+    value: _Column,
+    *,
+    header: bool = ...,
+    delimiter: str = ...,
+    value_type: t.Optional[t.Callable[[str], _HashableValueT]] = ...,
+    encoding: str = ...,
+    use_mmap: bool = ...,
+    stats: t.Optional[GroupingStats] = ...,
+) -> dict[str, set[_HashableValueT]]: ...
+
+
+@t.overload
+def csv_collectiondict(  # pragma: nocover
+    clct: t.Type[frozenset[_HashableValueT]],
+    path: t.Union[str, Path],
+    key: _Column,
+    value: _Column,
+    *,
+    header: bool = ...,
+    delimiter: str = ...,
+    value_type: t.Optional[t.Callable[[str], _HashableValueT]] = ...,
+    encoding: str = ...,
+    use_mmap: bool = ...,
+    stats: t.Optional[GroupingStats] = ...,
+) -> dict[str, frozenset[_HashableValueT]]: ...
+
+
+@t.overload
+def csv_collectiondict(  # pragma: nocover
+    clct: t.Type[tuple[_ValueT, ...]],
+    path: t.Union[str, Path],
+    key: _Column,
+    value: _Column,
+    *,
+    header: bool = ...,
+    delimiter: str = ...,
+    value_type: t.Optional[t.Callable[[str], _ValueT]] = ...,
+    encoding: str = ...,
+    use_mmap: bool = ...,
+    stats: t.Optional[GroupingStats] = ...,
+) -> dict[str, tuple[_ValueT, ...]]: ...
+
+
+@t.overload
+def csv_collectiondict(  # pragma: nocover
+    clct: t.Type[IntBitmap],
+    path: t.Union[str, Path],
+    key: _Column,
+    value: _Column,
+    *,
+    header: bool = ...,
+    delimiter: str = ...,
+    value_type: t.Callable[[str], int],
+    encoding: str = ...,
+    use_mmap: bool = ...,
+    stats: t.Optional[GroupingStats] = ...,
+) -> dict[str, IntBitmap]: ...
+
+
+def csv_collectiondict(  # noqa: PLR0913  # Mirrors the options of `csv`
+    clct: t.Union[
+        t.Type[Counter[t.Any]],
+        t.Type[list[t.Any]],
+        t.Type[set[t.Any]],
+        t.Type[frozenset[t.Any]],
+        t.Type[tuple[t.Any, ...]],
+        t.Type[IntBitmap],
+    ],
+    path: t.Union[str, Path],
+    key: _Column,
+    value: _Column,
+    *,
+    header: bool = False,
+    delimiter: str = ",",
+    value_type: t.Optional[t.Callable[[str], t.Any]] = None,
+    encoding: str = "utf-8",
+    use_mmap: bool = False,
+    stats: t.Optional[GroupingStats] = None,
+) -> dict[str, t.Any]:
+    """
+    Collect a column of a delimited file by the values of another column
+
+    This function reads a CSV file, or a TSV file if `delimiter="\\t"`, and
+    creates the same multi-dictionary as `collectiondict` for the pairs of the
+    `key` and the `value` column of every row. Columns are selected by their
+    index or, if the first row of the file is a `header`, by their name. The
+    values are passed to `value_type`, e.g. `int`, if given. Keys are kept as
+    strings. Blank lines are skipped. Rows without the selected columns raise
+    a `ValueError`.
+
+    The rows are parsed by the `csv` module and fed into the grouping loop
+    without creating intermediate tuples. Files compressed by gzip are
+    detected and decompressed on the fly. Other files are read in large
+    buffered chunks or, if `use_mmap` is true, are memory-mapped. Mapping lets
+    processes reading the same file share its pages, but requires an encoding
+    that encodes line breaks like ASCII, e.g. UTF-8 or Latin-1.
+
+    `clct` and `stats` are passed on to `collectiondict`. Thus, any collection
+    type supported by `collectiondict` can be used.
+
+    Examples:
+    ---------
+    >>> import pathlib, tempfile
+    >>> with tempfile.TemporaryDirectory() as tmpdir:
+    ...     path = pathlib.Path(tmpdir) / "events.csv"
+    ...     _ = path.write_text("user,event\\na,1\\nb,2\\na,3\\n")
+    ...     csv_collectiondict(list, path, "user", "event", header=True, value_type=int)
+    {'a': [1, 3], 'b': [2]}
+    """
+
+    # The overloads specify the types of the supported combinations of
+    # arguments. Thus, the signature of the implementation is less specific.
+    with _lines(path, encoding, use_mmap) as lines:
+        rows = csv.reader(lines, delimiter=delimiter)
+        names = next(rows, []) if header else None
+        key_index, value_index = (_column_index(col, names) for col in (key, value))
+        # Blank lines are parsed as empty rows. Like `jsonl_collectiondict`,
+        # they are skipped.
+        pairs = _fields(filter(None, rows), key_index, value_index, value_type)
+        try:
+            return collectiondict(clct, pairs, stats=stats)
+        except IndexError:
+            # The columns are extracted while grouping. Thus, the reader is
+            # still at the row that is too short.
+            raise ValueError(f"Line {rows.line_num} has too few columns!") from None
+
+
+@t.overload
+def jsonl_collectiondict(  # pragma: nocover
+    clct: t.Type[Counter[t.Any]],
+    path: t.Union[str, Path],
+    key: _Column,
+    value: _Column,
+    *,
+    encoding: str = ...,
+    use_mmap: bool = ...,
+    stats: t.Optional[GroupingStats] = ...,
+) -> dict[t.Any, Counter[t.Any]]: ...
+
+
+@t.overload
+def jsonl_collectiondict(  # pragma: nocover
+    clct: t.Type[list[t.Any]],
+    path: t.Union[str, Path],
+    key: _Column,
+    value: _Column,
+    *,
+    encoding: str = ...,
+    use_mmap: bool = ...,
+    stats: t.Optional[GroupingStats] = ...,
+) -> dict[t.Any, list[t.Any]]: ...
+
+
+@t.overload
+def jsonl_collectiondict(  # pragma: nocover
+    clct: t.Type[set[t.Any]],
+    path: t.Union[str, Path],
+    key: _Column,
+    value: _Column,
+    *,
+    encoding: str = ...,
+    use_mmap: bool = ...,
+    stats: t.Optional[GroupingStats] = ...,
+) -> dict[t.Any, set[t.Any]]: ...
+
+
+@t.overload
+def jsonl_collectiondict(  # pragma: nocover
+    clct: t.Type[frozenset[t.Any]],
+    path: t.Union[str, Path],
+    key: _Column,
+    value: _Column,
+    *,
+    encoding: str = ...,
+    use_mmap: bool = ...,
+    stats: t.Optional[GroupingStats] = ...,
+) -> dict[t.Any, frozenset[t.Any]]: ...
+
+
+@t.overload
+def jsonl_collectiondict(  # pragma: nocover
+    clct: t.Type[tuple[t.Any, ...]],
+    path: t.Union[str, Path],
+    key: _Column,
+    value: _Column,
+    *,
+    encoding: str = ...,
+    use_mmap: bool = ...,
+    stats: t.Optional[GroupingStats] = ...,
+) -> dict[t.Any, tuple[t.Any, ...]]: ...
+
+
+@t.overload
+def jsonl_collectiondict(  # pragma: nocover
+    clct: t.Type[IntBitmap],
+    path: t.Union[str, Path],
+    key: _Column,
+    value: _Column,
+    *,
+    encoding: str = ...,
+    use_mmap: bool = ...,
+    stats: t.Optional[GroupingStats] = ...,
+) -> dict[t.Any, IntBitmap]: ...
+
+
+def jsonl_collectiondict(  # noqa: PLR0913  # Like `csv_collectiondict`
+    clct: t.Union[
+        t.Type[Counter[t.Any]],
+        t.Type[list[t.Any]],
+        t.Type[set[t.Any]],
+        t.Type[frozenset[t.Any]],
+        t.Type[tuple[t.Any, ...]],
+        t.Type[IntBitmap],
+    ],
+    path: t.Union[str, Path],
+    key: _Column,
+    value: _Column,
+    *,
+    encoding: str = "utf-8",
+    use_mmap: bool = False,
+    stats: t.Optional[GroupingStats] = None,
+) -> dict[t.Any, t.Any]:
+    """
+    Collect a field of a JSON lines file by the values of another field
+
+    Every non-blank line of the file must be a JSON document. This function
+    creates the same multi-dictionary as `collectiondict` for the pairs of the
+    `key` and the `value` field of every document. Fields are selected by
+    their name if the documents are objects or by their index if the documents
+    are arrays. Keys must be hashable, e.g. strings or numbers.
+
+    Like for `csv_collectiondict`, files compressed by gzip are decompressed
+    on the fly and other files are read in large buffered chunks or are
+    memory-mapped. `clct` and `stats` are passed on to `collectiondict`.
+
+    Examples:
+    ---------
+    >>> import pathlib, tempfile
+    >>> with tempfile.TemporaryDirectory() as tmpdir:
+    ...     path = pathlib.Path(tmpdir) / "events.jsonl"
+    ...     _ = path.write_text('{"user": "a", "event": 1}\\n{"user": "a", "event": 2}\\n')
+    ...     jsonl_collectiondict(set, path, "user", "event")
+    {'a': {1, 2}}
+    """
+
+    # The overloads specify the types of the supported combinations of
+    # arguments. Thus, the signature of the implementation is less specific.
+    with _lines(path, encoding, use_mmap) as lines:
+        documents = map(json.loads, itertools.filterfalse(str.isspace, lines))
+        pairs = _fields(documents, key, value, None)
+        return collectiondict(clct, pairs, stats=stats)
+
+
+def _fields(
+    records: t.Iterable[t.Any],
+    key: _Column,
+    value: _Column,
+    value_type: t.Optional[t.Callable[[t.Any], t.Any]],
+) -> t.Iterator[tuple[t.Any, t.Any]]:
+    # Like for the extractors of `collectiondict`, mapping `itemgetter` over
+    # two copies of the stream avoids a Python function call per record.
+    records_for_keys, records_for_values = itertools.tee(records)
+    values: t.Iterator[t.Any] = map(itemgetter(value), records_for_values)
+    if value_type is not None:
+        values = map(value_type, values)
+    return zip(map(itemgetter(key), records_for_keys), values)
+
+
+@contextlib.contextmanager
+def _lines(
+    path: t.Union[str, Path], encoding: str, use_mmap: bool
+) -> t.Iterator[t.Iterable[str]]:
+    # Line endings are kept, so that the `csv` module can handle quoted fields
+    # spanning several lines.
+    with io.BufferedReader(io.FileIO(path), buffer_size=_BUFFER_SIZE) as fh:
+        compressed = fh.peek(len(_GZIP_MAGIC)).startswith(_GZIP_MAGIC)
+        if compressed and use_mmap:
+            raise ValueError("Only uncompressed files can be memory-mapped!")
+        if compressed:
+            decompressed = io.BufferedReader(
+                gzip.GzipFile(fileobj=fh), buffer_size=_BUFFER_SIZE
+            )
+            yield io.TextIOWrapper(decompressed, encoding=encoding, newline="")
+        elif use_mmap:
+            yield _mapped_lines(fh.fileno(), encoding)
+        else:
+            yield io.TextIOWrapper(fh, encoding=encoding, newline="")
+
+
+def _mapped_lines(fileno: int, encoding: str) -> t.Iterator[str]:
+    # Empty files cannot be mapped.
+    if os.fstat(fileno).st_size == 0:
+        return
+    # The mapping is decoded in large chunks ending at line breaks. Thus, the
+    # encoding must encode line breaks like ASCII, e.g. UTF-8 or Latin-1.
+    with mmap.mmap(fileno, 0, access=mmap.ACCESS_READ) as buffer:
+        start = 0
+        while start < len(buffer):
+            stop = buffer.find(b"\n", start + _BUFFER_SIZE) + 1 or len(buffer)
+            yield from io.StringIO(buffer[start:stop].decode(encoding), newline="")
+            start = stop
+
+
+def _column_index(column: _Column, names: t.Optional[list[str]]) -> int:
+    if isinstance(column, int):
+        return column
+    if names is None:
+        raise ValueError("Columns can only be selected by name if there is a header!")
+    try:
+        return names.index(column)
+    except ValueError:
+        raise ValueError(f"Column {column!r} is not in the header!") from None
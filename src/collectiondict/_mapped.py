@@ -0,0 +1,286 @@
+import mmap
+import pickle
+import struct
+import typing as t
+from array import array
+from collections import Counter
+from pathlib import Path
+
+from ._compact import _to_compact_buffer
+from ._persistence import _clct_code, _clct_type
+from ._sketches import _MASK_64, _stable_hash
+
+_CollectionT = t.TypeVar("_CollectionT")
+_ValueT = t.TypeVar("_ValueT")
+_HashableValueT = t.TypeVar("_HashableValueT", bound=t.Hashable)
+
+# Layout of version 1. The header is in little endian, all other numbers are
+# in native byte order, so that they can be used without copying them. All
+# sections are aligned to 8 bytes.
+#
+#   header    magic, version, code of the collection type, typecode of the
+#             values, number of keys and number of slots of the hash table
+#   slots     pairs of the hash of a key and its position plus one, or zeros
+#   entries   start and stop of the key and of the group of every position
+#   keys      length of the section and every key pickled on its own
+#   values    raw array of all values if they are ints or floats, otherwise
+#             every group pickled on its own
+#
+# The hash table uses open addressing with linear probing and is at most half
+# full. Thus, looking up a key unpickles one key on average.
+_MAGIC = b"CLCTMMAP"
+_VERSION = 1
+_HEADER = struct.Struct("<8sHBc4xQQ")
+_LENGTH = struct.Struct("<Q")
+_PICKLED = b"p"
+
+
+class MappedMultidict(t.Mapping[t.Any, _CollectionT]):
+    """
+    Read-only multi-dictionary backed by a memory-mapped file
+
+    The file must be written by `save_mapped_collectiondict`. Opening it only
+    maps it into memory. Thus, it takes constant time, regardless of the size
+    of the file. Keys are looked up using a hash table stored in the file and
+    groups are decoded only when they are accessed. All processes mapping the
+    same file share its pages in the page cache of the operating system.
+
+    `clct` must be the type of collections the file was saved with or a
+    subclass of it. Otherwise, a `ValueError` is raised. So is for files of
+    other formats or with an unknown collection type. Keys are hashed like
+    values of sketches. Thus, keys are found in every process, regardless of
+    `PYTHONHASHSEED`, and equal keys, e.g. `1` and `1.0`, are found alike.
+    Keys and non-numeric values are unpickled. Thus, like for `pickle`, only
+    trusted files must be opened.
+
+    The mapping can be used as a context manager, which closes the file when
+    leaving it.
+
+    Examples:
+    ---------
+    >>> import pathlib, tempfile
+    >>> from collectiondict import reverse_multimapping
+    >>> index = reverse_multimapping(set, {1: "abc", 2: "bcd", 3: "a"})
+    >>> with tempfile.TemporaryDirectory() as tmpdir:
+    ...     path = pathlib.Path(tmpdir) / "index.bin"
+    ...     save_mapped_collectiondict(set, index, path)
+    ...     with MappedMultidict(set, path) as mapped:
+    ...         mapped["a"], "e" in mapped, len(mapped)
+    ({1, 3}, False, 4)
+    """
+
+    def __init__(self, clct: t.Type[_CollectionT], path: t.Union[str, Path]) -> None:
+        with open(path, "rb") as fh:
+            self._mmap = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            typecode, nof_keys, nof_slots = _read_header(self._mmap, clct)
+        except ValueError:
+            self._mmap.close()
+            raise
+        self._clct = clct
+        self._len = nof_keys
+        self._mask = nof_slots - 1
+        self._views = _Views(memoryview(self._mmap), typecode, nof_keys, nof_slots)
+
+    def __getitem__(self, key: t.Any) -> _CollectionT:
+        pos = self._find(key)
+        if pos is None:
+            raise KeyError(key)
+        return self._group(pos)
+
+    def __contains__(self, key: object) -> bool:
+        return self._find(key) is not None
+
+    def __iter__(self) -> t.Iterator[t.Any]:
+        return map(self._key, range(self._len))
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __repr__(self) -> str:
+        return f"MappedMultidict({self._clct.__name__}, {self._len} keys)"
+
+    def __enter__(self) -> "MappedMultidict[_CollectionT]":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Unmap the file
+
+        Afterwards, the mapping must not be used anymore.
+        """
+        self._views.release()
+        self._mmap.close()
+
+    def _find(self, key: object) -> t.Optional[int]:
+        try:
+            hash_ = _stable_hash(key) & _MASK_64
+        except TypeError:
+            # Keys without a stable hash cannot be saved. Thus, they are missing.
+            return None
+        slots = self._views.slots
+        slot = hash_ & self._mask
+        while slots[2 * slot + 1]:
+            pos = slots[2 * slot + 1] - 1
+            if slots[2 * slot] == hash_ and self._key(pos) == key:
+                return pos
+            slot = (slot + 1) & self._mask
+        return None
+
+    def _key(self, pos: int) -> t.Any:
+        entries = self._views.entries
+        return pickle.loads(self._views.keys[entries[4 * pos] : entries[4 * pos + 1]])
+
+    def _group(self, pos: int) -> _CollectionT:
+        entries = self._views.entries
+        group = self._views.values[entries[4 * pos + 2] : entries[4 * pos + 3]]
+        if self._views.typecode == _PICKLED:
+            values = pickle.loads(group)
+        else:
+            values = group.tolist()
+        if self._clct is list:
+            return t.cast(_CollectionT, values)
+        return self._clct(values)  # type: ignore[call-arg]
+
+
+class _Views:
+    __slots__ = ("entries", "keys", "slots", "typecode", "values")
+
+    def __init__(
+        self, view: memoryview, typecode: bytes, nof_keys: int, nof_slots: int
+    ) -> None:
+        pos = _HEADER.size
+        self.slots = view[pos : pos + 16 * nof_slots].cast("Q")
+        pos += 16 * nof_slots
+        self.entries = view[pos : pos + 32 * nof_keys].cast("Q")
+        pos += 32 * nof_keys
+        (keys_length,) = _LENGTH.unpack_from(view, pos)
+        pos += _LENGTH.size
+        self.keys = view[pos : pos + keys_length]
+        pos += _padded(keys_length)
+        self.typecode = typecode
+        self.values: memoryview[t.Any] = view[pos:]
+        if typecode != _PICKLED:
+            numeric = t.cast(t.Literal["q", "d"], typecode.decode())
+            self.values = self.values.cast(numeric)
+
+    def release(self) -> None:
+        for view in (self.slots, self.entries, self.keys, self.values):
+            view.release()
+
+
+def _read_header(buffer: mmap.mmap, clct: t.Type[t.Any]) -> tuple[bytes, int, int]:
+    try:
+        magic, version, clct_code, typecode, nof_keys, nof_slots = _HEADER.unpack_from(
+            buffer
+        )
+    except struct.error:
+        raise ValueError("File is not a mapped collectiondict!") from None
+    if magic != _MAGIC:
+        raise ValueError("File is not a mapped collectiondict!")
+    if version > _VERSION:
+        raise ValueError(f"Version {version} of the file format is not supported!")
+    if not issubclass(clct, _clct_type(clct_code)):
+        raise ValueError("File was saved with another collection type!")
+    return typecode, nof_keys, nof_slots
+
+
+def save_mapped_collectiondict(
+    clct: t.Union[
+        t.Type[Counter[_HashableValueT]],
+        t.Type[list[_ValueT]],
+        t.Type[set[_HashableValueT]],
+        t.Type[frozenset[_HashableValueT]],
+        t.Type[tuple[_ValueT, ...]],
+    ],
+    multidict: t.Mapping[t.Hashable, t.Iterable[t.Any]],
+    path: t.Union[str, Path],
+) -> None:
+    """
+    Save a multi-dictionary into a file to be opened by `MappedMultidict`
+
+    Besides the keys and the groups, the file contains a hash table of the
+    keys. If all values are ints or all are floats, they are stored as one raw
+    array. Otherwise, every group is pickled on its own. Counters are always
+    pickled together with their counts. Like for `save_collectiondict`, only
+    the built-in collections and their subclasses are supported. Keys must be
+    `None`, ints, floats, strings, bytes or tuples and frozensets of them,
+    like values of sketches. Otherwise, a `TypeError` is raised.
+    """
+    clct_code = _clct_code(clct)
+    keys = [pickle.dumps(key, protocol=pickle.HIGHEST_PROTOCOL) for key in multidict]
+    typecode, values, group_ends = _encoded_values(clct, multidict)
+    entries = array("Q", _entries(_ends(keys), group_ends))
+    nof_slots = 1 << (2 * len(keys)).bit_length()
+    keys_length = sum(map(len, keys))
+    slots = _hash_table(multidict, nof_slots)
+    with open(path, "wb") as fh:
+        header = (_MAGIC, _VERSION, clct_code, typecode, len(keys), nof_slots)
+        fh.write(_HEADER.pack(*header))
+        fh.write(slots)
+        fh.write(entries)
+        fh.write(_LENGTH.pack(keys_length))
+        fh.writelines(keys)
+        fh.write(bytes(_padded(keys_length) - keys_length))
+        fh.write(values)
+
+
+def _encoded_values(
+    clct: t.Type[t.Any], multidict: t.Mapping[t.Hashable, t.Iterable[t.Any]]
+) -> tuple[bytes, bytes, t.Iterable[int]]:
+    if not issubclass(clct, Counter):
+        flat: list[t.Any] = []
+        group_ends = array("Q")
+        for group in multidict.values():
+            flat.extend(group)
+            group_ends.append(len(flat))
+        buffer = _to_compact_buffer(flat)
+        if isinstance(buffer, array):
+            return buffer.typecode.encode(), buffer.tobytes(), group_ends
+    groups = [
+        pickle.dumps(
+            dict(group) if isinstance(group, Counter) else list(group),
+            protocol=pickle.HIGHEST_PROTOCOL,
+        )
+        for group in multidict.values()
+    ]
+    return _PICKLED, b"".join(groups), list(_ends(groups))
+
+
+def _hash_table(
+    multidict: t.Mapping[t.Hashable, t.Any], nof_slots: int
+) -> "array[int]":
+    slots = array("Q", bytes(16 * nof_slots))
+    mask = nof_slots - 1
+    for pos, key in enumerate(multidict, start=1):
+        try:
+            hash_ = _stable_hash(key) & _MASK_64
+        except TypeError as err:
+            raise TypeError(f"Key {key!r} cannot be saved: {err}") from None
+        slot = hash_ & mask
+        while slots[2 * slot + 1]:
+            slot = (slot + 1) & mask
+        slots[2 * slot] = hash_
+        slots[2 * slot + 1] = pos
+    return slots
+
+
+def _entries(key_ends: t.Iterable[int], group_ends: t.Iterable[int]) -> t.Iterator[int]:
+    key_start = group_start = 0
+    for key_stop, group_stop in zip(key_ends, group_ends):
+        yield from (key_start, key_stop, group_start, group_stop)
+        key_start, group_start = key_stop, group_stop
+
+
+def _ends(blobs: list[bytes]) -> t.Iterator[int]:
+    stop = 0
+    for blob in blobs:
+        stop += len(blob)
+        yield stop
+
+
+def _padded(length: int) -> int:
+    return -(-length // 8) * 8
@@ -0,0 +1,143 @@
+import typing as t
+from array import array
+from collections import Counter
+
+from ._accumulators import accumulator_for
+from ._arrays import TypedArray
+from ._bitmaps import IntBitmap
+from ._sketches import Sketch
+
+_KeyT = t.TypeVar("_KeyT", bound=t.Hashable)
+_ValueT = t.TypeVar("_ValueT")
+_HashableValueT = t.TypeVar("_HashableValueT", bound=t.Hashable)
+_SketchT = t.TypeVar("_SketchT", bound=Sketch)
+_NumberT = t.TypeVar("_NumberT", int, float)
+
+
+@t.overload
+def merge_collectiondicts(  # pragma: nocover
+    clct: t.Type[Counter[_HashableValueT]],
+    dicts: t.Iterable[t.Mapping[_KeyT, Counter[_HashableValueT]]],
+) -> dict[_KeyT, Counter[_HashableValueT]]: ...
+
+
+@t.overload
+def merge_collectiondicts(  # pragma: nocover
+    clct: t.Type[list[_ValueT]],
+    dicts: t.Iterable[t.Mapping[_KeyT, list[_ValueT]]],
+) -> dict[_KeyT, list[_ValueT]]: ...
+
+
+@t.overload
+def merge_collectiondicts(  # pragma: nocover
+    clct: t.Type[set[_HashableValueT]],
+    dicts: t.Iterable[t.Mapping[_KeyT, set[_HashableValueT]]],
+) -> dict[_KeyT, set[_HashableValueT]]: ...
+
+
+@t.overload
+def merge_collectiondicts(  # pragma: nocover
+    clct: t.Type[frozenset[_HashableValueT]],
+    dicts: t.Iterable[t.Mapping[_KeyT, frozenset[_HashableValueT]]],
+) -> dict[_KeyT, frozenset[_HashableValueT]]: ...
+
+
+@t.overload
+def merge_collectiondicts(  # pragma: nocover
+    clct: t.Type[tuple[_ValueT, ...]],
+    dicts: t.Iterable[t.Mapping[_KeyT, tuple[_ValueT, ...]]],
+) -> dict[_KeyT, tuple[_ValueT, ...]]: ...
+
+
+@t.overload
+def merge_collectiondicts(  # pragma: nocover
+    clct: t.Type[IntBitmap], dicts: t.Iterable[t.Mapping[_KeyT, t.Iterable[int]]]
+) -> dict[_KeyT, IntBitmap]: ...
+
+
+@t.overload
+def merge_collectiondicts(  # pragma: nocover
+    clct: t.Type[_SketchT], dicts: t.Iterable[t.Mapping[_KeyT, _SketchT]]
+) -> dict[_KeyT, _SketchT]: ...
+
+
+@t.overload
+def merge_collectiondicts(  # pragma: nocover
+    clct: TypedArray[_NumberT],
+    dicts: t.Iterable[t.Mapping[_KeyT, t.Iterable[_NumberT]]],
+) -> "dict[_KeyT, array[_NumberT]]": ...
+
+
+def merge_collectiondicts(
+    clct: t.Union[
+        t.Type[Sketch],
+        t.Type[IntBitmap],
+        TypedArray[t.Any],
+        t.Type[Counter[_ValueT]],
+        t.Type[list[_ValueT]],
+        t.Type[set[_ValueT]],
+        t.Type[frozenset[_ValueT]],
+        t.Type[tuple[_ValueT, ...]],
+    ],
+    dicts: t.Iterable[
+        t.Union[
+            t.Mapping[_KeyT, Counter[_ValueT]],
+            t.Mapping[_KeyT, list[_ValueT]],
+            t.Mapping[_KeyT, set[_ValueT]],
+            t.Mapping[_KeyT, frozenset[_ValueT]],
+            t.Mapping[_KeyT, tuple[_ValueT, ...]],
+            t.Mapping[_KeyT, Sketch],
+            t.Mapping[_KeyT, t.Iterable[t.Any]],
+        ]
+    ],
+) -> t.Union[
+    dict[_KeyT, Counter[_ValueT]],
+    dict[_KeyT, list[_ValueT]],
+    dict[_KeyT, set[_ValueT]],
+    dict[_KeyT, frozenset[_ValueT]],
+    dict[_KeyT, tuple[_ValueT, ...]],
+    dict[_KeyT, t.Any],
+]:
+    """
+    Merge multi-dictionaries created by `collectiondict` into one
+
+    Given any number of multi-dictionaries, e.g. results of `collectiondict`
+    for different parts of a stream, this function combines the collections of
+    equal keys into one collection of type `clct`. Lists and tuples are
+    concatenated in the order of `dicts`, sets, frozensets and bitmaps are
+    united and Counters and sketches are added. If `clct` is a `TypedArray`,
+    the groups are concatenated into arrays. The passed dictionaries are not
+    modified.
+
+    Merging the results of `collectiondict` for several streams gives the same
+    result as `collectiondict` for the concatenated streams. However, the values
+    are moved group by group instead of pair by pair. Since merging is
+    associative, partial results can also be merged pairwise in a tree, e.g.
+    when they are produced by different processes.
+
+    Examples:
+    ---------
+    Simple usage using `list`:
+    >>> from collectiondict import collectiondict
+    >>> first = collectiondict(list, [("a", 1), ("b", 2)])
+    >>> second = collectiondict(list, [("a", 3), ("c", 4)])
+    >>> merge_collectiondicts(list, [first, second])
+    {'a': [1, 3], 'b': [2], 'c': [4]}
+
+    Merging Counters adds the counts:
+    >>> first = collectiondict(Counter, [("a", 1), ("a", 2)])
+    >>> second = collectiondict(Counter, [("a", 1)])
+    >>> merge_collectiondicts(Counter, [first, second])
+    {'a': Counter({1: 2, 2: 1})}
+
+    Tree-shaped reduction gives the same result as merging all at once:
+    >>> parts = [collectiondict(tuple, [("a", n)]) for n in range(4)]
+    >>> left = merge_collectiondicts(tuple, parts[:2])
+    >>> right = merge_collectiondicts(tuple, parts[2:])
+    >>> merge_collectiondicts(tuple, [left, right])
+    {'a': (0, 1, 2, 3)}
+    """
+
+    if isinstance(clct, TypedArray):
+        return clct.merge(dicts)  # type: ignore[arg-type]
+    return accumulator_for(clct).merge(clct, dicts)
@@ -0,0 +1,96 @@
+import itertools
+import typing as t
+from operator import itemgetter
+
+from ._accumulators import accumulator_for
+from ._collectiondict import _pairs
+
+_KeyT = t.TypeVar("_KeyT", bound=t.Hashable)
+_FirstT = t.TypeVar("_FirstT")
+_SecondT = t.TypeVar("_SecondT")
+_ThirdT = t.TypeVar("_ThirdT")
+
+# Number of key-value tuples that are grouped at once before being added to the
+# collections.
+_CHUNK_SIZE = 1 << 16
+
+
+@t.overload
+def multi_collectiondict(  # pragma: nocover
+    clcts: tuple[t.Type[_FirstT], t.Type[_SecondT]],
+    iterable: t.Iterable[tuple[_KeyT, t.Any]],
+) -> tuple[dict[_KeyT, _FirstT], dict[_KeyT, _SecondT]]: ...
+
+
+@t.overload
+def multi_collectiondict(  # pragma: nocover
+    clcts: tuple[t.Type[_FirstT], t.Type[_SecondT], t.Type[_ThirdT]],
+    iterable: t.Iterable[tuple[_KeyT, t.Any]],
+) -> tuple[dict[_KeyT, _FirstT], dict[_KeyT, _SecondT], dict[_KeyT, _ThirdT]]: ...
+
+
+@t.overload
+def multi_collectiondict(  # pragma: nocover
+    clcts: t.Sequence[t.Type[t.Any]],
+    iterable: t.Iterable[t.Any],
+    *,
+    key: t.Optional[t.Callable[[t.Any], t.Hashable]] = None,
+    value: t.Optional[t.Callable[[t.Any], t.Any]] = None,
+) -> tuple[dict[t.Any, t.Any], ...]: ...
+
+
+def multi_collectiondict(
+    clcts: t.Sequence[t.Type[t.Any]],
+    iterable: t.Iterable[t.Any],
+    *,
+    key: t.Optional[t.Callable[[t.Any], t.Hashable]] = None,
+    value: t.Optional[t.Callable[[t.Any], t.Any]] = None,
+) -> tuple[dict[t.Any, t.Any], ...]:
+    """
+    Collect a stream into several multi-dictionaries at once
+
+    Given any stream of key-value tuples, this function returns one
+    multi-dictionary per type in `clcts`, each being equal to the result of
+    `collectiondict` for that type. However, the stream is walked only once,
+    so it does not need to be stored or created again, e.g. if it is a
+    generator. Like for `collectiondict`, `key` and `value` can be passed to
+    extract keys and values from any records.
+
+    Every type in `clcts` must have a registered accumulator, which is true for
+    the built-in collections, sketches and `IntBitmap`. The stream is grouped
+    chunk by chunk, using one lookup per key-value tuple for all types. The
+    values of each key in a chunk are then added to its collections in bulk,
+    e.g. by `list.extend`, `set.update` and `Counter.update`. This pays off if
+    keys repeat. For streams of mostly distinct keys, it is slower than calling
+    `collectiondict` once per type.
+
+    Examples:
+    ---------
+    >>> from collections import Counter
+    >>> pairs = (("a", 1), ("b", 2), ("a", 1))
+    >>> lists, counters = multi_collectiondict((list, Counter), pairs)
+    >>> lists
+    {'a': [1, 1], 'b': [2]}
+    >>> counters
+    {'a': Counter({1: 2}), 'b': Counter({2: 1})}
+    """
+    # The overloads specify the types of the supported combinations of
+    # arguments. Thus, the signature of the implementation is less specific.
+    accumulators = [accumulator_for(clct) for clct in clcts]
+    lists = accumulator_for(list)
+    groups: dict[t.Any, list[t.Any]] = {}
+    pairs = iter(_pairs(iterable, key, value))
+    while chunk := list(itertools.islice(pairs, _CHUNK_SIZE)):
+        for key_, values in lists.collect(list, chunk).items():
+            try:
+                buffers = groups[key_]
+            except KeyError:
+                buffers = groups[key_] = [
+                    acc.init(clct) for acc, clct in zip(accumulators, clcts)
+                ]
+            for acc, buffer in zip(accumulators, buffers):
+                acc.add_all(buffer, values)
+    return tuple(
+        acc.finalize_all(clct, dict(zip(groups, map(itemgetter(idx), groups.values()))))
+        for idx, (acc, clct) in enumerate(zip(accumulators, clcts))
+    )
@@ -0,0 +1,112 @@
+import itertools
+import typing as t
+from collections import Counter
+
+from ._arrays import TypedArray
+from ._bitmaps import IntBitmap
+from ._bounded import BoundedCollection
+from ._collectiondict import collectiondict
+from ._sketches import Sketch
+from ._stats import GroupingStats
+
+
+def nested_collectiondict(  # noqa: PLR0913  # Like `collectiondict`, plus `flat`
+    clct: t.Union[
+        t.Type[Sketch],
+        t.Type[IntBitmap],
+        BoundedCollection[t.Any, t.Any],
+        TypedArray[t.Any],
+        t.Type[Counter[t.Any]],
+        t.Type[list[t.Any]],
+        t.Type[set[t.Any]],
+        t.Type[frozenset[t.Any]],
+        t.Type[tuple[t.Any, ...]],
+    ],
+    iterable: t.Iterable[t.Any],
+    *,
+    keys: t.Optional[t.Sequence[t.Callable[[t.Any], t.Hashable]]] = None,
+    value: t.Optional[t.Callable[[t.Any], t.Any]] = None,
+    flat: bool = False,
+    stats: t.Optional[GroupingStats] = None,
+) -> dict[t.Any, t.Any]:
+    """
+    Create nested dictionaries that collect values into collections
+
+    Given a stream of tuples of a composite key and a value, e.g.
+    `((tenant, endpoint), user)`, this function creates a dictionary of
+    dictionaries, one level per part of the key, whose innermost values are
+    collections of type `clct`. All composite keys must be tuples with the
+    same number of parts. Otherwise, a `ValueError` is raised, also if `flat`
+    is true. Instead, `keys` and `value` can be passed to extract the parts of
+    the key and the value from any records, like for `collectiondict`.
+
+    The stream is grouped by the composite keys in a single pass, using one
+    lookup per element. Afterwards, the groups are moved into the nested
+    dictionaries without being copied. If `flat` is true, the dictionary
+    mapping composite keys to groups is returned as is.
+
+    `clct` and `stats` are passed on to `collectiondict`. Thus, any collection
+    type supported by `collectiondict` can be used.
+
+    Examples:
+    ---------
+    >>> requests = [("t1", "/a", "ann"), ("t1", "/b", "bob"), ("t1", "/a", "bob")]
+    >>> pairs = [((tenant, endpoint), user) for tenant, endpoint, user in requests]
+    >>> nested_collectiondict(list, pairs)
+    {'t1': {'/a': ['ann', 'bob'], '/b': ['bob']}}
+
+    Extracting the parts of the key from records:
+    >>> from operator import itemgetter
+    >>> keys = [itemgetter(0), itemgetter(1)]
+    >>> nested_collectiondict(
+    ...     tuple, requests, keys=keys, value=itemgetter(2), flat=True
+    ... )
+    {('t1', '/a'): ('ann', 'bob'), ('t1', '/b'): ('bob',)}
+    """
+    groups = collectiondict(clct, _pairs(iterable, keys, value), stats=stats)
+    _check_keys(groups)
+    if flat:
+        return groups
+    return _nested(groups)
+
+
+def _pairs(
+    iterable: t.Iterable[t.Any],
+    keys: t.Optional[t.Sequence[t.Callable[[t.Any], t.Hashable]]],
+    value: t.Optional[t.Callable[[t.Any], t.Any]],
+) -> t.Iterable[tuple[tuple[t.Hashable, ...], t.Any]]:
+    if keys is None and value is None:
+        return iterable
+    if keys is None or value is None:
+        raise ValueError("Extractors of keys and values must be passed together!")
+    if not keys:
+        raise ValueError("At least one extractor of keys must be passed!")
+    # Like in `collectiondict`, mapping the extractors over copies of the stream
+    # avoids a generator frame per record. Zipping the maps builds the keys.
+    *records_for_keys, records_for_values = itertools.tee(iterable, len(keys) + 1)
+    composites = zip(*map(map, keys, records_for_keys))
+    return zip(composites, map(value, records_for_values))
+
+
+def _check_keys(groups: dict[tuple[t.Hashable, ...], t.Any]) -> None:
+    first = next(iter(groups), ())
+    # Other keys, e.g. strings, are rejected by the check of every key below.
+    depth = len(first) if isinstance(first, tuple) else -1
+    if groups and depth == 0:
+        raise ValueError("Composite keys must have at least one part!")
+    for composite in groups:
+        if not isinstance(composite, tuple) or len(composite) != depth:
+            raise ValueError("All composite keys must have the same number of parts!")
+
+
+def _nested(groups: dict[tuple[t.Hashable, ...], t.Any]) -> dict[t.Any, t.Any]:
+    ret: dict[t.Any, t.Any] = {}
+    for composite, group in groups.items():
+        level = ret
+        for key in composite[:-1]:
+            try:
+                level = level[key]
+            except KeyError:
+                level[key] = level = {}
+        level[composite[-1]] = group
+    return ret
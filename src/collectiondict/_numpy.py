@@ -0,0 +1,92 @@
+import functools
+import typing as t
+
+from ._accumulators import Accumulator, accumulator_for
+
+if t.TYPE_CHECKING:  # pragma: nocover
+    import numpy as np
+    import numpy.typing as npt
+
+_CollectionT = t.TypeVar("_CollectionT")
+
+
+@t.overload
+def group_arrays(  # pragma: nocover
+    clct: None, keys: "npt.ArrayLike", values: "npt.ArrayLike"
+) -> "dict[t.Any, np.ndarray[t.Any, t.Any]]": ...
+
+
+@t.overload
+def group_arrays(  # pragma: nocover
+    clct: t.Type[_CollectionT], keys: "npt.ArrayLike", values: "npt.ArrayLike"
+) -> dict[t.Any, _CollectionT]: ...
+
+
+def group_arrays(
+    clct: t.Optional[t.Type[_CollectionT]],
+    keys: "npt.ArrayLike",
+    values: "npt.ArrayLike",
+) -> "t.Union[dict[t.Any, np.ndarray[t.Any, t.Any]], dict[t.Any, _CollectionT]]":
+    """
+    Group NumPy arrays of values by an array of keys
+
+    Given two one-dimensional arrays of equal length, this function maps every
+    distinct key to the values at the same positions. This is equivalent to
+    `collectiondict(clct, zip(keys, values))`, but the grouping is done by
+    NumPy using a stable sort. Thus, elements are not converted to Python
+    objects one by one.
+
+    If `clct` is None, the values of every key are returned as a read-only
+    view into a single sorted copy of `values`. Otherwise, they are converted
+    into a collection of type `clct`, which can be any type with a registered
+    accumulator, like for `collectiondict`. In both cases, the keys are
+    converted to Python scalars and are sorted in ascending order. Values keep
+    their relative order.
+
+    This function requires NumPy, which is not installed along with this
+    package.
+
+    Examples:
+    ---------
+    >>> import numpy as np
+    >>> keys = np.array([3, 1, 3, 2, 1])
+    >>> values = np.array([10, 20, 30, 40, 50])
+    >>> group_arrays(list, keys, values)
+    {1: [20, 50], 2: [40], 3: [10, 30]}
+
+    Without a collection type, array views are returned:
+    >>> group_arrays(None, keys, values)
+    {1: array([20, 50]), 2: array([40]), 3: array([10, 30])}
+    """
+
+    # NumPy is an optional dependency. Importing it lazily keeps the package
+    # importable without it.
+    import numpy as np  # noqa: PLC0415
+
+    # Unsupported types are rejected before doing any work.
+    build = None if clct is None else _build(clct)
+    key_array = np.asarray(keys)
+    value_array = np.asarray(values)
+    if key_array.ndim != 1 or key_array.shape != value_array.shape:
+        raise ValueError("Keys and values must be 1D arrays of equal length!")
+
+    if len(key_array) == 0:
+        return {}
+
+    order = np.argsort(key_array, kind="stable")
+    sorted_keys = key_array[order]
+    sorted_values = value_array[order]
+    sorted_values.flags.writeable = False
+    # The keys are sorted already. Thus, the groups start wherever the key
+    # changes. Using `np.unique` would sort the keys a second time.
+    starts = np.flatnonzero(sorted_keys[1:] != sorted_keys[:-1]) + 1
+    unique_keys = sorted_keys[np.concatenate(([0], starts))].tolist()
+    groups = np.split(sorted_values, starts)
+    if build is None:
+        return dict(zip(unique_keys, groups))
+    return {key: build(group.tolist()) for key, group in zip(unique_keys, groups)}
+
+
+def _build(clct: t.Type[_CollectionT]) -> t.Callable[[list[t.Any]], _CollectionT]:
+    accumulator: Accumulator[t.Any, _CollectionT] = accumulator_for(clct)
+    return functools.partial(accumulator.build, clct)
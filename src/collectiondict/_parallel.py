@@ -0,0 +1,146 @@
+import itertools
+import os
+import typing as t
+from collections import Counter, deque
+from concurrent.futures import Future, ProcessPoolExecutor
+
+from ._collectiondict import collectiondict
+from ._merge import merge_collectiondicts
+
+_KeyT = t.TypeVar("_KeyT", bound=t.Hashable)
+_ValueT = t.TypeVar("_ValueT")
+_HashableValueT = t.TypeVar("_HashableValueT", bound=t.Hashable)
+
+
+@t.overload
+def parallel_collectiondict(  # pragma: nocover
+    clct: t.Type[Counter[_HashableValueT]],
+    shards: t.Iterable[t.Iterable[tuple[_KeyT, _HashableValueT]]],
+    *,
+    max_workers: t.Optional[int] = None,
+) -> dict[_KeyT, Counter[_HashableValueT]]: ...
+
+
+@t.overload
+def parallel_collectiondict(  # pragma: nocover
+    clct: t.Type[list[_ValueT]],
+    shards: t.Iterable[t.Iterable[tuple[_KeyT, _ValueT]]],
+    *,
+    max_workers: t.Optional[int] = None,
+) -> dict[_KeyT, list[_ValueT]]: ...
+
+
+@t.overload
+def parallel_collectiondict(  # pragma: nocover
+    clct: t.Type[set[_HashableValueT]],
+    shards: t.Iterable[t.Iterable[tuple[_KeyT, _HashableValueT]]],
+    *,
+    max_workers: t.Optional[int] = None,
+) -> dict[_KeyT, set[_HashableValueT]]: ...
+
+
+@t.overload
+def parallel_collectiondict(  # pragma: nocover
+    clct: t.Type[frozenset[_HashableValueT]],
+    shards: t.Iterable[t.Iterable[tuple[_KeyT, _HashableValueT]]],
+    *,
+    max_workers: t.Optional[int] = None,
+) -> dict[_KeyT, frozenset[_HashableValueT]]: ...
+
+
+@t.overload
+def parallel_collectiondict(  # pragma: nocover
+    clct: t.Type[tuple[_ValueT, ...]],
+    shards: t.Iterable[t.Iterable[tuple[_KeyT, _ValueT]]],
+    *,
+    max_workers: t.Optional[int] = None,
+) -> dict[_KeyT, tuple[_ValueT, ...]]: ...
+
+
+def parallel_collectiondict(
+    clct: t.Union[
+        t.Type[Counter[_ValueT]],
+        t.Type[list[_ValueT]],
+        t.Type[set[_ValueT]],
+        t.Type[frozenset[_ValueT]],
+        t.Type[tuple[_ValueT, ...]],
+    ],
+    shards: t.Iterable[t.Iterable[tuple[_KeyT, _ValueT]]],
+    *,
+    max_workers: t.Optional[int] = None,
+) -> t.Union[
+    dict[_KeyT, Counter[_ValueT]],
+    dict[_KeyT, list[_ValueT]],
+    dict[_KeyT, set[_ValueT]],
+    dict[_KeyT, frozenset[_ValueT]],
+    dict[_KeyT, tuple[_ValueT, ...]],
+]:
+    """
+    Create dictionaries that collect values into collections using processes
+
+    Given an iterable of shards, each being a stream of key-value tuples, this
+    function groups every shard in a separate process and merges the partial
+    results. The result is equal to `collectiondict(clct, chain(*shards))`,
+    including the order of lists and tuples and the order of the keys.
+
+    Every shard is sent to a worker process. Thus, shards and the collection
+    type must be picklable, e.g. lists of tuples and classes defined at the
+    top-level of a module. Only a few shards are pending at any time, so
+    `shards` can be a lazy iterable. The shards of a single stream can be
+    created using `split_into_shards`. `max_workers` defaults to the number
+    of CPUs. Like for `ProcessPoolExecutor`, it must be positive.
+
+    Examples:
+    ---------
+    >>> shards = [[("a", 1), ("b", 2)], [("a", 3)]]
+    >>> parallel_collectiondict(list, shards, max_workers=2)
+    {'a': [1, 3], 'b': [2]}
+    """
+
+    if max_workers is not None and max_workers < 1:
+        raise ValueError("Number of workers must be positive!")
+    nof_workers = max_workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=nof_workers) as executor:
+        # Twice the number of workers keeps all of them busy while the partial
+        # results are merged.
+        partials = _map_in_order(executor, clct, shards, 2 * nof_workers)
+        return merge_collectiondicts(clct, partials)
+
+
+def split_into_shards(
+    iterable: t.Iterable[tuple[_KeyT, _ValueT]], size: int
+) -> t.Iterator[list[tuple[_KeyT, _ValueT]]]:
+    """
+    Split a stream of key-value tuples into lists of at most `size` elements
+
+    This allows to pass a single stream to `parallel_collectiondict`. Shards
+    are created lazily, so the stream does not need to fit into memory.
+
+    Examples:
+    ---------
+    >>> list(split_into_shards([("a", 1), ("b", 2), ("a", 3)], 2))
+    [[('a', 1), ('b', 2)], [('a', 3)]]
+    """
+
+    if size < 1:
+        raise ValueError("Shards must contain at least one element!")
+    iterator = iter(iterable)
+    while shard := list(itertools.islice(iterator, size)):
+        yield shard
+
+
+def _map_in_order(
+    executor: ProcessPoolExecutor,
+    clct: t.Type[t.Any],
+    shards: t.Iterable[t.Iterable[tuple[_KeyT, _ValueT]]],
+    max_pending: int,
+) -> t.Iterator[dict[_KeyT, t.Any]]:
+    # `executor.map` would consume all shards up front. This would require to
+    # hold the whole input in memory.
+    pending: deque[Future[dict[_KeyT, t.Any]]] = deque()
+    for shard in shards:
+        if len(pending) >= max_pending:
+            yield pending.popleft().result()
+        pending.append(executor.submit(collectiondict, clct, shard))
+    while pending:
+        yield pending.popleft().result()
@@ -0,0 +1,255 @@
+import contextlib
+import gc
+import itertools
+import pickle
+import struct
+import sys
+import typing as t
+from array import array
+from collections import Counter
+from pathlib import Path
+
+from ._compact import _to_compact_buffer
+
+_KeyT = t.TypeVar("_KeyT", bound=t.Hashable)
+_ValueT = t.TypeVar("_ValueT")
+_HashableValueT = t.TypeVar("_HashableValueT", bound=t.Hashable)
+
+# Layout of version 1, all numbers in little endian:
+#
+#   header    magic, version and code of the collection type
+#   keys      section with the keys in the order of the dictionary
+#   offsets   section with the start of every group in `values` and the end
+#   values    section with the values of all groups back to back
+#   counts    section with the counts of the values, for Counters only
+#
+# Every section starts with a typecode and the length of its payload. Sections
+# of ints or floats are raw arrays of typecode "i" (4 bytes), "q" or "d" (8
+# bytes), which are loaded in bulk. Other sections are pickled lists.
+_MAGIC = b"CLCTDICT"
+_VERSION = 1
+_HEADER = struct.Struct("<8sHB")
+_SECTION = struct.Struct("<cQ")
+_PICKLED = b"p"
+_CLCT_CODES: tuple[type, ...] = (Counter, list, set, frozenset, tuple)
+
+
+@t.overload
+def load_collectiondict(  # pragma: nocover
+    clct: t.Type[Counter[_HashableValueT]], path: t.Union[str, Path]
+) -> dict[t.Any, Counter[_HashableValueT]]: ...
+
+
+@t.overload
+def load_collectiondict(  # pragma: nocover
+    clct: t.Type[list[_ValueT]], path: t.Union[str, Path]
+) -> dict[t.Any, list[_ValueT]]: ...
+
+
+@t.overload
+def load_collectiondict(  # pragma: nocover
+    clct: t.Type[set[_HashableValueT]], path: t.Union[str, Path]
+) -> dict[t.Any, set[_HashableValueT]]: ...
+
+
+@t.overload
+def load_collectiondict(  # pragma: nocover
+    clct: t.Type[frozenset[_HashableValueT]], path: t.Union[str, Path]
+) -> dict[t.Any, frozenset[_HashableValueT]]: ...
+
+
+@t.overload
+def load_collectiondict(  # pragma: nocover
+    clct: t.Type[tuple[_ValueT, ...]], path: t.Union[str, Path]
+) -> dict[t.Any, tuple[_ValueT, ...]]: ...
+
+
+def load_collectiondict(
+    clct: t.Union[
+        t.Type[Counter[t.Any]],
+        t.Type[list[t.Any]],
+        t.Type[set[t.Any]],
+        t.Type[frozenset[t.Any]],
+        t.Type[tuple[t.Any, ...]],
+    ],
+    path: t.Union[str, Path],
+) -> dict[t.Any, t.Any]:
+    """
+    Load a multi-dictionary saved by `save_collectiondict`
+
+    `clct` must be the type of collections the file was saved with or a
+    subclass of it. Otherwise, a `ValueError` is raised. So is for files of
+    other formats, of newer versions of the format or with an unknown
+    collection type.
+
+    Sections of ints or floats are read as raw arrays in bulk. Other keys and
+    values are unpickled. Thus, like for `pickle`, only trusted files must be
+    loaded.
+    """
+
+    # The overloads specify the types of the supported combinations of
+    # arguments. Thus, the signature of the implementation is less specific.
+    with open(path, "rb") as fh:
+        data = fh.read()
+    clct_code = _read_header(data)
+    if not issubclass(clct, _clct_type(clct_code)):
+        raise ValueError("File was saved with another collection type!")
+    with _gc_paused():
+        keys, pos = _read_section(data, _HEADER.size)
+        offsets, pos = _read_section(data, pos)
+        values, pos = _read_section(data, pos)
+        slices = list(map(slice, offsets, itertools.islice(offsets, 1, None)))
+        groups = map(values.__getitem__, slices)
+        if issubclass(clct, Counter):
+            counts, _ = _read_section(data, pos)
+            counted = map(dict, map(zip, groups, map(counts.__getitem__, slices)))
+            return dict(zip(keys, map(clct, counted)))
+        return dict(zip(keys, _converted(clct, groups)))
+
+
+def save_collectiondict(
+    clct: t.Union[
+        t.Type[Counter[_HashableValueT]],
+        t.Type[list[_ValueT]],
+        t.Type[set[_HashableValueT]],
+        t.Type[frozenset[_HashableValueT]],
+        t.Type[tuple[_ValueT, ...]],
+    ],
+    multidict: t.Mapping[_KeyT, t.Iterable[t.Any]],
+    path: t.Union[str, Path],
+) -> None:
+    """
+    Save a multi-dictionary into a compact and versioned binary file
+
+    The file consists of a table of the keys, a table of the offsets of every
+    group and a section with the values of all groups back to back. If all
+    keys or all values are ints or all are floats, their sections are raw
+    arrays. Loading them with `load_collectiondict` avoids creating an object
+    per value while parsing, which makes it much faster than `pickle.load`.
+    Other keys and values are pickled as one flat list.
+
+    `clct` is stored in the file. Loading restores collections of this type.
+    The values of Counters are stored together with their counts. Only the
+    built-in collections and their subclasses are supported. Types with a
+    registered accumulator, e.g. sketches, have no representation in the file
+    format and are rejected.
+
+    Examples:
+    ---------
+    >>> import tempfile, pathlib
+    >>> from collectiondict import collectiondict
+    >>> multidict = collectiondict(set, [("a", 1), ("b", 2), ("a", 3)])
+    >>> with tempfile.TemporaryDirectory() as tmpdir:
+    ...     path = pathlib.Path(tmpdir) / "groups.bin"
+    ...     save_collectiondict(set, multidict, path)
+    ...     load_collectiondict(set, path)
+    {'a': {1, 3}, 'b': {2}}
+    """
+    clct_code = _clct_code(clct)
+    is_counter = issubclass(clct, Counter)
+    offsets = array("q", [0])
+    values: list[t.Any] = []
+    counts: list[t.Any] = []
+    for group in multidict.values():
+        if is_counter:
+            counts.extend(t.cast(Counter[t.Any], group).values())
+        values.extend(group)
+        offsets.append(len(values))
+    with open(path, "wb") as fh:
+        fh.write(_HEADER.pack(_MAGIC, _VERSION, clct_code))
+        fh.write(_section(list(multidict)))
+        fh.write(_section(offsets.tolist()))
+        fh.write(_section(values))
+        if is_counter:
+            fh.write(_section(counts))
+
+
+def _clct_code(clct: t.Type[t.Any]) -> int:
+    for code, base in enumerate(_CLCT_CODES):
+        if issubclass(clct, base):
+            return code
+    raise AssertionError("Invalid collection type passed!")
+
+
+def _clct_type(clct_code: int) -> type:
+    # Codes are read from files, which may be corrupt or written by a newer
+    # version of this package.
+    if clct_code >= len(_CLCT_CODES):
+        raise ValueError(f"Collection type {clct_code} of the file is unknown!")
+    return _CLCT_CODES[clct_code]
+
+
+def _section(values: list[t.Any]) -> bytes:
+    buffer = _to_compact_buffer(values)
+    if isinstance(buffer, array):
+        buffer = _narrowed(buffer)
+        if sys.byteorder == "big":  # pragma: nocover
+            buffer.byteswap()
+        typecode, payload = buffer.typecode.encode(), buffer.tobytes()
+    else:
+        typecode = _PICKLED
+        payload = pickle.dumps(values, protocol=pickle.HIGHEST_PROTOCOL)
+    return _SECTION.pack(typecode, len(payload)) + payload
+
+
+def _converted(
+    clct: t.Type[t.Collection[t.Any]], groups: t.Iterable[t.Sequence[t.Any]]
+) -> t.Iterable[t.Collection[t.Any]]:
+    # Slices of arrays are arrays and slices of pickled lists are lists. Thus,
+    # groups are converted only if they are not of the right type already.
+    if clct is not list:
+        return map(clct, groups)
+    return (group.tolist() if isinstance(group, array) else group for group in groups)
+
+
+@contextlib.contextmanager
+def _gc_paused() -> t.Iterator[None]:
+    # Creating many collections triggers garbage collections, which traverse
+    # all objects over and over again. This more than doubles the time needed
+    # for loading. The loaded collections cannot form reference cycles. Thus,
+    # nothing is missed while the garbage collector is paused.
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
+
+
+def _narrowed(buffer: "array[t.Any]") -> "array[t.Any]":
+    # Most ints fit into four bytes, which halves the size of their sections.
+    if (
+        buffer.typecode == "q"
+        and buffer
+        and -(2**31) <= min(buffer) <= max(buffer) < 2**31
+    ):
+        return array("i", buffer)
+    return buffer
+
+
+def _read_header(data: bytes) -> int:
+    try:
+        magic, version, clct_code = _HEADER.unpack_from(data)
+    except struct.error:
+        raise ValueError("File is not a saved collectiondict!") from None
+    if magic != _MAGIC:
+        raise ValueError("File is not a saved collectiondict!")
+    if version > _VERSION:
+        raise ValueError(f"Version {version} of the file format is not supported!")
+    return int(clct_code)
+
+
+def _read_section(data: bytes, pos: int) -> tuple[t.Sequence[t.Any], int]:
+    typecode, length = _SECTION.unpack_from(data, pos)
+    start = pos + _SECTION.size
+    payload = memoryview(data)[start : start + length]
+    if typecode == _PICKLED:
+        return pickle.loads(payload), start + length
+    # Arrays are kept as they are. Their values become objects only when the
+    # groups are created.
+    buffer = array(typecode.decode())
+    buffer.frombytes(payload)
+    if sys.byteorder == "big":  # pragma: nocover
+        buffer.byteswap()
+    return buffer, start + length
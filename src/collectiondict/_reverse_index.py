@@ -0,0 +1,279 @@
+import abc
+import itertools
+import typing as t
+from collections import Counter
+
+from ._accumulators import Accumulator, _buffer_type, accumulator_for
+
+_KeyT = t.TypeVar("_KeyT", bound=t.Hashable)
+_ValueT = t.TypeVar("_ValueT")
+_HashableValueT = t.TypeVar("_HashableValueT", bound=t.Hashable)
+_CollectionT = t.TypeVar("_CollectionT")
+
+# Every value is mapped to the keys it belongs to and how often it belongs to
+# them. Dictionaries keep the order of insertion and allow to remove a key in
+# constant time.
+_Groups = dict[_HashableValueT, dict[_KeyT, int]]
+_Builder = t.Callable[[dict[_KeyT, int]], _CollectionT]
+# Adds or removes a key, given its number of occurrences, to or from a
+# collection of the reversed mapping.
+_Edit = t.Callable[[t.Any, t.Hashable, int], None]
+
+
+class ReversedView(t.Mapping[_HashableValueT, _CollectionT]):
+    """
+    Read-only view on the reversed mapping of a reverse index
+
+    The collection of a value is built when it is looked up first and kept
+    afterwards. Thus, looking it up again takes constant time. Counters,
+    lists and sets are kept up to date when the keys of their value change.
+    Other collections, e.g. frozensets and tuples, are discarded and built
+    again when they are looked up next. The collections are shared by all
+    lookups and must not be modified.
+    """
+
+    __slots__ = ("_build", "_collections", "_groups")
+
+    def __init__(
+        self,
+        groups: _Groups[_HashableValueT, t.Any],
+        collections: dict[_HashableValueT, _CollectionT],
+        build: _Builder[t.Any, _CollectionT],
+    ) -> None:
+        self._groups = groups
+        self._collections = collections
+        self._build = build
+
+    def __getitem__(self, value: _HashableValueT) -> _CollectionT:
+        try:
+            return self._collections[value]
+        except KeyError:
+            pass
+        collection = self._collections[value] = self._build(self._groups[value])
+        return collection
+
+    def __contains__(self, value: object) -> bool:
+        return value in self._groups
+
+    def __iter__(self) -> t.Iterator[_HashableValueT]:
+        return iter(self._groups)
+
+    def __len__(self) -> int:
+        return len(self._groups)
+
+    def __repr__(self) -> str:
+        return f"ReversedView({dict(self)!r})"
+
+
+class _ReverseIndex(t.MutableMapping[_KeyT, _ValueT], t.Generic[_KeyT, _ValueT]):
+    def __init__(self, clct: t.Type[t.Any], mapping: t.Mapping[_KeyT, _ValueT]) -> None:
+        self._forward: dict[_KeyT, _ValueT] = {}
+        self._groups: _Groups[t.Any, _KeyT] = {}
+        # Collections of the reversed mapping that were looked up already.
+        self._collections: dict[t.Any, t.Any] = {}
+        self._add, self._remove = _edits(clct)
+        self._reversed = ReversedView(self._groups, self._collections, _builder(clct))
+        self.update(mapping)
+
+    def __getitem__(self, key: _KeyT) -> _ValueT:
+        return self._forward[key]
+
+    def __setitem__(self, key: _KeyT, value: _ValueT) -> None:
+        # The values are counted first. Thus, invalid values, e.g. unhashable
+        # ones, leave the index unchanged.
+        counts = Counter(self._values_of(value))
+        # Assigning a key moves it to the end, like deleting and inserting it.
+        # Thus, the keys of every value keep the order of the forward mapping.
+        if key in self._forward:
+            del self[key]
+        self._forward[key] = value
+        groups = self._groups
+        for val, count in counts.items():
+            try:
+                groups[val][key] = count
+            except KeyError:
+                groups[val] = {key: count}
+            self._edit(val, key, count, self._add)
+
+    def __delitem__(self, key: _KeyT) -> None:
+        value = self._forward.pop(key)
+        groups = self._groups
+        for val in set(self._values_of(value)):
+            group = groups[val]
+            count = group.pop(key)
+            if group:
+                self._edit(val, key, count, self._remove)
+            else:
+                del groups[val]
+                self._collections.pop(val, None)
+
+    def __iter__(self) -> t.Iterator[_KeyT]:
+        return iter(self._forward)
+
+    def __len__(self) -> int:
+        return len(self._forward)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self._forward!r})"
+
+    def _edit(
+        self, val: t.Hashable, key: _KeyT, count: int, edit: t.Optional[_Edit]
+    ) -> None:
+        # Collections that cannot be edited are built again when needed.
+        try:
+            collection = self._collections[val]
+        except KeyError:
+            return
+        if edit is None:
+            del self._collections[val]
+        else:
+            edit(collection, key, count)
+
+    @staticmethod
+    @abc.abstractmethod
+    def _values_of(value: _ValueT) -> t.Iterable[t.Hashable]:
+        """
+        Values of the reversed mapping that a value of the mapping stands for
+        """
+
+
+class ReverseIndex(
+    _ReverseIndex[_KeyT, _HashableValueT],
+    t.Generic[_KeyT, _HashableValueT, _CollectionT],
+):
+    """
+    Mutable mapping that keeps its reversed mapping up to date
+
+    A reverse index behaves like a dictionary. Additionally, `reversed` is
+    equal to `reverse_mapping(clct, index)` at any time. Assigning or deleting
+    a key updates it in constant time, instead of reversing the whole mapping
+    again. `clct` can be any type with a registered accumulator, e.g. the
+    built-in collections, sketches or `IntBitmap`.
+
+    Assigning a key moves it to the end of the mapping. This way, ordered
+    collections keep the order of the keys of the mapping. However, the order
+    of the values in `reversed` may differ from `reverse_mapping`.
+
+    Examples:
+    ---------
+    >>> index = ReverseIndex(list, {1: "a", 2: "b", 3: "a"})
+    >>> index.reversed
+    ReversedView({'a': [1, 3], 'b': [2]})
+    >>> index[1] = "b"
+    >>> del index[3]
+    >>> index.reversed
+    ReversedView({'b': [2, 1]})
+    """
+
+    def __init__(
+        self,
+        clct: t.Type[_CollectionT],
+        mapping: t.Optional[t.Mapping[_KeyT, _HashableValueT]] = None,
+    ) -> None:
+        super().__init__(clct, mapping or {})
+
+    @property
+    def reversed(self) -> ReversedView[_HashableValueT, _CollectionT]:
+        """
+        Read-only mapping from values to the collection of their keys
+        """
+        return self._reversed
+
+    @staticmethod
+    def _values_of(value: _HashableValueT) -> tuple[_HashableValueT]:
+        return (value,)
+
+
+class MultiReverseIndex(
+    _ReverseIndex[_KeyT, t.Iterable[_HashableValueT]],
+    t.Generic[_KeyT, _HashableValueT, _CollectionT],
+):
+    """
+    Mutable multimapping that keeps its reversed mapping up to date
+
+    This is the counterpart of `ReverseIndex` for mappings from keys to
+    iterables of values. Its `reversed` attribute is equal to
+    `reverse_multimapping(clct, index)` at any time. Assigning or deleting a
+    key takes time linear in the number of its values. The values of a key
+    are iterated again when it is removed. Thus, they must be collections,
+    e.g. lists or strings, and must not be modified in place. Instead, they
+    have to be assigned again.
+
+    Examples:
+    ---------
+    >>> index = MultiReverseIndex(set, {1: "abc", 2: "bcd"})
+    >>> index[3] = "a"
+    >>> del index[2]
+    >>> index.reversed
+    ReversedView({'a': {1, 3}, 'b': {1}, 'c': {1}})
+    """
+
+    def __init__(
+        self,
+        clct: t.Type[_CollectionT],
+        mapping: t.Optional[t.Mapping[_KeyT, t.Iterable[_HashableValueT]]] = None,
+    ) -> None:
+        super().__init__(clct, mapping or {})
+
+    @property
+    def reversed(self) -> ReversedView[_HashableValueT, _CollectionT]:
+        """
+        Read-only mapping from values to the collection of their keys
+        """
+        return self._reversed
+
+    @staticmethod
+    def _values_of(
+        value: t.Iterable[_HashableValueT],
+    ) -> t.Iterable[_HashableValueT]:
+        return value
+
+
+def _builder(clct: t.Type[_CollectionT]) -> _Builder[t.Any, _CollectionT]:
+    accumulator: Accumulator[t.Any, _CollectionT] = accumulator_for(clct)
+    return lambda counts: accumulator.build(clct, _expanded(counts))
+
+
+def _expanded(counts: dict[_KeyT, int]) -> t.Iterator[_KeyT]:
+    return itertools.chain.from_iterable(map(itertools.repeat, counts, counts.values()))
+
+
+def _edits(clct: t.Type[t.Any]) -> tuple[t.Optional[_Edit], t.Optional[_Edit]]:
+    # Only collections that are the buffers of their accumulator are mutable.
+    # Frozensets and tuples are collected into sets and lists, for example.
+    buffer_t = _buffer_type(accumulator_for(clct))
+    if buffer_t is None or not issubclass(clct, buffer_t):
+        return None, None
+    return _EDITS[buffer_t]
+
+
+def _add_to_counter(counter: Counter[t.Any], key: t.Hashable, count: int) -> None:
+    counter[key] += count
+
+
+def _remove_from_counter(counter: Counter[t.Any], key: t.Hashable, count: int) -> None:
+    del counter[key]
+
+
+def _add_to_list(list_: list[t.Any], key: t.Hashable, count: int) -> None:
+    list_.extend(itertools.repeat(key, count))
+
+
+def _remove_from_list(list_: list[t.Any], key: t.Hashable, count: int) -> None:
+    for _ in range(count):
+        list_.remove(key)
+
+
+def _add_to_set(set_: set[t.Any], key: t.Hashable, count: int) -> None:
+    set_.add(key)
+
+
+def _remove_from_set(set_: set[t.Any], key: t.Hashable, count: int) -> None:
+    set_.remove(key)
+
+
+_EDITS: dict[type, tuple[_Edit, _Edit]] = {
+    Counter: (_add_to_counter, _remove_from_counter),
+    list: (_add_to_list, _remove_from_list),
+    set: (_add_to_set, _remove_from_set),
+}
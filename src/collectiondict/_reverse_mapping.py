@@ -1,10 +1,19 @@
 import typing as t
-from collections import Counter
+from array import array
+from collections import Counter, deque
 
+from ._arrays import TypedArray
+from ._bitmaps import IntBitmap
+from ._bounded import BoundedCollection, Newest, Reservoir, TopK
 from ._collectiondict import collectiondict
+from ._sketches import Sketch
+from ._stats import GroupingStats
 
 _KeyT = t.TypeVar("_KeyT", bound=t.Hashable)
 _HashableValueT = t.TypeVar("_HashableValueT", bound=t.Hashable)
+_CollectionT = t.TypeVar("_CollectionT")
+_SketchT = t.TypeVar("_SketchT", bound=Sketch)
+_NumberT = t.TypeVar("_NumberT", int, float)
 
 
 # TODO Currently, the type annotations are not perfect. Due to the limited
@@ -17,35 +26,107 @@ _HashableValueT = t.TypeVar("_HashableValueT", bound=t.Hashable)
 def reverse_mapping(  # pragma: nocover
     clct: t.Type[Counter[_KeyT]],
     mapping: t.Mapping[_KeyT, _HashableValueT],
+    *,
+    stats: t.Optional[GroupingStats] = None,
 ) -> dict[_HashableValueT, Counter[_KeyT]]: ...
 
 
 @t.overload
 def reverse_mapping(  # pragma: nocover
-    clct: t.Type[frozenset[_KeyT]], mapping: t.Mapping[_KeyT, _HashableValueT]
+    clct: t.Type[frozenset[_KeyT]],
+    mapping: t.Mapping[_KeyT, _HashableValueT],
+    *,
+    stats: t.Optional[GroupingStats] = None,
 ) -> dict[_HashableValueT, frozenset[_KeyT]]: ...
 
 
 @t.overload
 def reverse_mapping(  # pragma: nocover
-    clct: t.Type[list[_KeyT]], mapping: t.Mapping[_KeyT, _HashableValueT]
+    clct: t.Type[list[_KeyT]],
+    mapping: t.Mapping[_KeyT, _HashableValueT],
+    *,
+    stats: t.Optional[GroupingStats] = None,
 ) -> dict[_HashableValueT, list[_KeyT]]: ...
 
 
 @t.overload
 def reverse_mapping(  # pragma: nocover
-    clct: t.Type[tuple[_KeyT, ...]], mapping: t.Mapping[_KeyT, _HashableValueT]
+    clct: t.Type[tuple[_KeyT, ...]],
+    mapping: t.Mapping[_KeyT, _HashableValueT],
+    *,
+    stats: t.Optional[GroupingStats] = None,
 ) -> dict[_HashableValueT, tuple[_KeyT, ...]]: ...
 
 
 @t.overload
 def reverse_mapping(  # pragma: nocover
-    clct: t.Type[set[_KeyT]], mapping: t.Mapping[_KeyT, _HashableValueT]
+    clct: t.Type[set[_KeyT]],
+    mapping: t.Mapping[_KeyT, _HashableValueT],
+    *,
+    stats: t.Optional[GroupingStats] = None,
 ) -> dict[_HashableValueT, set[_KeyT]]: ...
 
 
+@t.overload
+def reverse_mapping(  # pragma: nocover
+    clct: t.Type[IntBitmap],
+    mapping: t.Mapping[int, _HashableValueT],
+    *,
+    stats: t.Optional[GroupingStats] = None,
+) -> dict[_HashableValueT, IntBitmap]: ...
+
+
+@t.overload
+def reverse_mapping(  # pragma: nocover
+    clct: t.Type[_SketchT],
+    mapping: t.Mapping[_KeyT, _HashableValueT],
+    *,
+    stats: t.Optional[GroupingStats] = None,
+) -> dict[_HashableValueT, _SketchT]: ...
+
+
+@t.overload
+def reverse_mapping(  # pragma: nocover
+    clct: Newest[_KeyT],
+    mapping: t.Mapping[_KeyT, _HashableValueT],
+    *,
+    stats: t.Optional[GroupingStats] = None,
+) -> dict[_HashableValueT, deque[_KeyT]]: ...
+
+
+@t.overload
+def reverse_mapping(  # pragma: nocover
+    clct: t.Union[Reservoir[_KeyT], TopK[_KeyT]],
+    mapping: t.Mapping[_KeyT, _HashableValueT],
+    *,
+    stats: t.Optional[GroupingStats] = None,
+) -> dict[_HashableValueT, list[_KeyT]]: ...
+
+
+@t.overload
+def reverse_mapping(  # pragma: nocover
+    clct: BoundedCollection[_KeyT, _CollectionT],
+    mapping: t.Mapping[_KeyT, _HashableValueT],
+    *,
+    stats: t.Optional[GroupingStats] = None,
+) -> dict[_HashableValueT, _CollectionT]: ...
+
+
+@t.overload
+def reverse_mapping(  # pragma: nocover
+    clct: TypedArray[_NumberT],
+    mapping: t.Mapping[_NumberT, _HashableValueT],
+    *,
+    stats: t.Optional[GroupingStats] = None,
+) -> "dict[_HashableValueT, array[_NumberT]]": ...
+
+
 def reverse_mapping(
     clct: t.Union[
+        t.Type[_SketchT],
+        t.Type[IntBitmap],
+        BoundedCollection[_KeyT, _CollectionT],
+        TypedArray[t.Any],
         t.Type[Counter[_KeyT]],
         t.Type[frozenset[_KeyT]],
         t.Type[list[_KeyT]],
@@ -53,12 +134,18 @@ def reverse_mapping(
         t.Type[tuple[_KeyT, ...]],
     ],
     mapping: t.Mapping[_KeyT, _HashableValueT],
+    *,
+    stats: t.Optional[GroupingStats] = None,
 ) -> t.Union[
     dict[_HashableValueT, Counter[_KeyT]],
     dict[_HashableValueT, frozenset[_KeyT]],
     dict[_HashableValueT, list[_KeyT]],
     dict[_HashableValueT, set[_KeyT]],
     dict[_HashableValueT, tuple[_KeyT, ...]],
+    dict[_HashableValueT, _CollectionT],
+    dict[_HashableValueT, _SketchT],
+    dict[_HashableValueT, IntBitmap],
+    "dict[_HashableValueT, array[t.Any]]",
 ]:
     """
     Reverse mapping to map from values to keys
@@ -67,6 +154,9 @@ def reverse_mapping(
     reverses the mapping so it maps from values to keys. The keys are collected
     in a collection specified by `clct`.
 
+    If `stats` is passed, it is filled with statistics of the call. See
+    `GroupingStats` for details.
+
     Examples:
     ---------
     Simple usage using `set`:
@@ -80,4 +170,10 @@ def reverse_mapping(
     {'foobar': frozenset({1, 3}), 'blablubb': frozenset({2})}
     """
 
-    return collectiondict(clct, ((v, k) for k, v in mapping.items()))
+    # Zipping values and keys avoids a generator frame per item. Since the
+    # pairs are unpacked right away, `zip` can even reuse its result tuple.
+    return collectiondict(
+        clct,  # type: ignore[arg-type]
+        zip(mapping.values(), mapping.keys()),
+        stats=stats,
+    )
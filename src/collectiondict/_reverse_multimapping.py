@@ -1,10 +1,21 @@
+import itertools
 import typing as t
-from collections import Counter
+from array import array
+from collections import Counter, deque
 
+from ._accumulators import accumulator_for
+from ._arrays import TypedArray
+from ._bitmaps import IntBitmap
+from ._bounded import BoundedCollection, Newest, Reservoir, TopK
 from ._collectiondict import collectiondict
+from ._sketches import Sketch
+from ._stats import GroupingStats
 
 _KeyT = t.TypeVar("_KeyT", bound=t.Hashable)
 _HashableValueT = t.TypeVar("_HashableValueT", bound=t.Hashable)
+_CollectionT = t.TypeVar("_CollectionT")
+_SketchT = t.TypeVar("_SketchT", bound=Sketch)
+_NumberT = t.TypeVar("_NumberT", int, float)
 
 
 # TODO Currently, the type annotations are not perfect. Due to the limited
@@ -17,6 +28,8 @@ _HashableValueT = t.TypeVar("_HashableValueT", bound=t.Hashable)
 def reverse_multimapping(  # pragma: nocover
     clct: t.Type[Counter[_KeyT]],
     mapping: t.Mapping[_KeyT, t.Iterable[_HashableValueT]],
+    *,
+    stats: t.Optional[GroupingStats] = None,
 ) -> dict[_HashableValueT, Counter[_KeyT]]: ...
 
 
@@ -24,12 +37,17 @@ def reverse_multimapping(  # pragma: nocover
 def reverse_multimapping(  # pragma: nocover
     clct: t.Type[frozenset[_KeyT]],
     mapping: t.Mapping[_KeyT, t.Iterable[_HashableValueT]],
+    *,
+    stats: t.Optional[GroupingStats] = None,
 ) -> dict[_HashableValueT, frozenset[_KeyT]]: ...
 
 
 @t.overload
 def reverse_multimapping(  # pragma: nocover
-    clct: t.Type[list[_KeyT]], mapping: t.Mapping[_KeyT, t.Iterable[_HashableValueT]]
+    clct: t.Type[list[_KeyT]],
+    mapping: t.Mapping[_KeyT, t.Iterable[_HashableValueT]],
+    *,
+    stats: t.Optional[GroupingStats] = None,
 ) -> dict[_HashableValueT, list[_KeyT]]: ...
 
 
@@ -37,17 +55,80 @@ def reverse_multimapping(  # pragma: nocover
 def reverse_multimapping(  # pragma: nocover
     clct: t.Type[tuple[_KeyT, ...]],
     mapping: t.Mapping[_KeyT, t.Iterable[_HashableValueT]],
+    *,
+    stats: t.Optional[GroupingStats] = None,
 ) -> dict[_HashableValueT, tuple[_KeyT, ...]]: ...
 
 
 @t.overload
 def reverse_multimapping(  # pragma: nocover
-    clct: t.Type[set[_KeyT]], mapping: t.Mapping[_KeyT, t.Iterable[_HashableValueT]]
+    clct: t.Type[set[_KeyT]],
+    mapping: t.Mapping[_KeyT, t.Iterable[_HashableValueT]],
+    *,
+    stats: t.Optional[GroupingStats] = None,
 ) -> dict[_HashableValueT, set[_KeyT]]: ...
 
 
+@t.overload
+def reverse_multimapping(  # pragma: nocover
+    clct: t.Type[IntBitmap],
+    mapping: t.Mapping[int, t.Iterable[_HashableValueT]],
+    *,
+    stats: t.Optional[GroupingStats] = None,
+) -> dict[_HashableValueT, IntBitmap]: ...
+
+
+@t.overload
+def reverse_multimapping(  # pragma: nocover
+    clct: t.Type[_SketchT],
+    mapping: t.Mapping[_KeyT, t.Iterable[_HashableValueT]],
+    *,
+    stats: t.Optional[GroupingStats] = None,
+) -> dict[_HashableValueT, _SketchT]: ...
+
+
+@t.overload
+def reverse_multimapping(  # pragma: nocover
+    clct: Newest[_KeyT],
+    mapping: t.Mapping[_KeyT, t.Iterable[_HashableValueT]],
+    *,
+    stats: t.Optional[GroupingStats] = None,
+) -> dict[_HashableValueT, deque[_KeyT]]: ...
+
+
+@t.overload
+def reverse_multimapping(  # pragma: nocover
+    clct: t.Union[Reservoir[_KeyT], TopK[_KeyT]],
+    mapping: t.Mapping[_KeyT, t.Iterable[_HashableValueT]],
+    *,
+    stats: t.Optional[GroupingStats] = None,
+) -> dict[_HashableValueT, list[_KeyT]]: ...
+
+
+@t.overload
+def reverse_multimapping(  # pragma: nocover
+    clct: BoundedCollection[_KeyT, _CollectionT],
+    mapping: t.Mapping[_KeyT, t.Iterable[_HashableValueT]],
+    *,
+    stats: t.Optional[GroupingStats] = None,
+) -> dict[_HashableValueT, _CollectionT]: ...
+
+
+@t.overload
+def reverse_multimapping(  # pragma: nocover
+    clct: TypedArray[_NumberT],
+    mapping: t.Mapping[_NumberT, t.Iterable[_HashableValueT]],
+    *,
+    stats: t.Optional[GroupingStats] = None,
+) -> "dict[_HashableValueT, array[_NumberT]]": ...
+
+
 def reverse_multimapping(
     clct: t.Union[
+        t.Type[_SketchT],
+        t.Type[IntBitmap],
+        BoundedCollection[_KeyT, _CollectionT],
+        TypedArray[t.Any],
         t.Type[Counter[_KeyT]],
         t.Type[frozenset[_KeyT]],
         t.Type[list[_KeyT]],
@@ -55,12 +136,18 @@ def reverse_multimapping(
         t.Type[tuple[_KeyT, ...]],
     ],
     mapping: t.Mapping[_KeyT, t.Iterable[_HashableValueT]],
+    *,
+    stats: t.Optional[GroupingStats] = None,
 ) -> t.Union[
     dict[_HashableValueT, Counter[_KeyT]],
     dict[_HashableValueT, frozenset[_KeyT]],
     dict[_HashableValueT, list[_KeyT]],
     dict[_HashableValueT, set[_KeyT]],
     dict[_HashableValueT, tuple[_KeyT, ...]],
+    dict[_HashableValueT, _CollectionT],
+    dict[_HashableValueT, _SketchT],
+    dict[_HashableValueT, IntBitmap],
+    "dict[_HashableValueT, array[t.Any]]",
 ]:
     """
     Reverse multimapping to map from values to keys
@@ -69,6 +156,9 @@ def reverse_multimapping(
     this function reverses the mapping so it maps from values to keys. The
     keys are collected in a collection specified by `clct`.
 
+    If `stats` is passed, it is filled with statistics of the call. See
+    `GroupingStats` for details.
+
     Examples:
     ---------
     Simple usage using `set`:
@@ -82,6 +172,13 @@ def reverse_multimapping(
     {13: frozenset({1, 2}), 37: frozenset({1}), 42: frozenset({2, 3})}
     """
 
-    return collectiondict(
-        clct, ((v, k) for k, values in mapping.items() for v in values)
-    )
+    # Only `collectiondict` is instrumented. Thus, the dedicated loops of the
+    # accumulators are skipped if statistics are requested.
+    if stats is not None or isinstance(clct, (BoundedCollection, TypedArray)):
+        pairs = (zip(values, itertools.repeat(key)) for key, values in mapping.items())
+        return collectiondict(
+            clct,  # type: ignore[arg-type]
+            itertools.chain.from_iterable(pairs),
+            stats=stats,
+        )
+    return accumulator_for(clct).collect_reversed(clct, mapping)
@@ -0,0 +1,118 @@
+import time
+import typing as t
+from collections import Counter
+
+_KeyT = t.TypeVar("_KeyT", bound=t.Hashable)
+_ValueT = t.TypeVar("_ValueT")
+
+
+class GroupingStats:
+    """
+    Statistics about a call of `collectiondict` or the reverse functions
+
+    Pass an instance as `stats` to collect the number of processed elements,
+    the number of distinct keys, the time spent and, once the result is
+    complete, a histogram of the sizes of its collections. Only instrumented
+    calls pay for that. Without `stats`, the grouping loops are unchanged.
+
+    If `progress` is given, it is called with the instance after every `every`
+    elements. `group_sizes` maps powers of two to the number of collections
+    whose size is at most that power but larger than half of it. Collections
+    without a length, e.g. `CountMinSketch`, are not counted.
+
+    Examples:
+    ---------
+    >>> from collectiondict import collectiondict
+    >>> stats = GroupingStats()
+    >>> result = collectiondict(list, [("a", 1), ("b", 2), ("a", 3)], stats=stats)
+    >>> stats.nof_elements, stats.nof_keys, stats.nof_appends
+    (3, 2, 1)
+    >>> stats.group_sizes
+    {1: 1, 2: 1}
+    """
+
+    def __init__(
+        self,
+        progress: t.Optional[t.Callable[["GroupingStats"], object]] = None,
+        every: int = 1_000_000,
+    ) -> None:
+        if every < 1:
+            raise ValueError("Progress must be reported after a positive number!")
+        self.progress = progress
+        self.every = every
+        self.nof_elements = 0
+        self.nof_keys = 0
+        self.elapsed = 0.0
+        self.group_sizes: dict[int, int] = {}
+        self._start = 0.0
+
+    @property
+    def nof_appends(self) -> int:
+        """
+        Number of elements added to a collection that existed already
+        """
+        return self.nof_elements - self.nof_keys
+
+    @property
+    def new_key_rate(self) -> float:
+        """
+        Number of new keys per second
+        """
+        return self.nof_keys / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def append_rate(self) -> float:
+        """
+        Number of elements per second added to existing collections
+        """
+        return self.nof_appends / self.elapsed if self.elapsed else 0.0
+
+    def __repr__(self) -> str:
+        return (
+            f"GroupingStats(nof_elements={self.nof_elements}, "
+            f"nof_keys={self.nof_keys}, elapsed={self.elapsed:.3f})"
+        )
+
+    def _observe(
+        self, iterable: t.Iterable[tuple[_KeyT, _ValueT]]
+    ) -> t.Iterator[tuple[_KeyT, _ValueT]]:
+        self._start = time.perf_counter()
+        if self.progress is None:
+            return self._counted(iterable)
+        return self._reported(iterable, self.progress)
+
+    def _counted(
+        self, iterable: t.Iterable[tuple[_KeyT, _ValueT]]
+    ) -> t.Iterator[tuple[_KeyT, _ValueT]]:
+        # The distinct keys are counted by the result. See `_summarise`.
+        nof_elements = 0
+        for pair in iterable:
+            nof_elements += 1
+            yield pair
+        self.nof_elements = nof_elements
+
+    def _reported(
+        self,
+        iterable: t.Iterable[tuple[_KeyT, _ValueT]],
+        progress: t.Callable[["GroupingStats"], object],
+    ) -> t.Iterator[tuple[_KeyT, _ValueT]]:
+        # The result is not accessible before it is complete. Thus, the keys
+        # have to be tracked here to be reported in between.
+        keys: set[_KeyT] = set()
+        every = self.every
+        nof_elements = 0
+        for nof_elements, pair in enumerate(iterable, start=1):
+            keys.add(pair[0])
+            if nof_elements % every == 0:
+                self.nof_elements, self.nof_keys = nof_elements, len(keys)
+                self.elapsed = time.perf_counter() - self._start
+                progress(self)
+            yield pair
+        self.nof_elements = nof_elements
+
+    def _summarise(self, result: t.Mapping[_KeyT, object]) -> None:
+        self.elapsed = time.perf_counter() - self._start
+        self.nof_keys = len(result)
+        sizes = (len(clct) for clct in result.values() if isinstance(clct, t.Sized))
+        histogram = Counter(1 << (size - 1).bit_length() for size in sizes)
+        self.group_sizes = dict(sorted(histogram.items()))
@@ -0,0 +1,126 @@
+import itertools
+import typing as t
+from collections import Counter
+from operator import itemgetter
+
+from ._collectiondict import collectiondict
+
+_KeyT = t.TypeVar("_KeyT", bound=t.Hashable)
+_ValueT = t.TypeVar("_ValueT")
+_HashableValueT = t.TypeVar("_HashableValueT", bound=t.Hashable)
+
+
+@t.overload
+def iter_collectiondict(  # pragma: nocover
+    clct: t.Type[Counter[_HashableValueT]],
+    iterable: t.Iterable[tuple[_KeyT, _HashableValueT]],
+    *,
+    check_contiguous: bool = False,
+) -> t.Iterator[tuple[_KeyT, Counter[_HashableValueT]]]: ...
+
+
+@t.overload
+def iter_collectiondict(  # pragma: nocover
+    clct: t.Type[list[_ValueT]],
+    iterable: t.Iterable[tuple[_KeyT, _ValueT]],
+    *,
+    check_contiguous: bool = False,
+) -> t.Iterator[tuple[_KeyT, list[_ValueT]]]: ...
+
+
+@t.overload
+def iter_collectiondict(  # pragma: nocover
+    clct: t.Type[set[_HashableValueT]],
+    iterable: t.Iterable[tuple[_KeyT, _HashableValueT]],
+    *,
+    check_contiguous: bool = False,
+) -> t.Iterator[tuple[_KeyT, set[_HashableValueT]]]: ...
+
+
+@t.overload
+def iter_collectiondict(  # pragma: nocover
+    clct: t.Type[frozenset[_HashableValueT]],
+    iterable: t.Iterable[tuple[_KeyT, _HashableValueT]],
+    *,
+    check_contiguous: bool = False,
+) -> t.Iterator[tuple[_KeyT, frozenset[_HashableValueT]]]: ...
+
+
+@t.overload
+def iter_collectiondict(  # pragma: nocover
+    clct: t.Type[tuple[_ValueT, ...]],
+    iterable: t.Iterable[tuple[_KeyT, _ValueT]],
+    *,
+    check_contiguous: bool = False,
+) -> t.Iterator[tuple[_KeyT, tuple[_ValueT, ...]]]: ...
+
+
+def iter_collectiondict(
+    clct: t.Union[
+        t.Type[Counter[_ValueT]],
+        t.Type[list[_ValueT]],
+        t.Type[set[_ValueT]],
+        t.Type[frozenset[_ValueT]],
+        t.Type[tuple[_ValueT, ...]],
+    ],
+    iterable: t.Iterable[tuple[_KeyT, _ValueT]],
+    *,
+    check_contiguous: bool = False,
+) -> t.Union[
+    t.Iterator[tuple[_KeyT, Counter[_ValueT]]],
+    t.Iterator[tuple[_KeyT, list[_ValueT]]],
+    t.Iterator[tuple[_KeyT, set[_ValueT]]],
+    t.Iterator[tuple[_KeyT, frozenset[_ValueT]]],
+    t.Iterator[tuple[_KeyT, tuple[_ValueT, ...]]],
+]:
+    """
+    Collect values of consecutive equal keys and yield them one by one
+
+    Given a stream of key-value tuples in which all tuples of a key are
+    consecutive, e.g. because the stream is sorted by key, this function yields
+    a tuple of every key and the collection of its values. A group is yielded
+    as soon as the key changes. Thus, only one group needs to be kept in
+    memory and downstream processing can start right away.
+
+    If the stream is grouped by key, `dict(iter_collectiondict(clct, stream))`
+    is equal to `collectiondict(clct, stream)`. Otherwise, keys are yielded
+    several times. If `check_contiguous` is set, a `ValueError` is raised in
+    that case instead. This requires to remember all keys seen before.
+
+    Examples:
+    ---------
+    >>> stream = [("a", 1), ("a", 2), ("b", 3), ("c", 4), ("c", 5)]
+    >>> groups = iter_collectiondict(list, stream)
+    >>> next(groups)
+    ('a', [1, 2])
+    >>> list(groups)
+    [('b', [3]), ('c', [4, 5])]
+    """
+
+    # Fail early for invalid collections, even if the stream is empty.
+    collectiondict(clct, ())
+    groups = _iter_groups(clct, iterable)
+    if check_contiguous:
+        return _checked_for_reappearing_keys(groups)
+    return groups
+
+
+def _iter_groups(
+    clct: t.Type[t.Any], iterable: t.Iterable[tuple[_KeyT, _ValueT]]
+) -> t.Iterator[tuple[_KeyT, t.Any]]:
+    for key, pairs in itertools.groupby(iterable, itemgetter(0)):
+        # Using `collectiondict` for every group ensures that all collections
+        # are handled exactly like by `collectiondict`.
+        (collection,) = collectiondict(clct, pairs).values()
+        yield key, collection
+
+
+def _checked_for_reappearing_keys(
+    groups: t.Iterator[tuple[_KeyT, _ValueT]],
+) -> t.Iterator[tuple[_KeyT, _ValueT]]:
+    seen: set[_KeyT] = set()
+    for key, collection in groups:
+        if key in seen:
+            raise ValueError(f"Key {key!r} is not contiguous in the stream!")
+        seen.add(key)
+        yield key, collection
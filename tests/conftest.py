@@ -0,0 +1,9 @@
+import pytest
+
+from collectiondict import register_accumulator
+from tests import custom_classes as cc
+
+
+@pytest.fixture(scope="session", autouse=True)
+def registered_deque() -> None:
+    register_accumulator(cc.MyDeque, cc.MyDequeAccumulator())
@@ -1,5 +1,7 @@
 import typing as t
-from collections import Counter
+from collections import Counter, deque
+
+from collectiondict import Accumulator
 
 _KeyT = t.TypeVar("_KeyT", bound=t.Hashable)
 _ValueT = t.TypeVar("_ValueT")
@@ -23,3 +25,15 @@ class MySet(set[_ValueT]):
 
 class MyTuple(tuple[_ValueT, ...]):
     pass
+
+
+class MyDeque(deque[_ValueT]):
+    pass
+
+
+class MyDequeAccumulator(Accumulator["MyDeque[t.Any]", "MyDeque[t.Any]"]):
+    def init(self, clct: t.Type["MyDeque[t.Any]"]) -> "MyDeque[t.Any]":
+        return clct()
+
+    def add(self, buffer: "MyDeque[t.Any]", value: t.Any) -> None:
+        buffer.append(value)
@@ -3,6 +3,7 @@ from collections import Counter
 
 from hypothesis import strategies as st
 
+from collectiondict import CountMinSketch, HyperLogLog, IntBitmap
 from tests import custom_classes as cc
 
 _KeyT = t.TypeVar("_KeyT", bound=t.Hashable)
@@ -30,6 +31,11 @@ def valid_collections() -> st.SearchStrategy[t.Type[t.Any]]:
     )
 
 
+def registered_collections() -> st.SearchStrategy[t.Type[t.Any]]:
+    # Types that are supported through their registered accumulators only.
+    return st.sampled_from([IntBitmap, CountMinSketch, HyperLogLog, cc.MyDeque])
+
+
 def valid_ordered_collections() -> st.SearchStrategy[t.Type[t.Any]]:
     return st.sampled_from([list, tuple, cc.MyList, cc.MyTuple])
 
@@ -0,0 +1,184 @@
+import typing as t
+from collections import Counter, deque
+
+import pytest
+from hypothesis import given, settings
+from hypothesis import strategies as st
+
+from collectiondict import (
+    Accumulator,
+    CountMinSketch,
+    HyperLogLog,
+    IntBitmap,
+    accumulator_for,
+    collectiondict,
+    merge_collectiondicts,
+    register_accumulator,
+    reverse_multimapping,
+)
+from tests import custom_classes as cc
+from tests import hypothesis_utils as hu
+
+_KeyT = t.TypeVar("_KeyT", bound=t.Hashable)
+_ValueT = t.TypeVar("_ValueT")
+
+
+class Queue(deque[_ValueT]):
+    pass
+
+
+class SubQueue(Queue[_ValueT]):
+    pass
+
+
+class SortedList(list[_ValueT]):
+    pass
+
+
+class QueueAccumulator(Accumulator["Queue[t.Any]", "Queue[t.Any]"]):
+    def init(self, clct: t.Type["Queue[t.Any]"]) -> "Queue[t.Any]":
+        return clct()
+
+    def add(self, buffer: "Queue[t.Any]", value: t.Any) -> None:
+        buffer.append(value)
+
+
+class SortedListAccumulator(Accumulator[list[t.Any], "SortedList[t.Any]"]):
+    def init(self, clct: t.Type["SortedList[t.Any]"]) -> list[t.Any]:
+        return []
+
+    def add(self, buffer: list[t.Any], value: t.Any) -> None:
+        buffer.append(value)
+
+    def finalize(
+        self, clct: t.Type["SortedList[t.Any]"], buffer: list[t.Any]
+    ) -> "SortedList[t.Any]":
+        return clct(sorted(buffer))
+
+
+register_accumulator(Queue, QueueAccumulator())
+register_accumulator(SortedList, SortedListAccumulator())
+
+
+@given(stream=hu.valid_streams(), clct_t=st.sampled_from([Queue, SubQueue]))
+def test_collectiondict_uses_registered_accumulators(
+    stream: list[tuple[_KeyT, _ValueT]], clct_t: t.Type[t.Any]
+) -> None:
+    expected = collectiondict(list, stream)
+    result = collectiondict(clct_t, stream)
+    assert {key: list(values) for key, values in result.items()} == expected
+    assert all(type(values) is clct_t for values in result.values())
+
+
+@given(stream=hu.valid_streams())
+def test_accumulators_finalize_buffers(stream: list[tuple[_KeyT, _ValueT]]) -> None:
+    expected = {
+        key: sorted(values) for key, values in collectiondict(list, stream).items()
+    }
+    result = collectiondict(SortedList, stream)
+    assert result == expected
+    assert all(type(values) is SortedList for values in result.values())
+
+
+@given(mapping=st.dictionaries(st.integers(), st.lists(st.integers())))
+def test_reverse_multimapping_uses_registered_accumulators(
+    mapping: dict[int, list[int]],
+) -> None:
+    queue_t: t.Type[t.Any] = Queue
+    expected = reverse_multimapping(list, mapping)
+    result = reverse_multimapping(queue_t, mapping)
+    assert {key: list(values) for key, values in result.items()} == expected
+
+
+@given(streams=st.lists(hu.valid_streams()))
+def test_merge_uses_registered_accumulators(
+    streams: list[list[tuple[_KeyT, _ValueT]]],
+) -> None:
+    partials = [collectiondict(SortedList, stream) for stream in streams]
+    concatenated = [pair for stream in streams for pair in stream]
+    expected = collectiondict(SortedList, concatenated)
+    assert merge_collectiondicts(SortedList, partials) == expected
+
+
+@pytest.mark.parametrize(
+    "clct_t",
+    [
+        Counter,
+        list,
+        set,
+        frozenset,
+        tuple,
+        cc.MyCounter,
+        cc.MyList,
+        cc.MySet,
+        cc.MyFrozenset,
+        cc.MyTuple,
+        CountMinSketch,
+        HyperLogLog,
+        IntBitmap,
+    ],
+)
+@settings(deadline=None)
+@given(stream=hu.valid_streams(), streams=st.lists(hu.valid_streams()))
+def test_generic_loops_match_dedicated_loops_of_builtins(
+    clct_t: t.Type[t.Any],
+    stream: list[tuple[_KeyT, _ValueT]],
+    streams: list[list[tuple[_KeyT, _ValueT]]],
+) -> None:
+    # The built-in accumulators override the loops of `Accumulator` for speed.
+    # Their primitives must give the same results as the dedicated loops.
+    accumulator = accumulator_for(clct_t)
+    expected = accumulator.collect(clct_t, stream)
+    result = Accumulator.collect(accumulator, clct_t, stream)
+    assert list(result.items()) == list(expected.items())
+    assert all(type(clct) is clct_t for clct in result.values())
+
+    values = [val for _, val in stream]
+    expected_buffer, buffer = accumulator.init(clct_t), accumulator.init(clct_t)
+    accumulator.add_all(expected_buffer, values)
+    Accumulator.add_all(accumulator, buffer, values)
+    expected_clct = accumulator.finalize(clct_t, expected_buffer)
+    assert accumulator.finalize(clct_t, buffer) == expected_clct
+
+    partials = [collectiondict(clct_t, stream) for stream in streams]
+    expected = accumulator.merge(clct_t, partials)
+    result = Accumulator.merge(accumulator, clct_t, partials)
+    assert list(result.items()) == list(expected.items())
+
+
+def test_registering_replaces_cached_accumulators() -> None:
+    class Stack(Queue[int]):
+        pass
+
+    class StackAccumulator(QueueAccumulator):
+        def add(self, buffer: "Queue[t.Any]", value: t.Any) -> None:
+            buffer.appendleft(value)
+
+    class SubStack(Stack):
+        pass
+
+    sub_stack_t: t.Type[t.Any] = SubStack
+    assert collectiondict(sub_stack_t, [(0, 1), (0, 2)]) == {0: deque([1, 2])}
+    register_accumulator(Stack, StackAccumulator())
+    assert collectiondict(sub_stack_t, [(0, 1), (0, 2)]) == {0: deque([2, 1])}
+
+
+def test_accumulators_keep_buffers_by_default() -> None:
+    buffer = Queue([1, 2])
+    assert QueueAccumulator().finalize(Queue, buffer) is buffer
+
+
+def test_most_specific_accumulator_is_used() -> None:
+    assert isinstance(accumulator_for(SubQueue), QueueAccumulator)
+    assert accumulator_for(SortedList) is not accumulator_for(list)
+
+
+@pytest.mark.parametrize("invalid_clct", [dict, deque, list[int], "list"])
+def test_lookup_breaks_for_unregistered_types(invalid_clct: t.Any) -> None:
+    with pytest.raises(AssertionError):
+        accumulator_for(invalid_clct)
+
+
+def test_registering_breaks_for_non_types() -> None:
+    with pytest.raises(ValueError):
+        register_accumulator(list[int], QueueAccumulator())
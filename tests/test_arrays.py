@@ -0,0 +1,94 @@
+import typing as t
+from array import array
+
+import pytest
+from hypothesis import given
+from hypothesis import strategies as st
+
+from collectiondict import (
+    TypedArray,
+    collectiondict,
+    merge_collectiondicts,
+    reverse_mapping,
+    reverse_multimapping,
+)
+
+int64s = st.integers(min_value=-(2**63), max_value=2**63 - 1)
+int_streams = st.lists(st.tuples(st.integers(), int64s))
+
+
+@given(stream=int_streams)
+def test_typed_array_equals_lists(stream: list[tuple[int, int]]) -> None:
+    result = collectiondict(TypedArray("q"), stream)
+    assert result == {
+        key: array("q", values) for key, values in collectiondict(list, stream).items()
+    }
+    assert all(group.typecode == "q" for group in result.values())
+
+
+@given(stream=st.lists(st.tuples(st.integers(), st.floats(allow_nan=False))))
+def test_typed_array_of_floats(stream: list[tuple[int, float]]) -> None:
+    result = collectiondict(TypedArray("d"), stream)
+    assert {key: list(group) for key, group in result.items()} == collectiondict(
+        list, stream
+    )
+
+
+@given(mapping=st.dictionaries(int64s, st.integers()))
+def test_reverse_mapping_into_typed_arrays(mapping: dict[int, int]) -> None:
+    result = reverse_mapping(TypedArray("q"), mapping)
+    assert {val: list(keys) for val, keys in result.items()} == reverse_mapping(
+        list, mapping
+    )
+
+
+@given(mapping=st.dictionaries(int64s, st.lists(st.integers())))
+def test_reverse_multimapping_into_typed_arrays(mapping: dict[int, list[int]]) -> None:
+    result = reverse_multimapping(TypedArray("q"), mapping)
+    assert {val: list(keys) for val, keys in result.items()} == reverse_multimapping(
+        list, mapping
+    )
+
+
+@given(streams=st.lists(int_streams, max_size=4))
+def test_merge_typed_arrays(streams: list[list[tuple[int, int]]]) -> None:
+    clct = TypedArray("q")
+    parts = [collectiondict(clct, stream) for stream in streams]
+    expected = collectiondict(clct, [pair for stream in streams for pair in stream])
+    assert merge_collectiondicts(clct, parts) == expected
+
+
+def test_merge_typed_arrays_accepts_other_iterables() -> None:
+    parts: list[dict[str, t.Iterable[int]]] = [
+        {"a": [1, 2]},
+        {"a": array("q", [3]), "b": (4,)},
+    ]
+    result = merge_collectiondicts(TypedArray("q"), parts)
+    assert result == {"a": array("q", [1, 2, 3]), "b": array("q", [4])}
+
+
+@pytest.mark.parametrize(
+    ("typecode", "other"), [("q", array("i", [1, 2])), ("d", array("b", [1, 2]))]
+)
+def test_merge_typed_arrays_converts_arrays_of_other_typecodes(
+    typecode: t.Literal["q", "d"], other: "array[int]"
+) -> None:
+    clct: TypedArray[t.Any] = TypedArray(typecode)
+    result = merge_collectiondicts(clct, [{"a": array(typecode, [0])}, {"a": other}])
+    assert result == {"a": array(typecode, [0, 1, 2])}
+    assert result["a"].typecode == typecode
+
+
+def test_typed_array_breaks_for_values_out_of_range() -> None:
+    with pytest.raises(OverflowError):
+        collectiondict(TypedArray("b"), [("a", 1000)])
+
+
+@pytest.mark.parametrize("typecode", ["", "u", "qq", "x"])
+def test_typed_array_breaks_for_invalid_typecode(typecode: t.Any) -> None:
+    with pytest.raises(ValueError):
+        TypedArray(typecode)
+
+
+def test_typed_array_repr() -> None:
+    assert repr(TypedArray("d")) == "TypedArray('d')"
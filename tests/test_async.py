@@ -0,0 +1,110 @@
+import asyncio
+import typing as t
+from collections import deque
+
+import pytest
+from hypothesis import given
+from hypothesis import strategies as st
+
+from collectiondict import (
+    acollectiondict,
+    areverse_mapping,
+    areverse_multimapping,
+    collectiondict,
+    reverse_mapping,
+    reverse_multimapping,
+)
+from tests import hypothesis_utils as hu
+
+_T = t.TypeVar("_T")
+
+
+async def _stream(iterable: t.Iterable[_T]) -> t.AsyncIterator[_T]:
+    for elem in iterable:
+        yield elem
+
+
+def _batches(elems: list[_T], size: int) -> list[list[_T]]:
+    return [elems[idx : idx + size] for idx in range(0, len(elems), size)]
+
+
+@given(
+    clct_t=hu.registered_collections(),
+    stream=hu.valid_streams(),
+    batched=st.booleans(),
+)
+def test_async_functions_support_registered_collections(
+    clct_t: t.Type[t.Any], stream: list[tuple[int, int]], batched: bool
+) -> None:
+    source: list[t.Any] = _batches(stream, 3) if batched else stream
+    expected = collectiondict(clct_t, stream)
+    result = asyncio.run(acollectiondict(clct_t, _stream(source), batched=batched))
+    assert result == expected
+    mapping = dict(stream)
+    expected = reverse_mapping(clct_t, mapping)
+    assert asyncio.run(areverse_mapping(clct_t, _stream(mapping.items()))) == expected
+    multimapping = collectiondict(list, stream)
+    expected = reverse_multimapping(clct_t, multimapping)
+    multi_items = _stream(multimapping.items())
+    assert asyncio.run(areverse_multimapping(clct_t, multi_items)) == expected
+
+
+@given(clct_t=hu.valid_collections(), stream=hu.valid_streams())
+def test_acollectiondict_equals_collectiondict(
+    clct_t: t.Type[t.Any], stream: list[tuple[int, int]]
+) -> None:
+    expected = collectiondict(clct_t, stream)
+    result = asyncio.run(acollectiondict(clct_t, _stream(stream)))
+    assert result == expected
+    assert all(type(clct) is clct_t for clct in result.values())
+
+
+@given(
+    clct_t=hu.valid_collections(),
+    stream=hu.valid_streams(),
+    size=st.integers(min_value=1, max_value=10),
+)
+def test_acollectiondict_equals_collectiondict_for_batches(
+    clct_t: t.Type[t.Any], stream: list[tuple[int, int]], size: int
+) -> None:
+    expected = collectiondict(clct_t, stream)
+    batches = _stream(_batches(stream, size))
+    result = asyncio.run(acollectiondict(clct_t, batches, batched=True))
+    assert result == expected
+    assert all(type(clct) is clct_t for clct in result.values())
+
+
+@given(
+    clct_t=hu.valid_collections(),
+    mapping=st.dictionaries(st.integers(), st.integers()),
+    batched=st.booleans(),
+)
+def test_areverse_mapping_equals_reverse_mapping(
+    clct_t: t.Type[t.Any], mapping: dict[int, int], batched: bool
+) -> None:
+    expected = reverse_mapping(clct_t, mapping)
+    items = list(mapping.items())
+    stream = _stream(_batches(items, 3)) if batched else _stream(items)
+    result = asyncio.run(areverse_mapping(clct_t, stream, batched=batched))
+    assert result == expected
+
+
+@given(
+    clct_t=hu.valid_collections(),
+    mapping=st.dictionaries(st.integers(), st.lists(st.integers())),
+    batched=st.booleans(),
+)
+def test_areverse_multimapping_equals_reverse_multimapping(
+    clct_t: t.Type[t.Any], mapping: dict[int, list[int]], batched: bool
+) -> None:
+    expected = reverse_multimapping(clct_t, mapping)
+    items = list(mapping.items())
+    stream = _stream(_batches(items, 3)) if batched else _stream(items)
+    result = asyncio.run(areverse_multimapping(clct_t, stream, batched=batched))
+    assert result == expected
+
+
+@given(invalid_clct=st.sampled_from([dict, deque]))
+def test_breaks_for_invalid_collections(invalid_clct: t.Type[t.Any]) -> None:
+    with pytest.raises(AssertionError):
+        asyncio.run(acollectiondict(invalid_clct, _stream([])))
@@ -0,0 +1,84 @@
+import typing as t
+from collections import Counter, deque
+
+import pytest
+from hypothesis import given
+from hypothesis import strategies as st
+
+from collectiondict import batched_collectiondict, collectiondict
+from tests import custom_classes as cc
+from tests import hypothesis_utils as hu
+
+_KeyT = t.TypeVar("_KeyT", bound=t.Hashable)
+_ValueT = t.TypeVar("_ValueT")
+
+
+def _to_batches(
+    streams: list[list[tuple[_KeyT, _ValueT]]],
+) -> list[tuple[list[_KeyT], list[_ValueT]]]:
+    return [([k for k, _ in stream], [v for _, v in stream]) for stream in streams]
+
+
+@given(
+    clct_t=hu.valid_collections(),
+    streams=st.lists(hu.valid_streams()),
+)
+def test_batched_collectiondict_equals_collectiondict(
+    clct_t: t.Type[t.Any], streams: list[list[tuple[_KeyT, _ValueT]]]
+) -> None:
+    expected = collectiondict(clct_t, [pair for stream in streams for pair in stream])
+    result = batched_collectiondict(clct_t, _to_batches(streams))
+    assert list(result.items()) == list(expected.items())
+    assert all(type(clct) is clct_t for clct in result.values())
+
+
+@given(
+    clct_t=hu.valid_collections(),
+    keys=st.lists(st.integers(min_value=0, max_value=2)),
+    batch_size=st.integers(min_value=1, max_value=5),
+)
+def test_batched_collectiondict_with_single_key_batches(
+    clct_t: t.Type[t.Any], keys: list[int], batch_size: int
+) -> None:
+    streams = [[(key, n) for n in range(batch_size)] for key in keys]
+    expected = collectiondict(clct_t, [pair for stream in streams for pair in stream])
+    result = batched_collectiondict(clct_t, _to_batches(streams))
+    assert list(result.items()) == list(expected.items())
+    assert all(type(clct) is clct_t for clct in result.values())
+
+
+@given(
+    clct_t=hu.registered_collections(),
+    streams=st.lists(hu.valid_streams()),
+    keys=st.lists(st.integers(min_value=0, max_value=2)),
+)
+def test_batched_collectiondict_supports_registered_collections(
+    clct_t: t.Type[t.Any],
+    streams: list[list[tuple[int, int]]],
+    keys: list[int],
+) -> None:
+    streams += [[(key, n) for n in range(3)] for key in keys]
+    expected = collectiondict(clct_t, [pair for stream in streams for pair in stream])
+    result = batched_collectiondict(clct_t, _to_batches(streams))
+    assert list(result.items()) == list(expected.items())
+
+
+@pytest.mark.parametrize("clct_t", [Counter, list, set, cc.MyDeque])
+def test_batched_collectiondict_with_mixed_batches(clct_t: t.Type[t.Any]) -> None:
+    # Every collection type is filled by its own loop. Each of them must handle
+    # batches of many keys and batches of a single key.
+    streams = [[(1, 1), (2, 2), (1, 1)], [(2, 3), (2, 4)], [(3, 5), (1, 6)]]
+    expected = collectiondict(clct_t, [pair for stream in streams for pair in stream])
+    result = batched_collectiondict(clct_t, _to_batches(streams))
+    assert list(result.items()) == list(expected.items())
+
+
+def test_batched_collectiondict_breaks_for_batches_of_unequal_length() -> None:
+    with pytest.raises(ValueError):
+        batched_collectiondict(list, [([1, 2], [3])])
+
+
+@given(invalid_clct=st.sampled_from([dict, deque]))
+def test_breaks_for_invalid_collections(invalid_clct: t.Type[t.Any]) -> None:
+    with pytest.raises(AssertionError):
+        batched_collectiondict(invalid_clct, [([1], [1])])
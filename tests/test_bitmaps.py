@@ -0,0 +1,161 @@
+import pickle
+import sys
+import typing as t
+
+import pytest
+from hypothesis import given, settings
+from hypothesis import strategies as st
+
+from collectiondict import (
+    IntBitmap,
+    collectiondict,
+    merge_collectiondicts,
+    reverse_mapping,
+    reverse_multimapping,
+)
+from tests import hypothesis_utils as hu
+
+_KeyT = t.TypeVar("_KeyT", bound=t.Hashable)
+
+# Values are drawn from a few chunks only, so that chunks become dense, too.
+chunk_ints = st.one_of(
+    st.integers(0, 2**17),
+    st.integers(-(2**16), 2**16).map(lambda n: n * 3),
+    st.integers(),
+)
+# Chunks with more than 4096 members are dense, which steps of up to 16 give.
+dense_ints = st.builds(
+    lambda start, step, extra: set(range(start, start + 2**16, step)) | extra,
+    st.integers(-(2**16), 2**16),
+    st.integers(1, 20),
+    st.sets(chunk_ints),
+)
+
+
+@given(values=st.lists(chunk_ints))
+def test_bitmap_equals_set(values: list[int]) -> None:
+    bitmap = IntBitmap(values)
+    assert bitmap == set(values)
+    assert bitmap.to_set() == set(values)
+    assert list(bitmap) == sorted(set(values))
+    assert len(bitmap) == len(set(values))
+
+
+@given(values=st.lists(chunk_ints), others=st.lists(chunk_ints))
+def test_adding_one_by_one_equals_bulk_update(
+    values: list[int], others: list[int]
+) -> None:
+    bitmap = IntBitmap(values)
+    for value in others:
+        bitmap.add(value)
+    assert bitmap == IntBitmap(values + others)
+    assert len(bitmap) == len(set(values + others))
+
+
+def test_adding_one_by_one_makes_chunks_dense() -> None:
+    values = range(0, 10000, 2)
+    bitmap = IntBitmap()
+    for value in [*values, *values]:
+        bitmap.add(value)
+    assert bitmap == IntBitmap(values)
+    assert len(bitmap) == len(values)
+    assert all(value in bitmap for value in values)
+    assert not any(value + 1 in bitmap for value in values)
+
+
+@given(values=st.lists(chunk_ints), probes=st.lists(chunk_ints))
+def test_membership(values: list[int], probes: list[int]) -> None:
+    bitmap = IntBitmap(values)
+    for probe in probes + values:
+        assert (probe in bitmap) is (probe in set(values))
+
+
+@pytest.mark.parametrize(
+    "left_strategy", [st.sets(chunk_ints), dense_ints], ids=["sparse", "dense"]
+)
+@pytest.mark.parametrize(
+    "right_strategy", [st.sets(chunk_ints), dense_ints], ids=["sparse", "dense"]
+)
+@settings(max_examples=25, deadline=None)
+@given(data=st.data())
+def test_union_and_intersection_equal_those_of_sets(
+    left_strategy: st.SearchStrategy[set[int]],
+    right_strategy: st.SearchStrategy[set[int]],
+    data: st.DataObject,
+) -> None:
+    left, right = data.draw(left_strategy), data.draw(right_strategy)
+    union = IntBitmap(left) | IntBitmap(right)
+    intersection = IntBitmap(left) & IntBitmap(right)
+    assert isinstance(union, IntBitmap)
+    assert isinstance(intersection, IntBitmap)
+    assert union == IntBitmap(left | right) == left | right
+    assert intersection == IntBitmap(left & right) == left & right
+    assert len(union) == len(left | right)
+    assert len(intersection) == len(left & right)
+    bitmap = IntBitmap(left)
+    bitmap |= IntBitmap(right)
+    assert bitmap == union
+
+
+@given(values=st.sets(chunk_ints), others=st.sets(chunk_ints))
+def test_operations_with_other_sets(values: set[int], others: set[int]) -> None:
+    bitmap = IntBitmap(values)
+    assert bitmap | others == values | others
+    assert bitmap & others == values & others
+    assert bitmap - others == values - others
+    assert (bitmap <= IntBitmap(values | others)) is True
+
+
+@given(values=st.lists(chunk_ints))
+def test_bitmaps_can_be_pickled(values: list[int]) -> None:
+    bitmap = IntBitmap(values)
+    assert pickle.loads(pickle.dumps(bitmap)) == bitmap
+
+
+def test_bitmaps_are_smaller_than_sets() -> None:
+    values = range(0, 10**6, 3)
+    assert 10 * sys.getsizeof(IntBitmap(values)) < sys.getsizeof(set(values))
+
+
+def test_bitmaps_are_unhashable() -> None:
+    with pytest.raises(TypeError):
+        hash(IntBitmap())
+
+
+def test_bitmaps_break_for_non_integers() -> None:
+    with pytest.raises(TypeError):
+        IntBitmap([1.5])  # type: ignore[list-item]
+    values: t.Collection[object] = IntBitmap([1])
+    assert "1" not in values
+
+
+def test_bitmap_repr() -> None:
+    assert repr(IntBitmap([70000, 1])) == "IntBitmap([1, 70000])"
+
+
+@given(stream=hu.valid_streams())
+def test_collectiondict_for_bitmaps(stream: list[tuple[int, int]]) -> None:
+    expected = collectiondict(set, stream)
+    result = collectiondict(IntBitmap, stream)
+    assert result == expected
+    assert list(result) == list(expected)
+    assert all(type(bitmap) is IntBitmap for bitmap in result.values())
+
+
+@given(mapping=st.dictionaries(st.integers(), st.text(max_size=5)))
+def test_reverse_functions_for_bitmaps(mapping: dict[int, str]) -> None:
+    assert reverse_mapping(IntBitmap, mapping) == reverse_mapping(set, mapping)
+    multi = reverse_multimapping(IntBitmap, mapping)
+    assert multi == reverse_multimapping(set, mapping)
+
+
+@given(streams=st.lists(hu.valid_streams()))
+def test_merging_bitmaps_equals_collecting_concatenated_streams(
+    streams: list[list[tuple[int, int]]],
+) -> None:
+    partials = [collectiondict(IntBitmap, stream) for stream in streams]
+    concatenated = [pair for stream in streams for pair in stream]
+    expected = collectiondict(IntBitmap, concatenated)
+    assert merge_collectiondicts(IntBitmap, partials) == expected
+    for partial, stream in zip(partials, streams):
+        assert partial == collectiondict(IntBitmap, stream)
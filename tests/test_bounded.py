@@ -0,0 +1,104 @@
+import heapq
+import typing as t
+from collections import Counter, deque
+
+import pytest
+from hypothesis import given
+from hypothesis import strategies as st
+
+from collectiondict import (
+    BoundedCollection,
+    Newest,
+    Reservoir,
+    TopK,
+    collectiondict,
+    reverse_mapping,
+    reverse_multimapping,
+)
+from tests import hypothesis_utils as hu
+
+sizes = st.integers(min_value=1, max_value=5)
+
+
+@given(stream=hu.valid_streams(), size=sizes)
+def test_newest_keeps_last_values(stream: list[tuple[int, int]], size: int) -> None:
+    expected = {
+        key: deque(values[-size:], maxlen=size)
+        for key, values in collectiondict(list, stream).items()
+    }
+    assert collectiondict(Newest(size), stream) == expected
+
+
+@given(stream=hu.valid_streams(), size=sizes)
+def test_top_k_equals_nlargest(stream: list[tuple[int, int]], size: int) -> None:
+    expected = {
+        key: heapq.nlargest(size, values)
+        for key, values in collectiondict(list, stream).items()
+    }
+    assert collectiondict(TopK(size), stream) == expected
+
+
+@given(stream=st.lists(st.tuples(st.integers(), st.tuples(st.integers()))), size=sizes)
+def test_top_k_compares_by_key_and_keeps_first_of_ties(
+    stream: list[tuple[int, tuple[int]]], size: int
+) -> None:
+    def key(val: tuple[int]) -> int:
+        return val[0] % 3
+
+    expected = {
+        key_: heapq.nlargest(size, values, key=key)
+        for key_, values in collectiondict(list, stream).items()
+    }
+    result = collectiondict(TopK(size, key=key), stream)
+    assert result == expected
+    assert all(
+        [id(val) for val in result[key_]] == [id(val) for val in values]
+        for key_, values in expected.items()
+    )
+
+
+@given(stream=hu.valid_streams(), size=sizes, seed=st.integers())
+def test_reservoir_samples_values_of_every_key(
+    stream: list[tuple[int, int]], size: int, seed: int
+) -> None:
+    full = collectiondict(list, stream)
+    result = collectiondict(Reservoir(size, seed=seed), stream)
+    assert result.keys() == full.keys()
+    for key, values in full.items():
+        assert len(result[key]) == min(size, len(values))
+        assert not Counter(result[key]) - Counter(values)
+    assert collectiondict(Reservoir(size, seed=seed), stream) == result
+
+
+def test_reservoir_samples_uniformly() -> None:
+    nof_values = 10
+    nof_runs = 2000
+    counts: Counter[int] = Counter()
+    for seed in range(nof_runs):
+        sample = collectiondict(Reservoir(1, seed=seed), ((0, n) for n in range(10)))
+        counts.update(sample[0])
+    expected = nof_runs / nof_values
+    assert all(abs(counts[n] - expected) < expected / 3 for n in range(nof_values))
+
+
+@given(
+    bounded=st.sampled_from([Newest(2), TopK(2), Reservoir(2, seed=0)]),
+    mapping=st.dictionaries(st.integers(), st.lists(st.integers())),
+)
+def test_reverse_functions_support_bounded_collections(
+    bounded: BoundedCollection[int, t.Any], mapping: dict[int, list[int]]
+) -> None:
+    pairs = [(v, k) for k, values in mapping.items() for v in values]
+    assert reverse_multimapping(bounded, mapping) == collectiondict(bounded, pairs)
+    singles = {k: values[0] for k, values in mapping.items() if values}
+    pairs = [(v, k) for k, v in singles.items()]
+    assert reverse_mapping(bounded, singles) == collectiondict(bounded, pairs)
+
+
+@pytest.mark.parametrize("bounded_t", [Newest, TopK, Reservoir])
+@pytest.mark.parametrize("size", [0, -1])
+def test_bounded_collections_break_for_non_positive_sizes(
+    bounded_t: t.Type[BoundedCollection[int, t.Any]], size: int
+) -> None:
+    with pytest.raises(ValueError):
+        bounded_t(size)
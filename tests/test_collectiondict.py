@@ -1,6 +1,7 @@
 import typing as t
 from collections import Counter, deque
 from itertools import groupby
+from operator import attrgetter, itemgetter
 
 import pytest
 from hypothesis import given
@@ -101,6 +102,40 @@ def test_to_collectiondict_for_reordering_robust_collections(
     assert result == expected
 
 
+class _Record(t.NamedTuple):
+    value: int
+    key: int
+
+
+@given(clct_t=hu.valid_collections(), stream=hu.valid_streams())
+def test_extractors_equal_pairs(
+    clct_t: t.Type[t.Any], stream: list[tuple[int, int]]
+) -> None:
+    records = [_Record(value=val, key=key) for key, val in stream]
+    expected = collectiondict(clct_t, stream)
+    by_attribute = collectiondict(
+        clct_t, records, key=attrgetter("key"), value=attrgetter("value")
+    )
+    by_item = collectiondict(
+        clct_t, iter(records), key=itemgetter(1), value=itemgetter(0)
+    )
+    assert by_attribute == expected
+    assert by_item == expected
+    assert all(isinstance(clct, clct_t) for clct in by_item.values())
+
+
+@pytest.mark.parametrize(
+    ("key", "value"), [(itemgetter(0), None), (None, itemgetter(1))]
+)
+def test_breaks_for_single_extractor(
+    key: t.Optional[t.Callable[[t.Any], t.Any]],
+    value: t.Optional[t.Callable[[t.Any], t.Any]],
+) -> None:
+    extractors: dict[str, t.Any] = {"key": key, "value": value}
+    with pytest.raises(ValueError):
+        collectiondict(list, [(1, 2)], **extractors)
+
+
 @given(
     stream=hu.valid_streams(),
     invalid_clct=st.sampled_from([dict, deque]),
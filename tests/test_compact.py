@@ -0,0 +1,108 @@
+import typing as t
+from array import array
+
+import pytest
+from hypothesis import given
+from hypothesis import strategies as st
+
+from collectiondict import (
+    CompactMultidict,
+    collectiondict,
+    compact_collectiondict,
+    compact_reverse_multimapping,
+    reverse_multimapping,
+)
+from tests import hypothesis_utils as hu
+
+
+@given(stream=hu.valid_streams())
+def test_compact_collectiondict_equals_collectiondict(
+    stream: list[tuple[int, int]],
+) -> None:
+    expected = collectiondict(list, stream)
+    result = compact_collectiondict(stream)
+    assert list(result) == list(expected)
+    assert {key: list(view) for key, view in result.items()} == expected
+    assert result == expected
+
+
+@given(
+    mapping=st.dictionaries(
+        st.integers(), st.lists(st.integers().map(lambda n: n % 13))
+    )
+)
+def test_compact_reverse_multimapping_equals_reverse_multimapping(
+    mapping: dict[int, list[int]],
+) -> None:
+    expected = reverse_multimapping(list, mapping)
+    result = compact_reverse_multimapping(mapping)
+    assert list(result) == list(expected)
+    assert {key: list(view) for key, view in result.items()} == expected
+
+
+@pytest.mark.parametrize(
+    ("values", "typecode"),
+    [([1, 2, 3], "q"), ([1.0, 2.5], "d"), ([], None), ([1, 2.5], None)],
+)
+def test_numeric_values_are_stored_unboxed(
+    values: list[t.Any], typecode: t.Optional[str]
+) -> None:
+    result = compact_collectiondict(("key", val) for val in values)
+    if typecode is None:
+        assert isinstance(result.buffer, list)
+    else:
+        assert isinstance(result.buffer, array)
+        assert result.buffer.typecode == typecode
+
+
+@pytest.mark.parametrize("values", [[2**63], [True, False], ["a", "b"]])
+def test_other_values_are_stored_in_list(values: list[t.Any]) -> None:
+    result = compact_collectiondict(("key", val) for val in values)
+    assert isinstance(result.buffer, list)
+    assert list(result["key"]) == values
+    assert all(type(a) is type(b) for a, b in zip(result["key"], values))
+
+
+@given(
+    values=st.lists(st.integers(min_value=0, max_value=100)),
+    index=st.integers(min_value=-110, max_value=110),
+    start=st.none() | st.integers(min_value=-110, max_value=110),
+    stop=st.none() | st.integers(min_value=-110, max_value=110),
+)
+def test_group_view_behaves_like_list(
+    values: list[int],
+    index: int,
+    start: t.Optional[int],
+    stop: t.Optional[int],
+) -> None:
+    # Another key before and after checks that views do not leak into other
+    # groups.
+    multidict = CompactMultidict({"before": [-1], "key": values, "after": [-2]})
+    view = multidict["key"]
+    assert len(view) == len(values)
+    assert list(view) == values
+    assert view[start:stop] == values[start:stop]
+    assert view == values
+    assert view != [*values, 0]
+    assert view == CompactMultidict({"other": values})["other"]
+    assert view != tuple(values)
+    if -len(values) <= index < len(values):
+        assert view[index] == values[index]
+    else:
+        with pytest.raises(IndexError):
+            view[index]
+
+
+def test_compact_multidict_is_read_only_mapping() -> None:
+    multidict = CompactMultidict([("a", [1, 2]), ("b", [3])])
+    assert "a" in multidict
+    assert "c" not in multidict
+    assert list(multidict) == ["a", "b"]
+    assert multidict.get("c") is None
+    assert multidict["a"] != {1, 2}
+    with pytest.raises(KeyError):
+        multidict["c"]
+    with pytest.raises(TypeError):
+        multidict["a"] = [3]  # type: ignore[index]
+    with pytest.raises(TypeError):
+        hash(multidict["a"])
@@ -0,0 +1,101 @@
+import threading
+import typing as t
+from collections import Counter
+
+import pytest
+from hypothesis import given
+from hypothesis import strategies as st
+
+from collectiondict import ConcurrentCollectiondict, collectiondict
+from tests import hypothesis_utils as hu
+
+
+def _run_one_after_another(
+    builder: ConcurrentCollectiondict[t.Any],
+    streams: list[list[tuple[int, int]]],
+) -> None:
+    def add_all(stream: list[tuple[int, int]]) -> None:
+        for key, val in stream:
+            builder.add(key, val)
+
+    # Even threads add their pairs one by one, odd ones in bulk.
+    for pos, stream in enumerate(streams):
+        target = builder.extend if pos % 2 else add_all
+        thread = threading.Thread(target=target, args=(stream,))
+        thread.start()
+        thread.join()
+
+
+@given(
+    streams=st.lists(hu.valid_streams(), max_size=4),
+    clct_t=hu.valid_collections() | hu.registered_collections(),
+)
+def test_freeze_equals_collectiondict_of_concatenated_streams(
+    streams: list[list[tuple[int, int]]], clct_t: t.Type[t.Any]
+) -> None:
+    builder = ConcurrentCollectiondict(clct_t)
+    _run_one_after_another(builder, streams)
+    expected = collectiondict(clct_t, [pair for stream in streams for pair in stream])
+    result = builder.freeze()
+    assert list(result.items()) == list(expected.items())
+    assert all(type(clct) is clct_t for clct in result.values())
+
+
+@given(
+    stream=hu.valid_streams(),
+    clct_t=hu.valid_collections() | hu.registered_collections(),
+)
+def test_add_and_extend_in_one_thread(
+    stream: list[tuple[int, int]], clct_t: t.Type[t.Any]
+) -> None:
+    builder = ConcurrentCollectiondict(clct_t)
+    half = len(stream) // 2
+    for key, val in stream[:half]:
+        builder.add(key, val)
+    builder.extend(stream[half:])
+    assert builder.freeze() == collectiondict(clct_t, stream)
+
+
+def test_concurrent_producers() -> None:
+    builder = ConcurrentCollectiondict(Counter)
+    nof_threads, nof_pairs = 8, 2000
+    barrier = threading.Barrier(nof_threads)
+
+    def produce(offset: int) -> None:
+        barrier.wait()
+        for n in range(nof_pairs):
+            builder.add(n % 7, offset)
+        builder.extend((n % 5, offset) for n in range(nof_pairs))
+
+    threads = [
+        threading.Thread(target=produce, args=(offset,))
+        for offset in range(nof_threads)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    stream = [
+        pair
+        for offset in range(nof_threads)
+        for pair in [(n % 7, offset) for n in range(nof_pairs)]
+        + [(n % 5, offset) for n in range(nof_pairs)]
+    ]
+    assert builder.freeze() == collectiondict(Counter, stream)
+
+
+def test_freeze_does_not_share_buffers() -> None:
+    builder = ConcurrentCollectiondict(list)
+    builder.add("a", 1)
+    first = builder.freeze()
+    builder.add("a", 2)
+    assert first == {"a": [1]}
+    assert builder.freeze() == {"a": [1, 2]}
+
+
+@given(invalid_clct=st.sampled_from([dict, str]))
+def test_concurrent_collectiondict_breaks_for_invalid_collections(
+    invalid_clct: t.Type[t.Any],
+) -> None:
+    with pytest.raises(AssertionError):
+        ConcurrentCollectiondict(invalid_clct)
@@ -0,0 +1,122 @@
+import typing as t
+from collections import Counter
+
+import pytest
+from hypothesis import given
+from hypothesis import strategies as st
+
+from collectiondict import (
+    HyperLogLog,
+    IntBitmap,
+    collectiondict,
+    deduplicate,
+    reverse_multimapping,
+)
+from tests import custom_classes as cc
+from tests import hypothesis_utils as hu
+
+texts = st.text(alphabet="ab", max_size=3)
+
+
+def _copied(text: str) -> str:
+    # Creates an equal string that is not identical to the original one.
+    return "".join(list(text))
+
+
+@given(stream=hu.valid_streams(), clct_t=hu.valid_collections())
+def test_deduplicate_keeps_contents(
+    stream: list[tuple[int, int]], clct_t: t.Type[t.Any]
+) -> None:
+    multidict = collectiondict(clct_t, stream)
+    result = deduplicate(clct_t, multidict)
+    assert result == multidict
+    assert all(type(clct) is clct_t for clct in result.values())
+
+
+@given(stream=st.lists(st.tuples(texts, texts)))
+def test_deduplicate_interns_keys_and_values(stream: list[tuple[str, str]]) -> None:
+    copied = [(_copied(key), _copied(val)) for key, val in stream]
+    result = deduplicate(list, collectiondict(list, stream + copied))
+    objects: dict[str, str] = {}
+    for key, values in result.items():
+        for obj in [key, *values]:
+            assert objects.setdefault(obj, obj) is obj
+
+
+@given(mapping=st.dictionaries(st.integers(), texts))
+@pytest.mark.parametrize("clct_t", [frozenset, tuple])
+def test_deduplicate_shares_equal_frozen_groups(
+    mapping: dict[int, str], clct_t: t.Type[t.Any]
+) -> None:
+    result = deduplicate(clct_t, reverse_multimapping(list, mapping))
+    groups: dict[t.Any, t.Any] = {}
+    for group in result.values():
+        assert groups.setdefault(group, group) is group
+
+
+def test_deduplicate_does_not_share_mutable_groups() -> None:
+    result = deduplicate(list, {"a": [1], "b": [1]})
+    assert result["a"] is not result["b"]
+
+
+def test_deduplicate_distinguishes_equal_objects_of_other_types() -> None:
+    result = deduplicate(tuple, {"a": (1,), "b": (1.0,), "c": (True,)})
+    assert [type(group[0]) for group in result.values()] == [int, float, bool]
+
+
+@pytest.mark.parametrize(
+    "multidict",
+    [
+        {"a": [0.0], "b": [-0.0]},
+        {"a": [1.0], "b": [1]},
+        {"a": ((1,),), "b": ((1.0,),)},
+        {"a": (frozenset({0.0}),), "b": (frozenset({-0.0}),)},
+        {"a": [float("nan")], "b": [float("nan")]},
+    ],
+)
+@pytest.mark.parametrize("clct_t", [list, tuple, frozenset])
+def test_deduplicate_keeps_distinguishable_values(
+    multidict: dict[str, t.Any], clct_t: t.Type[t.Any]
+) -> None:
+    result = deduplicate(clct_t, multidict)
+    for key, values in multidict.items():
+        assert list(map(repr, result[key])) == list(map(repr, values))
+        assert [type(val) for val in result[key]] == [type(val) for val in values]
+    assert result["a"] is not result["b"]
+
+
+def test_deduplicate_keeps_unhashable_values() -> None:
+    first, second = [1], [1]
+    result = deduplicate(tuple, {"a": (first,), "b": (second,)})
+    assert result["a"][0] is first
+    assert result["b"][0] is second
+
+
+def test_deduplicate_keeps_counts() -> None:
+    result = deduplicate(Counter, {"a": Counter("aab"), "b": Counter("b")})
+    assert result == {"a": Counter({"a": 2, "b": 1}), "b": Counter({"b": 1})}
+
+
+@given(stream=hu.valid_streams(), clct_t=st.sampled_from([IntBitmap, cc.MyDeque]))
+def test_deduplicate_supports_registered_collections(
+    stream: list[tuple[int, int]], clct_t: t.Type[t.Any]
+) -> None:
+    multidict = collectiondict(clct_t, stream)
+    result = deduplicate(clct_t, multidict)
+    assert result == multidict
+    assert all(type(clct) is clct_t for clct in result.values())
+
+
+def test_deduplicate_breaks_for_sketches() -> None:
+    # Sketches cannot be built again, since they do not keep their values.
+    sketch_t: t.Type[t.Any] = HyperLogLog
+    with pytest.raises(TypeError):
+        deduplicate(sketch_t, collectiondict(sketch_t, [("a", 1)]))
+
+
+@given(invalid_clct=st.sampled_from([dict, str]))
+def test_deduplicate_breaks_for_invalid_collections(
+    invalid_clct: t.Type[t.Any],
+) -> None:
+    with pytest.raises(AssertionError):
+        deduplicate(invalid_clct, {"a": "b"})
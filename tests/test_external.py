@@ -0,0 +1,88 @@
+import typing as t
+from collections import deque
+from pathlib import Path
+
+import pytest
+from hypothesis import given
+from hypothesis import strategies as st
+
+from collectiondict import collectiondict, external_collectiondict
+from tests import hypothesis_utils as hu
+
+
+@given(
+    clct_t=hu.valid_collections(),
+    stream=hu.valid_streams(),
+    max_buffered_pairs=st.integers(min_value=1, max_value=10),
+    nof_partitions=st.integers(min_value=1, max_value=4),
+)
+def test_external_collectiondict_equals_collectiondict(
+    clct_t: t.Type[t.Any],
+    stream: list[tuple[int, int]],
+    max_buffered_pairs: int,
+    nof_partitions: int,
+) -> None:
+    expected = collectiondict(clct_t, stream)
+    result = list(
+        external_collectiondict(
+            clct_t,
+            stream,
+            max_buffered_pairs=max_buffered_pairs,
+            nof_partitions=nof_partitions,
+        )
+    )
+    assert len(result) == len(expected)
+    assert dict(result) == expected
+    assert all(type(clct) is clct_t for _, clct in result)
+
+
+def test_external_collectiondict_keeps_order_of_small_streams() -> None:
+    stream = [(n % 5, n) for n in range(20)]
+    result = external_collectiondict(list, stream, max_buffered_pairs=len(stream) + 1)
+    assert list(result) == list(collectiondict(list, stream).items())
+
+
+@pytest.mark.parametrize("size", [1, 2, 20])
+def test_external_collectiondict_does_not_spill_streams_of_maximum_size(
+    tmp_path: Path, size: int
+) -> None:
+    stream = [(n % 5, n) for n in range(size)]
+    result = external_collectiondict(
+        list, stream, max_buffered_pairs=size, directory=tmp_path
+    )
+    assert next(result) == (0, [n for n in range(size) if n % 5 == 0])
+    assert not list(tmp_path.iterdir())
+    assert list(result) == list(collectiondict(list, stream).items())[1:]
+
+
+def test_external_collectiondict_removes_temporary_files(tmp_path: Path) -> None:
+    stream = [(n % 5, n) for n in range(20)]
+    result = external_collectiondict(
+        list, stream, max_buffered_pairs=3, directory=tmp_path
+    )
+    assert isinstance(result, t.Generator)
+    next(result)
+    assert list(tmp_path.iterdir())
+    result.close()
+    assert not list(tmp_path.iterdir())
+
+
+@pytest.mark.parametrize(
+    ("max_buffered_pairs", "nof_partitions"), [(0, 1), (1, 0), (-1, -1)]
+)
+def test_external_collectiondict_breaks_for_non_positive_sizes(
+    max_buffered_pairs: int, nof_partitions: int
+) -> None:
+    with pytest.raises(ValueError):
+        external_collectiondict(
+            list,
+            [(1, 1)],
+            max_buffered_pairs=max_buffered_pairs,
+            nof_partitions=nof_partitions,
+        )
+
+
+@given(invalid_clct=st.sampled_from([dict, deque]))
+def test_breaks_for_invalid_collections(invalid_clct: t.Type[t.Any]) -> None:
+    with pytest.raises(AssertionError):
+        external_collectiondict(invalid_clct, [])
@@ -0,0 +1,151 @@
+import csv
+import gzip
+import json
+import tempfile
+import typing as t
+from collections import Counter
+from pathlib import Path
+
+import pytest
+from hypothesis import given
+from hypothesis import strategies as st
+
+from collectiondict import (
+    GroupingStats,
+    IntBitmap,
+    collectiondict,
+    csv_collectiondict,
+    jsonl_collectiondict,
+)
+from tests import hypothesis_utils as hu
+
+# Older versions of the `csv` module reject NUL characters.
+texts = st.text(st.characters(codec="utf-8", exclude_characters="\0"))
+json_values = st.one_of(st.none(), st.booleans(), st.integers(), texts)
+modes = pytest.mark.parametrize("mode", ["plain", "gzip", "mmap"])
+
+
+def _write(path: Path, content: str, mode: str) -> None:
+    data = content.encode()
+    path.write_bytes(gzip.compress(data) if mode == "gzip" else data)
+
+
+def _csv(rows: list[list[t.Any]], delimiter: str = ",") -> str:
+    with tempfile.SpooledTemporaryFile(mode="w+", newline="") as fh:
+        csv.writer(fh, delimiter=delimiter).writerows(rows)
+        fh.seek(0)
+        return fh.read()
+
+
+@modes
+@given(pairs=st.lists(st.tuples(texts, texts)), clct_t=hu.valid_collections())
+def test_csv_collectiondict_equals_collectiondict(
+    mode: str, pairs: list[tuple[str, str]], clct_t: t.Type[t.Any]
+) -> None:
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir) / "pairs.csv"
+        _write(path, _csv([["value", "key"], *([v, k] for k, v in pairs)]), mode)
+        use_mmap = mode == "mmap"
+        by_index = csv_collectiondict(clct_t, path, 1, 0, use_mmap=use_mmap)
+        by_name = csv_collectiondict(
+            clct_t, path, "key", "value", header=True, use_mmap=use_mmap
+        )
+    expected = collectiondict(clct_t, pairs)
+    assert by_name == expected
+    assert by_index == collectiondict(clct_t, [("key", "value"), *pairs])
+
+
+@given(stream=hu.valid_streams())
+def test_csv_collectiondict_converts_values(stream: list[tuple[int, int]]) -> None:
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir) / "pairs.tsv"
+        path.write_text(_csv([[k, v] for k, v in stream], delimiter="\t"))
+        result = csv_collectiondict(
+            IntBitmap, path, 0, 1, delimiter="\t", value_type=int
+        )
+    expected = collectiondict(IntBitmap, [(str(k), v) for k, v in stream])
+    assert result == expected
+
+
+@modes
+@given(
+    documents=st.lists(st.fixed_dictionaries({"k": texts, "v": json_values})),
+    clct_t=st.sampled_from([list, tuple]),
+)
+def test_jsonl_collectiondict_equals_collectiondict(
+    mode: str, documents: list[dict[str, t.Any]], clct_t: t.Type[t.Any]
+) -> None:
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir) / "documents.jsonl"
+        _write(path, "".join(f"{json.dumps(doc)}\n\n" for doc in documents), mode)
+        result = jsonl_collectiondict(clct_t, path, "k", "v", use_mmap=mode == "mmap")
+    expected = collectiondict(clct_t, [(doc["k"], doc["v"]) for doc in documents])
+    assert result == expected
+
+
+def test_jsonl_collectiondict_for_arrays(tmp_path: Path) -> None:
+    path = tmp_path / "documents.jsonl"
+    path.write_text('[1, "a"]\n[2, "b"]\r\n[1, "c"]')
+    stats = GroupingStats()
+    result = jsonl_collectiondict(set, path, 0, 1, stats=stats)
+    assert result == {1: {"a", "c"}, 2: {"b"}}
+    assert (stats.nof_elements, stats.nof_keys) == (3, 2)
+
+
+@modes
+def test_reading_empty_files(tmp_path: Path, mode: str) -> None:
+    path = tmp_path / "empty.csv"
+    _write(path, "", mode)
+    use_mmap = mode == "mmap"
+    assert csv_collectiondict(list, path, 0, 1, use_mmap=use_mmap) == {}
+    assert csv_collectiondict(list, path, 0, 1, header=True, use_mmap=use_mmap) == {}
+    assert jsonl_collectiondict(list, path, 0, 1, use_mmap=use_mmap) == {}
+
+
+def test_mapping_large_files_equals_reading_them(tmp_path: Path) -> None:
+    # Mapped files are decoded in chunks of 1 MiB, which end at line breaks.
+    path = tmp_path / "pairs.csv"
+    numbers = range(300_000)
+    path.write_text("".join(f'{n % 7},"{n}\r\n{n}"\r\n' for n in numbers))
+    mapped = csv_collectiondict(Counter, path, 0, 1, use_mmap=True)
+    assert mapped == csv_collectiondict(Counter, path, 0, 1)
+    assert sum(map(len, mapped.values())) == len(numbers)
+
+
+def test_csv_collectiondict_breaks_for_names_without_header(tmp_path: Path) -> None:
+    path = tmp_path / "pairs.csv"
+    path.write_text("key,value\na,1\n")
+    with pytest.raises(ValueError):
+        csv_collectiondict(list, path, "key", 1)
+
+
+def test_csv_collectiondict_breaks_for_unknown_names(tmp_path: Path) -> None:
+    path = tmp_path / "pairs.csv"
+    path.write_text("key,value\na,1\n")
+    with pytest.raises(ValueError):
+        csv_collectiondict(list, path, "key", "other", header=True)
+
+
+@pytest.mark.parametrize("use_mmap", [False, True])
+def test_csv_collectiondict_skips_blank_lines(tmp_path: Path, use_mmap: bool) -> None:
+    path = tmp_path / "pairs.csv"
+    path.write_text("a,1\n\nb,2\n\n")
+    result = csv_collectiondict(list, path, 0, 1, use_mmap=use_mmap)
+    assert result == {"a": ["1"], "b": ["2"]}
+
+
+@pytest.mark.parametrize(("key", "value"), [(0, 1), (1, 0), (0, 2)])
+def test_csv_collectiondict_breaks_for_short_rows(
+    tmp_path: Path, key: int, value: int
+) -> None:
+    path = tmp_path / "pairs.csv"
+    path.write_text("key,value,other\na,1,x\n\nb\nc,3,y\n")
+    with pytest.raises(ValueError, match="Line 4"):
+        csv_collectiondict(list, path, key, value, header=True)
+
+
+def test_mapping_compressed_files_breaks(tmp_path: Path) -> None:
+    path = tmp_path / "pairs.csv.gz"
+    _write(path, "a,1\n", "gzip")
+    with pytest.raises(ValueError):
+        csv_collectiondict(list, path, 0, 1, use_mmap=True)
@@ -0,0 +1,181 @@
+import os
+import struct
+import subprocess
+import sys
+import tempfile
+import typing as t
+from collections import Counter
+from pathlib import Path
+
+import pytest
+from hypothesis import given
+from hypothesis import strategies as st
+
+from collectiondict import (
+    MappedMultidict,
+    collectiondict,
+    reverse_multimapping,
+    save_mapped_collectiondict,
+)
+from tests import hypothesis_utils as hu
+
+mixed = st.one_of(
+    st.integers(), st.floats(allow_nan=False), st.text(max_size=3), st.booleans()
+)
+
+
+def _check_mapped(clct_t: t.Type[t.Any], multidict: dict[t.Any, t.Any]) -> None:
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir) / "groups.bin"
+        save_mapped_collectiondict(clct_t, multidict, path)
+        with MappedMultidict(clct_t, path) as mapped:
+            assert len(mapped) == len(multidict)
+            assert list(mapped) == list(multidict)
+            assert dict(mapped) == multidict
+            assert all(type(mapped[key]) is clct_t for key in multidict)
+
+
+@given(stream=hu.valid_streams(), clct_t=hu.valid_collections())
+def test_mapped_multidict_equals_multidict(
+    stream: list[tuple[int, int]], clct_t: t.Type[t.Any]
+) -> None:
+    _check_mapped(clct_t, collectiondict(clct_t, stream))
+
+
+@given(stream=st.lists(st.tuples(mixed, mixed)), clct_t=hu.valid_collections())
+def test_mapped_multidict_of_mixed_types(
+    stream: list[tuple[t.Any, t.Any]], clct_t: t.Type[t.Any]
+) -> None:
+    _check_mapped(clct_t, collectiondict(clct_t, stream))
+
+
+@given(
+    multidict=st.dictionaries(
+        st.text(max_size=3), st.lists(st.floats(allow_nan=False), min_size=1)
+    )
+)
+def test_mapped_multidict_of_floats(multidict: dict[str, list[float]]) -> None:
+    _check_mapped(list, multidict)
+
+
+@given(mapping=st.dictionaries(st.integers(), st.text(max_size=3)))
+def test_mapped_reverse_index(mapping: dict[int, str]) -> None:
+    _check_mapped(frozenset, reverse_multimapping(frozenset, mapping))
+
+
+@given(keys=st.sets(st.integers()), missing=st.integers())
+def test_mapped_multidict_misses_unknown_keys(keys: set[int], missing: int) -> None:
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir) / "groups.bin"
+        save_mapped_collectiondict(list, {key: [key] for key in keys}, path)
+        with MappedMultidict(list, path) as mapped:
+            assert (missing in mapped) is (missing in keys)
+            assert mapped.get(missing) == ([missing] if missing in keys else None)
+
+
+def _run_with_hash_seed(code: str, seed: int) -> str:
+    env = {**os.environ, "PYTHONHASHSEED": str(seed)}
+    return subprocess.run(
+        [sys.executable, "-c", code], env=env, capture_output=True, check=True
+    ).stdout.decode()
+
+
+def test_mapped_multidict_does_not_depend_on_hash_seed(tmp_path: Path) -> None:
+    path = tmp_path / "groups.bin"
+    keys = "[frozenset({'alpha', 'beta', 'gamma'}), ('x', frozenset('abcdefgh'))]"
+    imports = "from collectiondict import MappedMultidict, save_mapped_collectiondict\n"
+    save = (
+        f"save_mapped_collectiondict(list, {{k: [1] for k in {keys}}}, {str(path)!r})"
+    )
+    _run_with_hash_seed(imports + save, seed=1)
+    load = (
+        f"with MappedMultidict(list, {str(path)!r}) as mapped:\n"
+        f"    print([key in mapped for key in {keys}], len(mapped))"
+    )
+    for seed in (2, 3):
+        assert _run_with_hash_seed(imports + load, seed) == "[True, True] 2\n"
+
+
+def test_mapped_multidict_finds_equal_keys(tmp_path: Path) -> None:
+    path = tmp_path / "groups.bin"
+    multidict = {1: ["int"], (2.5, "a"): ["tuple"], frozenset({0, 3}): ["frozenset"]}
+    save_mapped_collectiondict(list, multidict, path)
+    with MappedMultidict(list, path) as mapped:
+        assert mapped[1.0] == mapped[True] == ["int"]
+        assert mapped[(2.5, "a")] == ["tuple"]
+        assert mapped[frozenset({False, 3.0})] == ["frozenset"]
+        assert object() not in mapped
+        assert mapped.get(1j) is None
+
+
+@pytest.mark.parametrize("key", [object(), (1, object()), 1j])
+def test_save_mapped_breaks_for_keys_without_stable_hash(
+    tmp_path: Path, key: t.Hashable
+) -> None:
+    path = tmp_path / "groups.bin"
+    with pytest.raises(TypeError):
+        save_mapped_collectiondict(list, {key: [1]}, path)
+    assert not path.exists()
+
+
+def test_mapped_multidict_breaks_for_missing_key(tmp_path: Path) -> None:
+    path = tmp_path / "groups.bin"
+    save_mapped_collectiondict(Counter, {"a": Counter("ab")}, path)
+    with MappedMultidict(Counter, path) as mapped:
+        assert mapped["a"] == Counter("ab")
+        with pytest.raises(KeyError):
+            mapped["b"]
+
+
+def test_mapped_multidict_repr(tmp_path: Path) -> None:
+    path = tmp_path / "groups.bin"
+    save_mapped_collectiondict(set, {"a": {1}, "b": {2}}, path)
+    mapped = MappedMultidict(set, path)
+    assert repr(mapped) == "MappedMultidict(set, 2 keys)"
+    mapped.close()
+
+
+def test_mapped_multidict_breaks_for_other_collection_type(tmp_path: Path) -> None:
+    path = tmp_path / "groups.bin"
+    save_mapped_collectiondict(set, {1: {2}}, path)
+    with pytest.raises(ValueError):
+        MappedMultidict(list, path)
+
+
+@pytest.mark.parametrize("clct_code", [5, 255])
+def test_mapped_multidict_breaks_for_unknown_collection_type(
+    tmp_path: Path, clct_code: int
+) -> None:
+    path = tmp_path / "groups.bin"
+    save_mapped_collectiondict(list, {1: [2]}, path)
+    data = path.read_bytes()
+    path.write_bytes(data[:10] + struct.pack("<B", clct_code) + data[11:])
+    with pytest.raises(ValueError, match="unknown"):
+        MappedMultidict(list, path)
+
+
+@pytest.mark.parametrize(
+    "content", [b"", b"CLCTMMA", b"NOTAMMAP" + bytes(24), b"CLCTMMAP\x02" + bytes(23)]
+)
+def test_mapped_multidict_breaks_for_other_files(
+    tmp_path: Path, content: bytes
+) -> None:
+    path = tmp_path / "groups.bin"
+    path.write_bytes(content)
+    with pytest.raises(ValueError):
+        MappedMultidict(list, path)
+
+
+def test_mapped_multidict_header_is_versioned(tmp_path: Path) -> None:
+    path = tmp_path / "groups.bin"
+    save_mapped_collectiondict(tuple, {"a": (1, 2)}, path)
+    magic, version = struct.unpack_from("<8sH", path.read_bytes())
+    assert (magic, version) == (b"CLCTMMAP", 1)
+
+
+@given(invalid_clct=st.sampled_from([dict, str]) | hu.registered_collections())
+def test_save_mapped_breaks_for_invalid_collections(
+    invalid_clct: t.Type[t.Any],
+) -> None:
+    with pytest.raises(AssertionError):
+        save_mapped_collectiondict(invalid_clct, {"a": "b"}, "unused.bin")
@@ -0,0 +1,74 @@
+import typing as t
+from collections import Counter, deque
+
+import pytest
+from hypothesis import given
+from hypothesis import strategies as st
+
+from collectiondict import collectiondict, merge_collectiondicts
+from tests import hypothesis_utils as hu
+
+_KeyT = t.TypeVar("_KeyT", bound=t.Hashable)
+_ValueT = t.TypeVar("_ValueT")
+
+
+@given(
+    clct_t=hu.valid_collections(),
+    streams=st.lists(hu.valid_streams()),
+)
+def test_merging_equals_collecting_concatenated_streams(
+    clct_t: t.Type[t.Any], streams: list[list[tuple[_KeyT, _ValueT]]]
+) -> None:
+    partials = [collectiondict(clct_t, stream) for stream in streams]
+    concatenated = [pair for stream in streams for pair in stream]
+    expected = collectiondict(clct_t, concatenated)
+    result = merge_collectiondicts(clct_t, partials)
+    assert list(result.items()) == list(expected.items())
+    assert all(type(clct) is clct_t for clct in result.values())
+
+
+@given(
+    clct_t=hu.valid_collections(),
+    streams=st.lists(hu.valid_streams(), min_size=3, max_size=3),
+)
+def test_merging_is_associative(
+    clct_t: t.Type[t.Any], streams: list[list[tuple[_KeyT, _ValueT]]]
+) -> None:
+    first, second, third = (collectiondict(clct_t, stream) for stream in streams)
+    left = merge_collectiondicts(
+        clct_t, [merge_collectiondicts(clct_t, [first, second]), third]
+    )
+    right = merge_collectiondicts(
+        clct_t, [first, merge_collectiondicts(clct_t, [second, third])]
+    )
+    assert left == right
+
+
+@given(
+    clct_t=hu.valid_collections(),
+    streams=st.lists(hu.valid_streams(), min_size=1),
+)
+def test_merging_does_not_modify_inputs(
+    clct_t: t.Type[t.Any], streams: list[list[tuple[_KeyT, _ValueT]]]
+) -> None:
+    partials = [collectiondict(clct_t, stream) for stream in streams]
+    copies = [collectiondict(clct_t, stream) for stream in streams]
+    result = merge_collectiondicts(clct_t, partials)
+    for clct in result.values():
+        if isinstance(clct, Counter):
+            clct[object()] += 1
+        elif isinstance(clct, list):
+            clct.append(object())
+        elif isinstance(clct, set):
+            clct.add(object())
+    assert partials == copies
+
+
+def test_merging_nothing_gives_empty_dict() -> None:
+    assert merge_collectiondicts(list, []) == {}
+
+
+@given(invalid_clct=st.sampled_from([dict, deque]))
+def test_breaks_for_invalid_collections(invalid_clct: t.Type[t.Any]) -> None:
+    with pytest.raises(AssertionError):
+        merge_collectiondicts(invalid_clct, [{1: invalid_clct()}])
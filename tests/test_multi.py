@@ -0,0 +1,69 @@
+import typing as t
+from collections import Counter
+from operator import itemgetter
+
+import pytest
+from hypothesis import given, settings
+from hypothesis import strategies as st
+
+from collectiondict import (
+    HyperLogLog,
+    IntBitmap,
+    collectiondict,
+    multi_collectiondict,
+)
+from tests import hypothesis_utils as hu
+
+_KeyT = t.TypeVar("_KeyT", bound=t.Hashable)
+_ValueT = t.TypeVar("_ValueT")
+
+
+@given(
+    clcts=st.lists(hu.valid_collections(), min_size=1, max_size=4),
+    stream=hu.valid_streams(),
+)
+def test_multi_collectiondict(
+    clcts: list[t.Type[t.Any]], stream: list[tuple[_KeyT, _ValueT]]
+) -> None:
+    results = multi_collectiondict(clcts, iter(stream))
+    assert len(results) == len(clcts)
+    for clct_t, result in zip(clcts, results):
+        expected = collectiondict(clct_t, stream)
+        assert list(result.items()) == list(expected.items())
+        assert all(type(clct) is clct_t for clct in result.values())
+
+
+@settings(deadline=None, max_examples=10)
+@given(stream=st.lists(st.tuples(st.integers(0, 9), st.integers(0, 99)), max_size=5))
+def test_multi_collectiondict_spans_chunks(stream: list[tuple[int, int]]) -> None:
+    # Repeating the stream makes it longer than one chunk.
+    long_stream = stream * 20000
+    lists, bitmaps, sketches = multi_collectiondict(
+        (list, IntBitmap, HyperLogLog), long_stream
+    )
+    assert lists == collectiondict(list, long_stream)
+    assert bitmaps == collectiondict(IntBitmap, long_stream)
+    assert sketches == collectiondict(HyperLogLog, long_stream)
+
+
+@given(records=st.lists(st.tuples(st.integers(), st.text(), st.integers())))
+def test_multi_collectiondict_with_extractors(
+    records: list[tuple[int, str, int]],
+) -> None:
+    pairs = [(first, third) for first, _, third in records]
+    result = multi_collectiondict(
+        [set, Counter], records, key=itemgetter(0), value=itemgetter(2)
+    )
+    assert result == multi_collectiondict((set, Counter), pairs)
+
+
+def test_multi_collectiondict_without_collections() -> None:
+    assert multi_collectiondict([], [(1, 2)]) == ()
+
+
+@pytest.mark.parametrize("invalid_clct", [dict, list[int]])
+def test_multi_collectiondict_breaks_for_invalid_collections(
+    invalid_clct: t.Any,
+) -> None:
+    with pytest.raises(AssertionError):
+        multi_collectiondict([list, invalid_clct], [(1, 2)])
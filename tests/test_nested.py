@@ -0,0 +1,119 @@
+import typing as t
+from collections import Counter
+from operator import itemgetter
+
+import pytest
+from hypothesis import given
+from hypothesis import strategies as st
+
+from collectiondict import (
+    GroupingStats,
+    IntBitmap,
+    TopK,
+    collectiondict,
+    nested_collectiondict,
+)
+from tests import hypothesis_utils as hu
+
+_ValueT = t.TypeVar("_ValueT")
+
+composite_keys = st.tuples(st.integers(0, 3), st.booleans(), st.sampled_from("ab"))
+records = st.lists(st.tuples(st.integers(0, 3), st.booleans(), st.integers()))
+
+
+def _naive_nested(
+    clct_t: t.Type[t.Any], stream: list[tuple[tuple[t.Any, ...], _ValueT]]
+) -> dict[t.Any, t.Any]:
+    # Group by the first part of the key and recurse, i.e. walk the stream once
+    # per level.
+    if not stream or len(stream[0][0]) == 1:
+        return collectiondict(clct_t, [(key[0], val) for key, val in stream])
+    by_first = collectiondict(list, [(key[0], (key[1:], val)) for key, val in stream])
+    return {key: _naive_nested(clct_t, pairs) for key, pairs in by_first.items()}
+
+
+@given(
+    clct_t=hu.valid_collections(),
+    stream=st.lists(st.tuples(composite_keys, st.integers())),
+)
+def test_nested_collectiondict(
+    clct_t: t.Type[t.Any], stream: list[tuple[tuple[t.Any, ...], int]]
+) -> None:
+    assert nested_collectiondict(clct_t, stream) == _naive_nested(clct_t, stream)
+
+
+@given(
+    clct_t=hu.valid_collections(),
+    stream=st.lists(st.tuples(composite_keys, st.integers())),
+)
+def test_flat_nested_collectiondict(
+    clct_t: t.Type[t.Any], stream: list[tuple[tuple[t.Any, ...], int]]
+) -> None:
+    result = nested_collectiondict(clct_t, stream, flat=True)
+    assert list(result.items()) == list(collectiondict(clct_t, stream).items())
+
+
+@given(clct_t=hu.valid_collections(), stream=records)
+def test_nested_collectiondict_with_extractors(
+    clct_t: t.Type[t.Any], stream: list[tuple[int, bool, int]]
+) -> None:
+    pairs = [((first, second), val) for first, second, val in stream]
+    result = nested_collectiondict(
+        clct_t, stream, keys=[itemgetter(0), itemgetter(1)], value=itemgetter(2)
+    )
+    assert result == nested_collectiondict(clct_t, pairs)
+
+
+@given(stream=st.lists(st.tuples(st.tuples(st.integers(0, 3)), st.integers(0))))
+def test_nested_collectiondict_supports_all_collections(
+    stream: list[tuple[tuple[int], int]],
+) -> None:
+    # Keys with a single part give the result of `collectiondict`.
+    stats = GroupingStats()
+    result = nested_collectiondict(IntBitmap, stream, stats=stats)
+    expected = collectiondict(IntBitmap, [(key, val) for (key,), val in stream])
+    assert result == expected
+    assert stats.nof_elements == len(stream)
+    top = nested_collectiondict(TopK(2), stream)
+    assert top == collectiondict(TopK(2), [(key, val) for (key,), val in stream])
+
+
+def test_nested_collectiondict_moves_groups() -> None:
+    flat = nested_collectiondict(Counter, [((1, 2), "a")], flat=True)
+    nested = nested_collectiondict(Counter, [((1, 2), "a")])
+    assert flat == {(1, 2): Counter("a")}
+    assert nested == {1: {2: Counter("a")}}
+
+
+@pytest.mark.parametrize(
+    "stream",
+    [
+        [((1, 2), "a"), ((1,), "b")],
+        [((1,), "a"), ((1, 2), "b")],
+        [((), "a")],
+        [((1,), "a"), ("cd", "b")],
+        [("ab", 1), ("cd", 2)],
+        [(1, 1)],
+    ],
+)
+@pytest.mark.parametrize("flat", [False, True])
+def test_nested_collectiondict_breaks_for_inconsistent_keys(
+    stream: list[tuple[t.Any, t.Any]], flat: bool
+) -> None:
+    with pytest.raises(ValueError):
+        nested_collectiondict(list, stream, flat=flat)
+
+
+@pytest.mark.parametrize(
+    "extractors",
+    [
+        {"keys": [itemgetter(0)]},
+        {"value": itemgetter(1)},
+        {"keys": [], "value": itemgetter(1)},
+    ],
+)
+def test_nested_collectiondict_breaks_for_invalid_extractors(
+    extractors: dict[str, t.Any],
+) -> None:
+    with pytest.raises(ValueError):
+        nested_collectiondict(list, [(1, 2)], **extractors)
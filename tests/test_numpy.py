@@ -0,0 +1,72 @@
+import typing as t
+from collections import deque
+
+import pytest
+from hypothesis import given
+from hypothesis import strategies as st
+
+from collectiondict import collectiondict, group_arrays
+from tests import hypothesis_utils as hu
+
+np = pytest.importorskip("numpy")
+
+
+def int64s() -> st.SearchStrategy[int]:
+    return st.integers(min_value=-(2**63), max_value=2**63 - 1)
+
+
+@given(
+    clct_t=hu.valid_collections(),
+    stream=st.lists(st.tuples(int64s(), int64s())),
+)
+def test_group_arrays_equals_collectiondict(
+    clct_t: t.Type[t.Any], stream: list[tuple[int, int]]
+) -> None:
+    keys = np.array([key for key, _ in stream], dtype=np.int64)
+    values = np.array([val for _, val in stream], dtype=np.int64)
+    expected = collectiondict(clct_t, stream)
+    result = group_arrays(clct_t, keys, values)
+    assert result == expected
+    assert list(result) == sorted(expected)
+    assert all(type(clct) is clct_t for clct in result.values())
+
+
+@given(
+    clct_t=hu.registered_collections(),
+    stream=st.lists(st.tuples(int64s(), st.integers(min_value=0, max_value=2**16))),
+)
+def test_group_arrays_supports_registered_collections(
+    clct_t: t.Type[t.Any], stream: list[tuple[int, int]]
+) -> None:
+    keys = np.array([key for key, _ in stream], dtype=np.int64)
+    values = np.array([val for _, val in stream], dtype=np.int64)
+    expected = collectiondict(clct_t, sorted(stream, key=lambda pair: pair[0]))
+    result = group_arrays(clct_t, keys, values)
+    assert list(result.items()) == list(expected.items())
+
+
+@given(stream=st.lists(st.tuples(int64s(), st.floats(allow_nan=False))))
+def test_group_arrays_returns_read_only_views(
+    stream: list[tuple[int, float]],
+) -> None:
+    keys = np.array([key for key, _ in stream], dtype=np.int64)
+    values = np.array([val for _, val in stream], dtype=np.float64)
+    expected = collectiondict(list, stream)
+    result = group_arrays(None, keys, values)
+    assert {key: arr.tolist() for key, arr in result.items()} == expected
+    for arr in result.values():
+        assert arr.dtype == np.float64
+        assert not arr.flags.writeable
+
+
+def test_group_arrays_breaks_for_arrays_of_unequal_shape() -> None:
+    with pytest.raises(ValueError):
+        group_arrays(None, np.arange(3), np.arange(4))
+    with pytest.raises(ValueError):
+        group_arrays(list, np.zeros((2, 2)), np.zeros((2, 2)))
+
+
+@given(invalid_clct=st.sampled_from([dict, deque]))
+def test_breaks_for_invalid_collections(invalid_clct: t.Type[t.Any]) -> None:
+    with pytest.raises(AssertionError):
+        group_arrays(invalid_clct, np.arange(3), np.arange(3))
@@ -0,0 +1,62 @@
+import typing as t
+from collections import deque
+
+import pytest
+from hypothesis import given, settings
+from hypothesis import strategies as st
+
+from collectiondict import collectiondict, parallel_collectiondict, split_into_shards
+from tests import hypothesis_utils as hu
+
+_KeyT = t.TypeVar("_KeyT", bound=t.Hashable)
+_ValueT = t.TypeVar("_ValueT")
+
+
+# Starting process pools is expensive. Therefore, fewer examples are generated.
+@settings(max_examples=10, deadline=None)
+@given(
+    clct_t=hu.valid_collections(),
+    shards=st.lists(hu.valid_streams(), max_size=5),
+)
+def test_parallel_collectiondict_equals_collectiondict(
+    clct_t: t.Type[t.Any], shards: list[list[tuple[_KeyT, _ValueT]]]
+) -> None:
+    expected = collectiondict(clct_t, [pair for shard in shards for pair in shard])
+    result = parallel_collectiondict(clct_t, shards, max_workers=2)
+    assert list(result.items()) == list(expected.items())
+    assert all(type(clct) is clct_t for clct in result.values())
+
+
+def test_parallel_collectiondict_with_more_shards_than_pending() -> None:
+    stream = [(n % 7, n) for n in range(100)]
+    shards = split_into_shards(stream, 3)
+    result = parallel_collectiondict(list, shards, max_workers=1)
+    assert result == collectiondict(list, stream)
+
+
+@given(stream=hu.valid_streams(), size=st.integers(min_value=1, max_value=10))
+def test_split_into_shards(stream: list[tuple[int, int]], size: int) -> None:
+    shards = list(split_into_shards(iter(stream), size))
+    assert [pair for shard in shards for pair in shard] == stream
+    assert all(1 <= len(shard) <= size for shard in shards)
+    assert all(len(shard) == size for shard in shards[:-1])
+
+
+@given(size=st.integers(max_value=0))
+def test_split_into_shards_breaks_for_non_positive_size(size: int) -> None:
+    with pytest.raises(ValueError):
+        next(split_into_shards([(1, 1)], size))
+
+
+@given(max_workers=st.integers(max_value=0))
+def test_parallel_collectiondict_breaks_for_non_positive_workers(
+    max_workers: int,
+) -> None:
+    with pytest.raises(ValueError):
+        parallel_collectiondict(list, [[(1, 1)]], max_workers=max_workers)
+
+
+def test_parallel_collectiondict_breaks_for_invalid_collections() -> None:
+    invalid_clct: t.Type[t.Any] = deque
+    with pytest.raises(AssertionError):
+        parallel_collectiondict(invalid_clct, [[(1, 1)]], max_workers=1)
@@ -0,0 +1,113 @@
+import gc
+import struct
+import tempfile
+import typing as t
+from collections import Counter
+from pathlib import Path
+
+import pytest
+from hypothesis import given
+from hypothesis import strategies as st
+
+from collectiondict import collectiondict, load_collectiondict, save_collectiondict
+from tests import hypothesis_utils as hu
+
+mixed = st.one_of(
+    st.integers(), st.floats(allow_nan=False), st.text(max_size=3), st.booleans()
+)
+
+
+def _round_trip(clct_t: t.Type[t.Any], multidict: dict[t.Any, t.Any]) -> t.Any:
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir) / "groups.bin"
+        save_collectiondict(clct_t, multidict, path)
+        return load_collectiondict(clct_t, path)
+
+
+@given(stream=hu.valid_streams(), clct_t=hu.valid_collections())
+def test_round_trip_of_ints(
+    stream: list[tuple[int, int]], clct_t: t.Type[t.Any]
+) -> None:
+    multidict = collectiondict(clct_t, stream)
+    result = _round_trip(clct_t, multidict)
+    assert result == multidict
+    assert list(result) == list(multidict)
+    assert all(type(clct) is clct_t for clct in result.values())
+
+
+@given(stream=st.lists(st.tuples(mixed, mixed)), clct_t=hu.valid_collections())
+def test_round_trip_keeps_types_of_values(
+    stream: list[tuple[t.Any, t.Any]], clct_t: t.Type[t.Any]
+) -> None:
+    multidict = collectiondict(clct_t, stream)
+    result = _round_trip(clct_t, multidict)
+    assert result == multidict
+    assert sorted(map(repr, result)) == sorted(map(repr, multidict))
+    for key, values in multidict.items():
+        assert sorted(map(repr, result[key])) == sorted(map(repr, values))
+
+
+@given(values=st.lists(st.floats(allow_nan=False), min_size=1))
+def test_round_trip_of_floats(values: list[float]) -> None:
+    multidict = {0.5: values}
+    assert _round_trip(list, multidict) == multidict
+
+
+def test_round_trip_of_large_counts() -> None:
+    multidict = {2**40: Counter({2**62: 3, -(2**63): 2**40})}
+    assert _round_trip(Counter, multidict) == multidict
+
+
+def test_load_breaks_for_other_collection_type(tmp_path: Path) -> None:
+    path = tmp_path / "groups.bin"
+    save_collectiondict(set, {1: {2}}, path)
+    with pytest.raises(ValueError):
+        load_collectiondict(list, path)
+
+
+@pytest.mark.parametrize("clct_code", [5, 255])
+def test_load_breaks_for_unknown_collection_type(
+    tmp_path: Path, clct_code: int
+) -> None:
+    path = tmp_path / "groups.bin"
+    save_collectiondict(list, {1: [2]}, path)
+    data = path.read_bytes()
+    path.write_bytes(data[:10] + struct.pack("<B", clct_code) + data[11:])
+    with pytest.raises(ValueError, match="unknown"):
+        load_collectiondict(list, path)
+
+
+@pytest.mark.parametrize("content", [b"", b"CLCTDIC", b"NOTADICT\x01\x00\x01"])
+def test_load_breaks_for_other_files(tmp_path: Path, content: bytes) -> None:
+    path = tmp_path / "groups.bin"
+    path.write_bytes(content)
+    with pytest.raises(ValueError):
+        load_collectiondict(list, path)
+
+
+def test_load_breaks_for_newer_versions(tmp_path: Path) -> None:
+    path = tmp_path / "groups.bin"
+    save_collectiondict(list, {1: [2]}, path)
+    data = path.read_bytes()
+    path.write_bytes(data[:8] + struct.pack("<H", 2) + data[10:])
+    with pytest.raises(ValueError):
+        load_collectiondict(list, path)
+
+
+@given(invalid_clct=st.sampled_from([dict, str]) | hu.registered_collections())
+def test_save_breaks_for_invalid_collections(invalid_clct: t.Type[t.Any]) -> None:
+    with pytest.raises(AssertionError):
+        save_collectiondict(invalid_clct, {"a": "b"}, "unused.bin")
+
+
+@pytest.mark.parametrize("enabled", [True, False])
+def test_load_restores_garbage_collector(tmp_path: Path, enabled: bool) -> None:
+    path = tmp_path / "groups.bin"
+    save_collectiondict(list, {1: [2]}, path)
+    was_enabled = gc.isenabled()
+    (gc.enable if enabled else gc.disable)()
+    try:
+        load_collectiondict(list, path)
+        assert gc.isenabled() is enabled
+    finally:
+        (gc.enable if was_enabled else gc.disable)()
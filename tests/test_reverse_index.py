@@ -0,0 +1,156 @@
+import typing as t
+from collections import deque
+
+import pytest
+from hypothesis import given
+from hypothesis import strategies as st
+
+from collectiondict import (
+    HyperLogLog,
+    IntBitmap,
+    MultiReverseIndex,
+    ReverseIndex,
+    reverse_mapping,
+    reverse_multimapping,
+)
+from tests import hypothesis_utils as hu
+
+# Every operation is a key and either a value to assign or `None` to delete
+# the key.
+keys = st.integers(min_value=0, max_value=10)
+mapping_operations = st.lists(st.tuples(keys, st.none() | st.integers(0, 5)))
+multimapping_operations = st.lists(
+    st.tuples(keys, st.none() | st.lists(st.integers(0, 5)))
+)
+
+
+def _apply(
+    index: t.MutableMapping[int, t.Any],
+    reference: dict[int, t.Any],
+    operations: list[tuple[int, t.Any]],
+) -> None:
+    for key, value in operations:
+        # Assigning a key moves it to the end of the reference as well.
+        reference.pop(key, None)
+        if value is None:
+            index.pop(key, None)
+        else:
+            index[key] = value
+            reference[key] = value
+
+
+@given(
+    clct_t=hu.valid_collections(),
+    initial=st.dictionaries(keys, st.integers(0, 5)),
+    operations=mapping_operations,
+)
+def test_reverse_index_equals_reverse_mapping(
+    clct_t: t.Type[t.Any],
+    initial: dict[int, int],
+    operations: list[tuple[int, t.Optional[int]]],
+) -> None:
+    index = ReverseIndex(clct_t, initial)
+    reference = dict(initial)
+    _apply(index, reference, operations)
+    assert dict(index) == reference
+    assert list(index) == list(reference)
+    expected = reverse_mapping(clct_t, reference)
+    assert dict(index.reversed) == expected
+    assert all(type(clct) is clct_t for clct in index.reversed.values())
+
+
+@given(
+    clct_t=hu.valid_collections(),
+    initial=st.dictionaries(keys, st.lists(st.integers(0, 5))),
+    operations=multimapping_operations,
+)
+def test_multi_reverse_index_equals_reverse_multimapping(
+    clct_t: t.Type[t.Any],
+    initial: dict[int, list[int]],
+    operations: list[tuple[int, t.Optional[list[int]]]],
+) -> None:
+    index = MultiReverseIndex(clct_t, initial)
+    reference = dict(initial)
+    _apply(index, reference, operations)
+    assert dict(index) == reference
+    expected = reverse_multimapping(clct_t, reference)
+    assert dict(index.reversed) == expected
+    assert len(index.reversed) == len(expected)
+    assert all(value in index.reversed for value in expected)
+
+
+@given(
+    clct_t=hu.valid_collections(),
+    initial=st.dictionaries(keys, st.lists(st.integers(0, 5))),
+    operations=multimapping_operations,
+)
+def test_reversed_view_follows_every_change(
+    clct_t: t.Type[t.Any],
+    initial: dict[int, list[int]],
+    operations: list[tuple[int, t.Optional[list[int]]]],
+) -> None:
+    # Looking up all collections after every change caches them. Thus, the
+    # next change has to update or discard them.
+    index = MultiReverseIndex(clct_t, initial)
+    reference = dict(initial)
+    for operation in operations:
+        _apply(index, reference, [operation])
+        assert dict(index.reversed) == reverse_multimapping(clct_t, reference)
+
+
+def test_reversed_view_updates_mutable_collections_in_place() -> None:
+    index = MultiReverseIndex(list, {1: "aa", 2: "ab"})
+    first = index.reversed["a"]
+    index[3] = "ca"
+    index[1] = "a"
+    assert index.reversed["a"] is first
+    assert first == [2, 3, 1]
+    del index[2]
+    assert index.reversed["a"] is first
+    assert first == [3, 1]
+
+
+def test_reverse_index_is_unchanged_by_invalid_values() -> None:
+    index = MultiReverseIndex(set, {1: "ab"})
+    reversed_ = dict(index.reversed)
+    unhashable: t.Any = ["c", []]
+    with pytest.raises(TypeError):
+        index[1] = unhashable
+    assert dict(index) == {1: "ab"}
+    assert dict(index.reversed) == reversed_
+
+
+def test_reversed_view_keeps_collections_until_they_change() -> None:
+    index = ReverseIndex(frozenset, {1: "a", 2: "b"})
+    first = index.reversed["a"]
+    assert index.reversed["a"] is first
+    index[3] = "a"
+    assert index.reversed["a"] == {1, 3}
+    assert index.reversed["b"] == {2}
+    del index[1]
+    assert index.reversed["a"] == {3}
+    with pytest.raises(KeyError):
+        index.reversed["c"]
+
+
+@given(initial=st.dictionaries(keys, st.lists(st.integers(0, 5))))
+def test_reverse_index_supports_registered_collections(
+    initial: dict[int, list[int]],
+) -> None:
+    bitmaps = MultiReverseIndex(IntBitmap, initial)
+    assert dict(bitmaps.reversed) == reverse_multimapping(IntBitmap, initial)
+    sketches = MultiReverseIndex(HyperLogLog, initial)
+    assert dict(sketches.reversed) == reverse_multimapping(HyperLogLog, initial)
+
+
+def test_reverse_index_representations() -> None:
+    index = ReverseIndex(tuple, {1: "a"})
+    assert repr(index) == "ReverseIndex({1: 'a'})"
+    assert repr(index.reversed) == "ReversedView({'a': (1,)})"
+    assert repr(MultiReverseIndex(set)) == "MultiReverseIndex({})"
+
+
+@given(invalid_clct=st.sampled_from([dict, deque]))
+def test_breaks_for_invalid_collections(invalid_clct: t.Type[t.Any]) -> None:
+    with pytest.raises(AssertionError):
+        ReverseIndex(invalid_clct)
@@ -0,0 +1,186 @@
+import os
+import pickle
+import subprocess
+import sys
+import typing as t
+from collections import Counter
+
+import pytest
+from hypothesis import given
+from hypothesis import strategies as st
+
+from collectiondict import (
+    CountMinSketch,
+    HyperLogLog,
+    Sketch,
+    collectiondict,
+    merge_collectiondicts,
+    reverse_mapping,
+    reverse_multimapping,
+)
+from tests import hypothesis_utils as hu
+
+
+class NarrowCountMinSketch(CountMinSketch):
+    width = 4
+    depth = 2
+
+
+class CoarseHyperLogLog(HyperLogLog):
+    precision = 4
+
+
+sketch_types = st.sampled_from(
+    [CountMinSketch, NarrowCountMinSketch, HyperLogLog, CoarseHyperLogLog]
+)
+
+
+@given(
+    stream=hu.valid_streams(),
+    sketch_t=st.sampled_from([CountMinSketch, NarrowCountMinSketch]),
+)
+def test_count_min_sketch_never_underestimates(
+    stream: list[tuple[int, int]], sketch_t: t.Type[CountMinSketch]
+) -> None:
+    sketches = collectiondict(sketch_t, stream)
+    for key, counter in collectiondict(Counter, stream).items():
+        assert sketches[key].total == sum(counter.values())
+        assert all(sketches[key][val] >= count for val, count in counter.items())
+
+
+@given(stream=hu.valid_streams())
+def test_count_min_sketch_is_exact_for_few_values(
+    stream: list[tuple[int, int]],
+) -> None:
+    # With 256 counters per row, collisions of a handful of values are unlikely
+    # in every row at once.
+    stream = [(key, val % 5) for key, val in stream]
+    sketches = collectiondict(CountMinSketch, stream)
+    for key, counter in collectiondict(Counter, stream).items():
+        assert all(sketches[key][val] == count for val, count in counter.items())
+
+
+def test_hyper_log_log_estimates_distinct_values() -> None:
+    nof_distinct = 20_000
+    sketch = HyperLogLog(n % nof_distinct for n in range(3 * nof_distinct))
+    # The standard error is about 1.6 %. Thus, 5 % is more than 3 sigma.
+    assert abs(len(sketch) - nof_distinct) < nof_distinct / 20
+
+
+@given(values=st.sets(st.integers(), max_size=50))
+def test_hyper_log_log_is_exact_for_small_sets(values: set[int]) -> None:
+    assert abs(len(HyperLogLog(values)) - len(values)) <= 1
+
+
+@given(sketch_t=sketch_types, stream=hu.valid_streams(), split=st.integers())
+def test_merging_equals_collecting_at_once(
+    sketch_t: t.Type[Sketch], stream: list[tuple[int, int]], split: int
+) -> None:
+    split %= len(stream) + 1
+    parts = [
+        collectiondict(sketch_t, stream[:split]),
+        collectiondict(sketch_t, stream[split:]),
+    ]
+    merged = merge_collectiondicts(sketch_t, parts)
+    assert merged == collectiondict(sketch_t, stream)
+    assert parts == [
+        collectiondict(sketch_t, stream[:split]),
+        collectiondict(sketch_t, stream[split:]),
+    ]
+
+
+@given(sketch_t=sketch_types, first=st.lists(st.text()), second=st.lists(st.text()))
+def test_union_of_sketches(
+    sketch_t: t.Type[Sketch], first: list[str], second: list[str]
+) -> None:
+    assert sketch_t(first) | sketch_t(second) == sketch_t(first + second)
+
+
+@given(sketch_t=sketch_types, values=st.lists(st.text()))
+def test_sketches_survive_pickling(sketch_t: t.Type[Sketch], values: list[str]) -> None:
+    sketch = sketch_t(values)
+    assert pickle.loads(pickle.dumps(sketch)) == sketch
+
+
+def _sketch_in_process(
+    sketch_t: t.Type[Sketch], values: list[t.Hashable], seed: int
+) -> bytes:
+    code = (
+        "import pickle, sys\n"
+        "from collectiondict import CountMinSketch, HyperLogLog\n"
+        f"sys.stdout.buffer.write(pickle.dumps({sketch_t.__name__}({values!r})))\n"
+    )
+    env = {**os.environ, "PYTHONHASHSEED": str(seed)}
+    return subprocess.run(
+        [sys.executable, "-c", code], env=env, capture_output=True, check=True
+    ).stdout
+
+
+@pytest.mark.parametrize("sketch_t", [CountMinSketch, HyperLogLog])
+def test_sketches_do_not_depend_on_hash_seed(sketch_t: t.Type[Sketch]) -> None:
+    values: list[t.Hashable] = [
+        frozenset("abcdefgh"),
+        ("x", frozenset({"alpha", "beta", "gamma"})),
+    ]
+    sketches = [
+        pickle.loads(_sketch_in_process(sketch_t, values, seed)) for seed in (1, 2, 3)
+    ]
+    assert sketches[0] == sketches[1] == sketches[2]
+    assert sketches[0] == sketch_t(values)
+
+
+@pytest.mark.parametrize("sketch_t", [CountMinSketch, HyperLogLog])
+def test_sketches_hash_equal_numbers_equally(sketch_t: t.Type[Sketch]) -> None:
+    assert sketch_t([1, 1.0, True]) == sketch_t([1, 1, 1])
+    assert sketch_t([(0, "a")]) == sketch_t([(-0.0, "a")])
+    assert sketch_t([frozenset({1, 2})]) == sketch_t([frozenset({2.0, True})])
+
+
+@pytest.mark.parametrize("value", [object(), 1j, [1], (1, object())])
+def test_sketches_break_for_values_without_stable_hash(value: t.Any) -> None:
+    with pytest.raises(TypeError):
+        CountMinSketch([value])
+    with pytest.raises(TypeError):
+        HyperLogLog([value])
+
+
+@pytest.mark.parametrize(
+    ("first", "second"),
+    [(CountMinSketch(), NarrowCountMinSketch()), (HyperLogLog(), CoarseHyperLogLog())],
+)
+def test_merging_breaks_for_different_parameters(first: Sketch, second: Sketch) -> None:
+    with pytest.raises(ValueError):
+        first.merge(second)
+
+
+@pytest.mark.parametrize("sketch_t", [CountMinSketch, HyperLogLog])
+def test_sketches_break_for_invalid_parameters(sketch_t: t.Type[Sketch]) -> None:
+    class InvalidCountMinSketch(CountMinSketch):
+        width = 0
+
+    class InvalidHyperLogLog(HyperLogLog):
+        precision = 19
+
+    invalid_t = {CountMinSketch: InvalidCountMinSketch, HyperLogLog: InvalidHyperLogLog}
+    with pytest.raises(ValueError):
+        invalid_t[sketch_t]()
+
+
+@given(
+    sketch_t=sketch_types,
+    mapping=st.dictionaries(st.integers(), st.lists(st.integers())),
+)
+def test_reverse_functions_support_sketches(
+    sketch_t: t.Type[Sketch], mapping: dict[int, list[int]]
+) -> None:
+    pairs = [(v, k) for k, values in mapping.items() for v in values]
+    assert reverse_multimapping(sketch_t, mapping) == collectiondict(sketch_t, pairs)
+    singles = {k: values[0] for k, values in mapping.items() if values}
+    pairs = [(v, k) for k, v in singles.items()]
+    assert reverse_mapping(sketch_t, singles) == collectiondict(sketch_t, pairs)
+
+
+def test_sketch_representations() -> None:
+    assert repr(CountMinSketch("aab")) == "CountMinSketch(total=3)"
+    assert repr(HyperLogLog("aab")) == "HyperLogLog(~2 values)"
+    assert CountMinSketch() != HyperLogLog()
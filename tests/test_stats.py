@@ -0,0 +1,109 @@
+import typing as t
+from collections import Counter
+
+import pytest
+from hypothesis import given
+from hypothesis import strategies as st
+
+from collectiondict import (
+    CountMinSketch,
+    GroupingStats,
+    Newest,
+    collectiondict,
+    reverse_mapping,
+    reverse_multimapping,
+)
+from tests import hypothesis_utils as hu
+
+
+@given(stream=hu.valid_streams(), clct_t=hu.valid_collections())
+def test_stats_do_not_change_result(
+    stream: list[tuple[int, int]], clct_t: t.Type[t.Any]
+) -> None:
+    stats = GroupingStats()
+    assert collectiondict(clct_t, stream, stats=stats) == collectiondict(clct_t, stream)
+
+
+@given(stream=hu.valid_streams())
+def test_stats_count_elements_and_keys(stream: list[tuple[int, int]]) -> None:
+    stats = GroupingStats()
+    result = collectiondict(list, stream, stats=stats)
+    assert stats.nof_elements == len(stream)
+    assert stats.nof_keys == len(result)
+    assert stats.nof_appends == len(stream) - len(result)
+    assert stats.elapsed >= 0
+
+
+@given(stream=hu.valid_streams())
+def test_stats_histogram_of_group_sizes(stream: list[tuple[int, int]]) -> None:
+    stats = GroupingStats()
+    result = collectiondict(list, stream, stats=stats)
+    assert sum(stats.group_sizes.values()) == len(result)
+    for values in result.values():
+        bucket = min(bound for bound in stats.group_sizes if bound >= len(values))
+        assert bucket // 2 < len(values) <= bucket
+
+
+@given(stream=hu.valid_streams(), every=st.integers(min_value=1, max_value=5))
+def test_progress_is_reported_every_n_elements(
+    stream: list[tuple[int, int]], every: int
+) -> None:
+    reported: list[tuple[int, int]] = []
+
+    def progress(stats: GroupingStats) -> None:
+        reported.append((stats.nof_elements, stats.nof_keys))
+
+    collectiondict(set, stream, stats=GroupingStats(progress, every=every))
+    expected_counts = list(range(every, len(stream) + 1, every))
+    assert [nof_elements for nof_elements, _ in reported] == expected_counts
+    for nof_elements, nof_keys in reported:
+        assert nof_keys == len(dict(stream[:nof_elements]))
+
+
+@given(mapping=st.dictionaries(st.integers(), st.integers()))
+def test_reverse_mapping_reports_stats(mapping: dict[int, int]) -> None:
+    stats = GroupingStats()
+    result = reverse_mapping(list, mapping, stats=stats)
+    assert result == reverse_mapping(list, mapping)
+    assert (stats.nof_elements, stats.nof_keys) == (len(mapping), len(result))
+
+
+@given(mapping=st.dictionaries(st.integers(), st.lists(st.integers())))
+def test_reverse_multimapping_reports_stats(mapping: dict[int, list[int]]) -> None:
+    stats = GroupingStats()
+    result = reverse_multimapping(Counter, mapping, stats=stats)
+    assert result == reverse_multimapping(Counter, mapping)
+    assert stats.nof_elements == sum(map(len, mapping.values()))
+    assert stats.nof_keys == len(result)
+
+
+def test_stats_skip_collections_without_length() -> None:
+    stats = GroupingStats()
+    collectiondict(CountMinSketch, [("a", 1), ("a", 2)], stats=stats)
+    assert (stats.nof_elements, stats.nof_keys) == (2, 1)
+    assert stats.group_sizes == {}
+
+
+def test_stats_of_bounded_collections_count_kept_values() -> None:
+    stats = GroupingStats()
+    collectiondict(Newest(2), [("a", 1), ("a", 2), ("a", 3)], stats=stats)
+    assert stats.nof_appends == 2  # noqa: PLR2004
+    assert stats.group_sizes == {2: 1}
+
+
+def test_rates_are_zero_without_elapsed_time() -> None:
+    stats = GroupingStats()
+    assert stats.new_key_rate == stats.append_rate == 0.0
+    assert repr(stats) == "GroupingStats(nof_elements=0, nof_keys=0, elapsed=0.000)"
+
+
+def test_rates_relate_to_elapsed_time() -> None:
+    stats = GroupingStats()
+    collectiondict(list, [(n % 10, n) for n in range(1000)], stats=stats)
+    assert stats.new_key_rate * stats.elapsed == pytest.approx(10)
+    assert stats.append_rate * stats.elapsed == pytest.approx(990)
+
+
+def test_stats_break_for_invalid_interval() -> None:
+    with pytest.raises(ValueError):
+        GroupingStats(every=0)
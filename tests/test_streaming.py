@@ -0,0 +1,52 @@
+import typing as t
+from collections import deque
+
+import pytest
+from hypothesis import given
+from hypothesis import strategies as st
+
+from collectiondict import collectiondict, iter_collectiondict
+from tests import hypothesis_utils as hu
+
+
+@given(clct_t=hu.valid_collections(), stream=hu.valid_streams())
+def test_iter_collectiondict_equals_collectiondict_for_grouped_streams(
+    clct_t: t.Type[t.Any], stream: list[tuple[int, int]]
+) -> None:
+    # Sorting by key only keeps the order of the values of every key.
+    grouped_stream = sorted(stream, key=lambda pair: pair[0])
+    expected = collectiondict(clct_t, grouped_stream)
+    result = list(iter_collectiondict(clct_t, grouped_stream, check_contiguous=True))
+    assert result == list(expected.items())
+    assert all(type(clct) is clct_t for _, clct in result)
+
+
+@given(stream=hu.valid_streams())
+def test_iter_collectiondict_yields_every_run_of_keys(
+    stream: list[tuple[int, int]],
+) -> None:
+    result = list(iter_collectiondict(list, stream))
+    assert all(prev[0] != cur[0] for prev, cur in zip(result, result[1:]))
+    assert [(key, val) for key, values in result for val in values] == stream
+
+
+def test_iter_collectiondict_is_lazy() -> None:
+    def stream() -> t.Iterator[tuple[str, int]]:
+        yield from [("a", 1), ("a", 2), ("b", 3)]
+        raise AssertionError("Stream was consumed too far!")
+
+    groups = iter_collectiondict(list, stream())
+    assert next(groups) == ("a", [1, 2])
+
+
+def test_iter_collectiondict_breaks_for_reappearing_keys() -> None:
+    stream = [("a", 1), ("b", 2), ("a", 3)]
+    assert len(list(iter_collectiondict(list, stream))) == len(stream)
+    with pytest.raises(ValueError):
+        list(iter_collectiondict(list, stream, check_contiguous=True))
+
+
+@given(invalid_clct=st.sampled_from([dict, deque]))
+def test_breaks_for_invalid_collections(invalid_clct: t.Type[t.Any]) -> None:
+    with pytest.raises(AssertionError):
+        iter_collectiondict(invalid_clct, [])
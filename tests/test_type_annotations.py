@@ -1,8 +1,17 @@
 import sys
 import typing as t
-from collections import Counter
-
-from collectiondict import collectiondict
+from array import array  # noqa: F401  # Used in string annotations only
+from collections import Counter, deque
+
+from collectiondict import (
+    IntBitmap,
+    Newest,
+    Reservoir,
+    TopK,
+    TypedArray,
+    collectiondict,
+    multi_collectiondict,
+)
 from tests import custom_classes as cc
 
 if sys.version_info >= (3, 11):
@@ -92,3 +101,44 @@ def test_type_inference_for_MyCounter() -> None:
     result = collectiondict(clct, iterable=test_data)
     assert_type(test_data, list[tuple[str, int]])
     assert_type(result, dict[str, Counter[int]])
+
+
+def test_type_inference_for_bounded_collections() -> None:
+    test_data = [("a", 1), ("b", 2), ("c", 3)]
+    assert_type(collectiondict(Newest(2), test_data), dict[str, deque[int]])
+    assert_type(collectiondict(TopK(2), test_data), dict[str, list[int]])
+    assert_type(collectiondict(Reservoir(2), test_data), dict[str, list[int]])
+
+
+def test_type_inference_for_typed_arrays() -> None:
+    ints = [("a", 1), ("b", 2), ("a", 3)]
+    floats = [("a", 1.0), ("b", 2.0), ("a", 3.0)]
+    # Arrays are not subscriptable at runtime before Python 3.12.
+    assert_type(collectiondict(TypedArray("q"), ints), "dict[str, array[int]]")
+    assert_type(collectiondict(TypedArray("d"), floats), "dict[str, array[float]]")
+
+
+def test_type_inference_for_bitmaps() -> None:
+    test_data = [("a", 1), ("b", 2), ("a", 3)]
+    assert_type(collectiondict(IntBitmap, test_data), dict[str, IntBitmap])
+
+
+def test_type_inference_for_extractors() -> None:
+    test_data = [{"user": "a", "event": 1}, {"user": "b", "event": 2}]
+
+    def user(row: dict[str, t.Any]) -> str:
+        return str(row["user"])
+
+    def event(row: dict[str, t.Any]) -> int:
+        return int(row["event"])
+
+    clct = t.cast(t.Type[list[int]], list)
+    result = collectiondict(clct, test_data, key=user, value=event)
+    assert_type(result, dict[str, list[int]])
+
+
+def test_type_inference_for_multi_collectiondict() -> None:
+    test_data = [("a", 1), ("b", 2), ("a", 3)]
+    lists, bitmaps = multi_collectiondict((list, IntBitmap), test_data)
+    assert_type(lists, dict[str, list[t.Any]])
+    assert_type(bitmaps, dict[str, IntBitmap])